@@ -0,0 +1,56 @@
+"""Store calculation_result as JSONB with indexes on its totals
+
+Revision ID: 4b7d2e9a61c3
+Revises: 1c91d273cfc4
+Create Date: 2026-10-18 18:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7d2e9a61c3'
+down_revision: Union[str, None] = '1c91d273cfc4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('housingsubscriptiondetail', 'calculation_result',
+               existing_type=sa.JSON(),
+               type_=postgresql.JSONB(astext_type=sa.Text()),
+               existing_nullable=True,
+               postgresql_using='calculation_result::jsonb')
+    op.create_index('ix_housingsubscriptiondetail_recognized_rounds',
+                    'housingsubscriptiondetail',
+                    [sa.text("CAST(calculation_result ->> 'recognized_rounds' "
+                             "AS INTEGER)")],
+                    unique=False)
+    op.create_index('ix_housingsubscriptiondetail_total_recognized_amount',
+                    'housingsubscriptiondetail',
+                    [sa.text("CAST(calculation_result ->> 'total_recognized_amount' "
+                             "AS BIGINT)")],
+                    unique=False)
+    op.create_index('ix_housingsubscriptiondetail_start_date',
+                    'housingsubscriptiondetail',
+                    [sa.text("(calculation_result ->> 'start_date')")],
+                    unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_housingsubscriptiondetail_start_date',
+                  table_name='housingsubscriptiondetail')
+    op.drop_index('ix_housingsubscriptiondetail_total_recognized_amount',
+                  table_name='housingsubscriptiondetail')
+    op.drop_index('ix_housingsubscriptiondetail_recognized_rounds',
+                  table_name='housingsubscriptiondetail')
+    op.alter_column('housingsubscriptiondetail', 'calculation_result',
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               type_=sa.JSON(),
+               existing_nullable=True,
+               postgresql_using='calculation_result::json')
@@ -0,0 +1,54 @@
+"""Add subscription_round table
+
+Revision ID: 8e3c5a1f0d27
+Revises: 4b7d2e9a61c3
+Create Date: 2026-10-18 19:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8e3c5a1f0d27'
+down_revision: Union[str, None] = '4b7d2e9a61c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('subscription_round',
+    sa.Column('detail_id', sa.Uuid(), nullable=False),
+    sa.Column('installment_no', sa.Integer(), nullable=False),
+    sa.Column('due_date', sa.Date(), nullable=False),
+    sa.Column('paid_date', sa.Date(), nullable=True),
+    sa.Column('recognized_date', sa.Date(), nullable=True),
+    sa.Column('delay_days', sa.Integer(), nullable=False),
+    sa.Column('total_delay_days', sa.Integer(), nullable=False),
+    sa.Column('prepaid_days', sa.Integer(), nullable=False),
+    sa.Column('total_prepaid_days', sa.Integer(), nullable=False),
+    sa.Column('status', sa.SmallInteger(), nullable=False),
+    sa.Column('is_recognized', sa.Boolean(), nullable=False),
+    sa.Column('paid_amount', sa.BigInteger(), nullable=False),
+    sa.Column('recognized_amount_for_round', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['detail_id'], ['housingsubscriptiondetail.id'],
+                            ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('detail_id', 'installment_no')
+    )
+    op.create_index(op.f('ix_subscription_round_recognized_date'),
+                    'subscription_round', ['recognized_date'], unique=False)
+    op.create_index('ix_subscription_round_delayed_due_date', 'subscription_round',
+                    ['due_date'], unique=False,
+                    postgresql_where=sa.text('delay_days > 0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_subscription_round_delayed_due_date',
+                  table_name='subscription_round',
+                  postgresql_where=sa.text('delay_days > 0'))
+    op.drop_index(op.f('ix_subscription_round_recognized_date'),
+                  table_name='subscription_round')
+    op.drop_table('subscription_round')
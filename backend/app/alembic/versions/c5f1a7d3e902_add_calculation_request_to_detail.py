@@ -0,0 +1,31 @@
+"""Add calculation_request to housingsubscriptiondetail
+
+Revision ID: c5f1a7d3e902
+Revises: 8e3c5a1f0d27
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5f1a7d3e902'
+down_revision: Union[str, None] = '8e3c5a1f0d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('housingsubscriptiondetail',
+                  sa.Column('calculation_request',
+                            postgresql.JSONB(astext_type=sa.Text()),
+                            nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('housingsubscriptiondetail', 'calculation_request')
@@ -0,0 +1,41 @@
+"""Add calculation_result_packed to housingsubscriptiondetail
+
+Existing JSON results are packed by scripts/pack_calculation_results.py or
+when they are read with STORE_PACKED_CALCULATION_RESULTS enabled.
+
+Revision ID: e8b2d4f6a1c7
+Revises: c5f1a7d3e902
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import context, op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b2d4f6a1c7'
+down_revision: Union[str, None] = 'c5f1a7d3e902'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('housingsubscriptiondetail',
+                  sa.Column('calculation_result_packed', sa.LargeBinary(),
+                            nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Packed details would be lost, so refuse instead of dropping them
+    if not context.is_offline_mode():
+        packed = op.get_bind().execute(sa.text(
+            'SELECT count(*) FROM housingsubscriptiondetail '
+            'WHERE calculation_result_packed IS NOT NULL')).scalar()
+        if packed:
+            raise RuntimeError(
+                f'{packed} calculation results are packed; '
+                'unpack them before downgrading')
+    op.drop_column('housingsubscriptiondetail', 'calculation_result_packed')
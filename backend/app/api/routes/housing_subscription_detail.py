@@ -1,32 +1,91 @@
-from typing import Any
+import uuid
+from datetime import date
+from typing import Any, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Response
 from sqlmodel import Session
 
 from app import crud
-from app.api.deps import CurrentUser, SessionDep
+from app.api.deps import CurrentUser, SessionDep, get_current_active_superuser
+from app.core.config import settings
+from app.core.db import engine
+from app.models import HousingSubscriptionDetail
 from app.schemas import (
     HousingSubscriptionDetailCreate,
     HousingSubscriptionDetailPublic,
+    HousingSubscriptionDetailStats,
     RecognitionCalculationResult,
+    RecognitionCalculatorRequest,
 )
+from app.services.recognition_cache import detail_result_key, get_result_cache
+from app.services.recognition_summary import calculate_recognition_summary
+from app.services.recognized_date_calc import calculate_recognition_details
 
 router = APIRouter(tags=["Housing Subscription Detail"])
 
 
+def _materialized_detail(detail: HousingSubscriptionDetail) -> Response:
+    """
+    Response of a detail saved as a request, with its result calculated as of
+    today. Results are cached per process by (detail id, updated_at, day).
+    """
+    request = RecognitionCalculatorRequest.model_validate(detail.calculation_request)
+    as_of = date.today()
+    cache = get_result_cache(
+        settings.RECOGNITION_CACHE_MAX_ENTRIES,
+        settings.RECOGNITION_CACHE_TTL_SECONDS,
+        name="detail",
+    )
+    result = cache.get_or_compute(
+        detail_result_key(detail.id, detail.updated_at, as_of),
+        lambda: calculate_recognition_details(
+            request.model_copy(update={"as_of": as_of})
+        )
+        .model_dump_json()
+        .encode(),
+    )
+    envelope = (
+        HousingSubscriptionDetailPublic.model_validate(detail)
+        .model_dump_json(exclude={"calculation_result"})
+        .encode()
+    )
+    content = envelope[:-1] + b',"calculation_result":' + result + b"}"
+    return Response(content=content, media_type="application/json")
+
+
+def _pack_detail_result(detail_id: uuid.UUID) -> None:
+    with Session(engine) as session:
+        crud.pack_stored_calculation_results(session=session, detail_id=detail_id)
+
+
 @router.get(
     "/me/housing-subscription-detail",
     response_model=HousingSubscriptionDetailPublic | None,
 )
 def get_housing_subscription_detail(
-    *, session: SessionDep, current_user: CurrentUser
+    *,
+    session: SessionDep,
+    current_user: CurrentUser,
+    background_tasks: BackgroundTasks
 ) -> Any:
     """
     Get the housing subscription detail for the current user.
+    A detail saved as a request is calculated as of today.
+    With packed storage enabled, a result still stored as JSON is repacked
+    after the response.
     """
     detail = crud.get_housing_subscription_detail_by_user_id(
         session=session, user_id=current_user.id
     )
+    if (
+        detail is not None
+        and settings.STORE_PACKED_CALCULATION_RESULTS
+        and detail.calculation_result_packed is None
+        and detail.calculation_result.get("details")
+    ):
+        background_tasks.add_task(_pack_detail_result, detail.id)
+    if detail is not None and detail.calculation_request is not None:
+        return _materialized_detail(detail)
     return detail
 
 
@@ -44,14 +103,67 @@ def save_or_update_housing_subscription_detail(
     Save or update the housing subscription detail for the current user.
     If detail already exists, it will be replaced.
     """
-    # First, remove any existing detail for the current user
-    crud.remove_housing_subscription_detail_by_user_id(
-        session=session, user_id=current_user.id
+    detail_create = HousingSubscriptionDetailCreate(calculation_result=detail_in)
+    return crud.upsert_housing_subscription_detail(
+        session=session,
+        detail_in=detail_create,
+        user_id=current_user.id,
+        store_rounds=settings.STORE_SUBSCRIPTION_ROUNDS,
+        pack_result=settings.STORE_PACKED_CALCULATION_RESULTS,
     )
 
-    # Then, create the new detail
-    detail_create = HousingSubscriptionDetailCreate(calculation_result=detail_in)
-    new_detail = crud.create_housing_subscription_detail(
-        session=session, detail_in=detail_create, user_id=current_user.id
+
+@router.post(
+    "/me/housing-subscription-detail/request",
+    response_model=HousingSubscriptionDetailPublic,
+)
+def save_housing_subscription_detail_request(
+    *,
+    session: SessionDep,
+    current_user: CurrentUser,
+    request_in: RecognitionCalculatorRequest
+) -> Any:
+    """
+    Save the calculator request instead of its result. Only the request and
+    the totals as of today are stored; the rounds are calculated on read, so
+    recognition stays current. With STORE_SUBSCRIPTION_ROUNDS the rounds are
+    also written to subscription_round (their dates do not depend on as_of).
+    """
+    request_today = request_in.model_copy(update={"as_of": None})
+    if settings.STORE_SUBSCRIPTION_ROUNDS:
+        result = calculate_recognition_details(request_today)
+    else:
+        result = calculate_recognition_summary(request_today)
+    detail_create = HousingSubscriptionDetailCreate(
+        calculation_result=result, calculation_request=request_in
+    )
+    detail = crud.upsert_housing_subscription_detail(
+        session=session,
+        detail_in=detail_create,
+        user_id=current_user.id,
+        store_rounds=settings.STORE_SUBSCRIPTION_ROUNDS,
+    )
+    return _materialized_detail(detail)
+
+
+@router.get(
+    "/housing-subscription-details/stats",
+    response_model=HousingSubscriptionDetailStats,
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def read_housing_subscription_detail_stats(
+    *,
+    session: SessionDep,
+    start_date_from: Optional[date] = None,
+    start_date_to: Optional[date] = None,
+    bucket_size: int = Query(default=12, ge=1),
+) -> Any:
+    """
+    Population totals of the saved results, computed by the database.
+    """
+    return crud.get_housing_subscription_detail_stats(
+        session=session,
+        start_date_from=start_date_from,
+        start_date_to=start_date_to,
+        bucket_size=bucket_size,
     )
-    return new_detail
@@ -1,38 +1,379 @@
-from fastapi import APIRouter
+from datetime import date
+from typing import Callable, List, Optional, Union
 
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import get_current_active_superuser
+from app.core.config import settings
 from app.schemas import (
+    ColumnarDateFormat,
     NormalRequest,
     PaymentRespose,
     RecalcRequest,
+    RecognitionBatchItemResult,
+    RecognitionCacheStats,
     RecognitionCalculationResult,
     RecognitionCalculatorRequest,
+    RecognitionColumnarResult,
+    RecognitionComparisonRequest,
+    RecognitionComparisonResult,
+    RecognitionCurveRequest,
+    RecognitionCurveResult,
+    RecognitionRecalculationRequest,
+    RecognitionRuleSet,
+    RecognitionSweepRequest,
+    RecognitionSweepResult,
+    SingleFlightStats,
+)
+from app.services.recognition_batch import (
+    calculate_recognition_batch_json,
+    get_process_pool,
+)
+from app.services.recognition_cache import (
+    ResultCache,
+    canonical_request_key,
+    get_result_cache,
+    payment_request_key,
+)
+from app.services.recognition_comparison import compare_recognition_scenarios
+from app.services.recognition_encoding import (
+    ARROW_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPES,
+    calculate_recognition_columnar,
+    check_encoding_available,
+    encode_payment_response,
+    encode_recognition_result,
+)
+from app.services.recognition_errors import EncodingUnavailableError
+from app.services.recognition_rules import get_rule_table, reload_rule_table
+from app.services.recognition_stream import (
+    NDJSON_MEDIA_TYPE,
+    stream_normal_payments,
+    stream_recalc_payments,
+    stream_recognition_details,
+)
+from app.services.recognition_summary import (
+    calculate_recognition_summary,
+    calculate_recognition_sweep,
 )
 from app.services.recognized_date_calc import (
+    calculate_recognition_curve,
     calculate_recognition_details,
+    calculate_recognition_rounds,
     generate_normal_payments,
     recalc_payments,
+    recalculate_recognition_details,
 )
+from app.services.single_flight import get_single_flight
 
 router = APIRouter(tags=["payment-schedule"])
 
 
-@router.post("/payments/normal", response_model=PaymentRespose)
-def create_normal_schedule(request: NormalRequest) -> PaymentRespose:
-    payments = generate_normal_payments(
-        request.open_date, request.due_day, request.end_date
+_ALTERNATE_MEDIA_TYPES = (NDJSON_MEDIA_TYPE, *MSGPACK_MEDIA_TYPES, ARROW_MEDIA_TYPE)
+
+
+def _negotiate_media_type(accept: Optional[str]) -> Optional[str]:
+    """
+    First non-JSON media type listed in the Accept header, None for JSON.
+    Binary media types whose library is not installed are refused with 406.
+    """
+    if not accept:
+        return None
+    for media_range in accept.split(","):
+        media_type = media_range.split(";", 1)[0].strip().lower()
+        if media_type in _ALTERNATE_MEDIA_TYPES:
+            if media_type != NDJSON_MEDIA_TYPE:
+                try:
+                    check_encoding_available(media_type)
+                except EncodingUnavailableError as e:
+                    raise HTTPException(status_code=406, detail=str(e))
+            return media_type
+    return None
+
+
+def _get_result_cache() -> ResultCache:
+    return get_result_cache(
+        settings.RECOGNITION_CACHE_MAX_ENTRIES,
+        settings.RECOGNITION_CACHE_TTL_SECONDS,
     )
-    return _build_payment_response(payments, request.end_date)
+
+
+def _encode_payment_response(
+    response: PaymentRespose, media_type: Optional[str]
+) -> bytes:
+    if media_type is None:
+        return response.model_dump_json().encode()
+    return encode_payment_response(response, media_type)
+
+
+def _single_flight_response(
+    key: str, media_type: Optional[str], compute: Callable[[], bytes]
+) -> Response:
+    """
+    Response of compute, shared by concurrent identical requests
+    """
+    media_type = media_type or "application/json"
+    content = get_single_flight().do(f"{media_type}:{key}", compute)
+    return Response(content=content, media_type=media_type)
+
+
+@router.post("/payments/normal", response_model=PaymentRespose)
+def create_normal_schedule(
+    request: NormalRequest, accept: Optional[str] = Header(default=None)
+) -> Response:
+    """
+    With Accept: application/x-ndjson, payments are streamed one per line
+    followed by a summary line. application/msgpack and
+    application/vnd.apache.arrow.stream return the payments as columns.
+    """
+    media_type = _negotiate_media_type(accept)
+    if media_type == NDJSON_MEDIA_TYPE:
+        payments = stream_normal_payments(
+            request.open_date, request.due_day, request.end_date
+        )
+        return StreamingResponse(payments, media_type=NDJSON_MEDIA_TYPE)
+
+    def compute() -> bytes:
+        payments = generate_normal_payments(
+            request.open_date, request.due_day, request.end_date
+        )
+        return _encode_payment_response(
+            _build_payment_response(payments, request.end_date), media_type
+        )
+
+    return _single_flight_response(payment_request_key(request), media_type, compute)
 
 
 @router.post("/payments/recalc", response_model=PaymentRespose)
-def recalc_schedule(request: RecalcRequest) -> PaymentRespose:
-    payments = recalc_payments(request.payments)
-    return _build_payment_response(payments, request.end_date)
+def recalc_schedule(
+    request: RecalcRequest, accept: Optional[str] = Header(default=None)
+) -> Response:
+    """
+    Accepts the same alternate media types as /payments/normal.
+    """
+    media_type = _negotiate_media_type(accept)
+    if media_type == NDJSON_MEDIA_TYPE:
+        return StreamingResponse(
+            stream_recalc_payments(request.payments, request.end_date, request.as_of),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
+    as_of = request.as_of or date.today()
+    key = payment_request_key(request, as_of)
+
+    def compute() -> bytes:
+        payments = recalc_payments(request.payments, as_of)
+        return _encode_payment_response(
+            _build_payment_response(payments, request.end_date), media_type
+        )
+
+    return _single_flight_response(key, media_type, compute)
 
 
 @router.post("/payments/calculate-recognition", response_model=RecognitionCalculationResult)
-def calculate_recognition(request: RecognitionCalculatorRequest) -> RecognitionCalculationResult:
-    return calculate_recognition_details(request)
+def calculate_recognition(
+    request: RecognitionCalculatorRequest,
+    summary_only: bool = False,
+    accept: Optional[str] = Header(default=None),
+) -> Union[RecognitionCalculationResult, Response]:
+    """
+    Calculate recognized rounds and amounts.
+    With summary_only, only the totals are returned and details is empty;
+    its cost grows with the number of custom payments, not the schedule length.
+    With Accept: application/x-ndjson, rounds are streamed one per line and the
+    totals follow in a trailing summary line. application/msgpack and
+    application/vnd.apache.arrow.stream return the details as columns with
+    dates as days since 1970-01-01 and status as PaymentStatusCode.
+    """
+    key = canonical_request_key(request)
+    # Concurrent identical requests share one computation and its bytes
+    single_flight = get_single_flight()
+    if summary_only:
+        content = single_flight.do(
+            "summary:" + key,
+            lambda: calculate_recognition_summary(request).model_dump_json().encode(),
+        )
+        return Response(content=content, media_type="application/json")
+    media_type = _negotiate_media_type(accept)
+    if media_type == NDJSON_MEDIA_TYPE:
+        return StreamingResponse(
+            stream_recognition_details(request), media_type=NDJSON_MEDIA_TYPE
+        )
+    if media_type is not None:
+        binary_media_type = media_type
+        return _single_flight_response(
+            key,
+            media_type,
+            lambda: encode_recognition_result(
+                request, calculate_recognition_rounds(request), binary_media_type
+            ),
+        )
+
+    # JSON results are cached per canonical request and as-of day
+    cache = _get_result_cache()
+    content = cache.get_or_compute(
+        key,
+        lambda: single_flight.do(
+            key,
+            lambda: calculate_recognition_details(request).model_dump_json().encode(),
+        ),
+    )
+    return Response(content=content, media_type="application/json")
+
+
+@router.get(
+    "/payments/calculate-recognition/cache-stats",
+    response_model=RecognitionCacheStats,
+)
+def read_recognition_cache_stats() -> RecognitionCacheStats:
+    return _get_result_cache().stats()
+
+
+@router.get(
+    "/payments/calculate-recognition/single-flight-stats",
+    response_model=SingleFlightStats,
+)
+def read_recognition_single_flight_stats() -> SingleFlightStats:
+    """
+    How many callers each coalesced calculation served
+    """
+    return get_single_flight().stats()
+
+
+@router.get("/payments/recognition-rules", response_model=RecognitionRuleSet)
+def read_recognition_rules() -> RecognitionRuleSet:
+    """
+    Recognition rules in effect, ordered by effective date
+    """
+    return get_rule_table().to_rule_set()
+
+
+@router.post(
+    "/payments/recognition-rules/reload",
+    response_model=RecognitionRuleSet,
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def reload_recognition_rules() -> RecognitionRuleSet:
+    """
+    Reload the rules from RECOGNITION_RULES_FILE (built-in rules when unset).
+    Cached results of the previous rule version are no longer used. Other
+    server workers pick up the changed file on their next calculation. A file
+    whose rules changed under the same version is rejected.
+    """
+    try:
+        table = reload_rule_table(settings.RECOGNITION_RULES_FILE)
+    except (OSError, ValueError) as e:
+        raise HTTPException(
+            status_code=400, detail=f"인정 기준을 불러올 수 없습니다: {e}"
+        )
+    return table.to_rule_set()
+
+
+@router.post(
+    "/payments/calculate-recognition/columnar",
+    response_model=RecognitionColumnarResult,
+)
+def calculate_recognition_in_columns(
+    request: RecognitionCalculatorRequest,
+    date_format: ColumnarDateFormat = ColumnarDateFormat.iso,
+) -> Response:
+    """
+    Same calculation as /payments/calculate-recognition with details as one
+    array per field. Dates are ISO strings or days since 1970-01-01, and status
+    is a PaymentStatusCode (0 normal, 1 delay, 2 prepaid, 3 missed).
+    """
+    return _single_flight_response(
+        f"columnar-{date_format.value}:{canonical_request_key(request)}",
+        None,
+        lambda: calculate_recognition_columnar(request, date_format)
+        .model_dump_json()
+        .encode(),
+    )
+
+
+@router.post(
+    "/payments/calculate-recognition/compare",
+    response_model=RecognitionComparisonResult,
+)
+def compare_recognition(
+    request: RecognitionComparisonRequest,
+) -> RecognitionComparisonResult:
+    """
+    Calculate several amount scenarios on the same schedule, side by side with
+    their differences from the first scenario.
+    """
+    return compare_recognition_scenarios(request)
+
+
+@router.post(
+    "/payments/calculate-recognition/sweep", response_model=RecognitionSweepResult
+)
+def sweep_recognition(request: RecognitionSweepRequest) -> RecognitionSweepResult:
+    """
+    Summary totals for every payment day and monthly start date in the given
+    ranges, as matrices with one row per start date.
+    """
+    payment_day_count = request.payment_day_to - request.payment_day_from + 1
+    start_month_count = (
+        (request.start_date_to.year - request.start_date_from.year) * 12
+        + request.start_date_to.month
+        - request.start_date_from.month
+        + 1
+    )
+    if payment_day_count * start_month_count > settings.RECOGNITION_SWEEP_MAX_VARIANTS:
+        max_variants = settings.RECOGNITION_SWEEP_MAX_VARIANTS
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 최대 {max_variants}개 조합까지 계산할 수 있습니다.",
+        )
+    return calculate_recognition_sweep(request)
+
+
+@router.post(
+    "/payments/calculate-recognition/curve", response_model=RecognitionCurveResult
+)
+def calculate_recognition_over_time(
+    request: RecognitionCurveRequest,
+) -> RecognitionCurveResult:
+    """
+    Recognized rounds and amount for every date in [curve_start, curve_end].
+    """
+    return calculate_recognition_curve(request)
+
+
+@router.post(
+    "/payments/calculate-recognition/incremental",
+    response_model=RecognitionCalculationResult,
+)
+def recalculate_recognition(
+    request: RecognitionRecalculationRequest,
+) -> RecognitionCalculationResult:
+    """
+    Recalculate a previous result from the first edited installment onwards.
+    """
+    return recalculate_recognition_details(request)
+
+
+@router.post(
+    "/payments/calculate-recognition/batch",
+    response_model=List[RecognitionBatchItemResult],
+)
+def calculate_recognition_in_batch(
+    requests: List[RecognitionCalculatorRequest],
+) -> Response:
+    """
+    Calculate several requests at once. Results keep the order of the requests
+    and a failing request is reported in its own item.
+    """
+    if len(requests) > settings.RECOGNITION_BATCH_MAX_ITEMS:
+        max_items = settings.RECOGNITION_BATCH_MAX_ITEMS
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 최대 {max_items}건까지 계산할 수 있습니다.",
+        )
+    executor = get_process_pool(settings.RECOGNITION_BATCH_MAX_WORKERS)
+    content = calculate_recognition_batch_json(requests, executor=executor)
+    return Response(content=content, media_type="application/json")
 
 
 def _build_payment_response(payments, current_date) -> PaymentRespose:
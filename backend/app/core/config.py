@@ -98,6 +98,24 @@ class Settings(BaseSettings):
     FIRST_SUPERUSER: EmailStr
     FIRST_SUPERUSER_PASSWORD: str
 
+    # Worker processes for batch recognition calculations (None: CPU count)
+    RECOGNITION_BATCH_MAX_WORKERS: int | None = None
+    RECOGNITION_BATCH_MAX_ITEMS: int = 1000
+    # Payment days x start dates of one sweep request
+    RECOGNITION_SWEEP_MAX_VARIANTS: int = 31 * 240
+
+    # Cached calculator results (entries also expire at midnight)
+    RECOGNITION_CACHE_MAX_ENTRIES: int = 4096
+    RECOGNITION_CACHE_TTL_SECONDS: int = 3600
+    # JSON recognition rule set (None: built-in rules)
+    RECOGNITION_RULES_FILE: str | None = None
+
+    # Also store saved results one row per round in subscription_round
+    STORE_SUBSCRIPTION_ROUNDS: bool = False
+    # Store saved results packed (needs the "encodings" extra) instead of as
+    # JSON details; JSON rows are repacked in the background when read
+    STORE_PACKED_CALCULATION_RESULTS: bool = False
+
     def _check_default_secret(self, var_name: str, value: str | None) -> None:
         if value == "changethis":
             message = (
@@ -1,7 +1,9 @@
 import uuid
 from typing import Any
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 
+from sqlalchemy import BigInteger, Integer, delete, func, insert, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlmodel import Session, select
 
 from app.core.security import get_password_hash, verify_password
@@ -9,20 +11,29 @@ from app.models import (
     HousingSubscriptionDetail,
     Item,
     SocialAccount,
+    SubscriptionRound,
     Terms,
     TermType,
     User,
     UserAgreement,
     UserWithdrawal,
+    calculation_result_field,
+    kst_now,
 )
 from app.schemas import (
     HousingSubscriptionDetailCreate,
+    HousingSubscriptionDetailStats,
     ItemCreate,
+    PaymentStatusCode,
+    RecognitionCalculationResult,
+    RecognitionRoundRecord,
+    RecognizedRoundsBucket,
     TermsCreate,
     UserAgreementCreate,
     UserCreate,
     UserUpdate,
 )
+from app.services.recognition_storage import pack_calculation_result
 
 
 def create_user(*, session: Session, user_create: UserCreate) -> User:
@@ -162,6 +173,225 @@ def create_housing_subscription_detail(
     return db_obj
 
 
+def upsert_housing_subscription_detail(
+    *,
+    session: Session,
+    detail_in: HousingSubscriptionDetailCreate,
+    user_id: uuid.UUID,
+    store_rounds: bool = False,
+    pack_result: bool = False,
+) -> HousingSubscriptionDetail:
+    """
+    Create or replace the user's detail in one statement:
+    INSERT ... ON CONFLICT (user_id) DO UPDATE ... RETURNING.
+    A replaced row keeps its id and created_at and gets a new updated_at, and
+    readers never see the user without a detail.
+    Saving a full result clears a previously stored calculation_request.
+    With pack_result, the details are stored in calculation_result_packed.
+    With store_rounds, its subscription_round rows are replaced in the same
+    transaction by the details passed in, also for a detail saved with its
+    request (whose stored result keeps only the totals).
+    """
+    now = kst_now()
+    result = detail_in.calculation_result
+    calculation_request = None
+    if detail_in.calculation_request is not None:
+        # as_of is left out: stored requests are calculated as of each read,
+        # so only the totals of the result are kept
+        calculation_request = detail_in.calculation_request.model_dump(
+            mode="json", exclude={"as_of"}, exclude_none=True
+        )
+        result = result.model_copy(update={"details": []})
+    calculation_result = result.model_dump(mode="json")
+    calculation_result_packed = None
+    if pack_result and result.details:
+        calculation_result_packed = pack_calculation_result(result)
+        calculation_result["details"] = []
+    insert_statement = pg_insert(HousingSubscriptionDetail).values(
+        id=uuid.uuid4(),
+        user_id=user_id,
+        calculation_result=calculation_result,
+        calculation_request=calculation_request,
+        calculation_result_packed=calculation_result_packed,
+        created_at=now,
+        updated_at=now,
+    )
+    statement = insert_statement.on_conflict_do_update(
+        index_elements=[HousingSubscriptionDetail.user_id],
+        set_={
+            "calculation_result": insert_statement.excluded.calculation_result,
+            "calculation_request": insert_statement.excluded.calculation_request,
+            "calculation_result_packed": (
+                insert_statement.excluded.calculation_result_packed
+            ),
+            "updated_at": now,
+        },
+    ).returning(HousingSubscriptionDetail)
+    db_obj = session.scalars(
+        statement, execution_options={"populate_existing": True}
+    ).one()
+    if store_rounds:
+        replace_subscription_rounds(
+            session=session,
+            detail_id=db_obj.id,
+            rounds=detail_in.calculation_result.details,
+        )
+    # Detached before commit so the returned row is not expired and reloaded
+    session.expunge(db_obj)
+    session.commit()
+    return db_obj
+
+
+def pack_stored_calculation_results(
+    *,
+    session: Session,
+    batch_size: int = 100,
+    detail_id: uuid.UUID | None = None,
+) -> int:
+    """
+    Move the JSON details of up to batch_size saved results (or only
+    detail_id) into calculation_result_packed and return how many were packed.
+    Locked rows are skipped, and a row saved again after it was read is left
+    for the next run, so this can run next to the API and in several workers.
+    updated_at is kept: the stored result does not change.
+    """
+    table = HousingSubscriptionDetail.__table__
+    statement = (
+        select(table.c.id, table.c.updated_at, table.c.calculation_result)
+        .where(
+            table.c.calculation_result_packed.is_(None),
+            func.jsonb_array_length(table.c.calculation_result["details"]) > 0,
+        )
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    if detail_id is not None:
+        statement = statement.where(table.c.id == detail_id)
+    packed = 0
+    for row in session.execute(statement).all():
+        result = RecognitionCalculationResult.model_validate(row.calculation_result)
+        packed += session.execute(
+            update(table)
+            .where(table.c.id == row.id, table.c.updated_at == row.updated_at)
+            .values(
+                calculation_result=result.model_copy(update={"details": []}).model_dump(
+                    mode="json"
+                ),
+                calculation_result_packed=pack_calculation_result(result),
+                updated_at=row.updated_at,
+            )
+        ).rowcount
+    session.commit()
+    return packed
+
+
+_SUBSCRIPTION_ROUND_COLUMNS = (
+    "detail_id",
+    "installment_no",
+    "due_date",
+    "paid_date",
+    "recognized_date",
+    "delay_days",
+    "total_delay_days",
+    "prepaid_days",
+    "total_prepaid_days",
+    "status",
+    "is_recognized",
+    "paid_amount",
+    "recognized_amount_for_round",
+)
+
+
+def replace_subscription_rounds(
+    *,
+    session: Session,
+    detail_id: uuid.UUID,
+    rounds: list[RecognitionRoundRecord],
+) -> None:
+    """
+    Replace the rounds stored for a detail without committing.
+    Rows are streamed with COPY on psycopg connections and inserted with one
+    executemany otherwise, never added one by one through the ORM.
+    """
+    session.exec(
+        delete(SubscriptionRound).where(SubscriptionRound.detail_id == detail_id)
+    )
+    rows = [
+        (
+            detail_id,
+            r.installment_no,
+            r.due_date,
+            r.paid_date,
+            r.recognized_date,
+            r.delay_days,
+            r.total_delay_days,
+            r.prepaid_days,
+            r.total_prepaid_days,
+            PaymentStatusCode[r.status.name].value,
+            r.is_recognized,
+            r.paid_amount,
+            r.recognized_amount_for_round,
+        )
+        for r in rounds
+    ]
+    if not rows:
+        return
+
+    connection = session.connection()
+    if connection.dialect.driver == "psycopg":
+        copy_sql = "COPY {} ({}) FROM STDIN".format(
+            SubscriptionRound.__tablename__, ", ".join(_SUBSCRIPTION_ROUND_COLUMNS)
+        )
+        with connection.connection.driver_connection.cursor() as cursor:
+            with cursor.copy(copy_sql) as copy:
+                for row in rows:
+                    copy.write_row(row)
+    else:
+        connection.execute(
+            insert(SubscriptionRound),
+            [dict(zip(_SUBSCRIPTION_ROUND_COLUMNS, row)) for row in rows],
+        )
+
+
+def get_user_ids_with_delayed_round(
+    *, session: Session, due_date_from: date, due_date_to: date
+) -> list[uuid.UUID]:
+    """
+    Users with a delayed round due in the given range (partial due_date index)
+    """
+    statement = (
+        select(HousingSubscriptionDetail.user_id)
+        .where(
+            HousingSubscriptionDetail.id.in_(
+                select(SubscriptionRound.detail_id).where(
+                    SubscriptionRound.delay_days > 0,
+                    SubscriptionRound.due_date >= due_date_from,
+                    SubscriptionRound.due_date <= due_date_to,
+                )
+            )
+        )
+    )
+    return list(session.exec(statement).all())
+
+
+def get_rounds_recognized_between(
+    *, session: Session, recognized_from: date, recognized_to: date
+) -> list[SubscriptionRound]:
+    """
+    Rounds whose recognized date is in the given range (recognized_date index),
+    e.g. the rounds becoming recognized next week
+    """
+    statement = (
+        select(SubscriptionRound)
+        .where(
+            SubscriptionRound.recognized_date >= recognized_from,
+            SubscriptionRound.recognized_date <= recognized_to,
+        )
+        .order_by(SubscriptionRound.recognized_date)
+    )
+    return list(session.exec(statement).all())
+
+
 def remove_housing_subscription_detail_by_user_id(
     *, session: Session, user_id: uuid.UUID
 ) -> HousingSubscriptionDetail | None:
@@ -174,6 +404,77 @@ def remove_housing_subscription_detail_by_user_id(
     return db_obj
 
 
+def _start_date_filters(
+    start_date_from: date | None, start_date_to: date | None
+) -> list[Any]:
+    start_date = calculation_result_field("start_date")
+    filters = []
+    if start_date_from is not None:
+        filters.append(start_date >= start_date_from.isoformat())
+    if start_date_to is not None:
+        filters.append(start_date <= start_date_to.isoformat())
+    return filters
+
+
+def get_housing_subscription_detail_stats(
+    *,
+    session: Session,
+    start_date_from: date | None = None,
+    start_date_to: date | None = None,
+    bucket_size: int = 12,
+) -> HousingSubscriptionDetailStats:
+    """
+    Aggregate the stored results in SQL, over the indexed top-level totals,
+    optionally limited to results whose start_date is in the given range
+    """
+    recognized_rounds = calculation_result_field("recognized_rounds", Integer)
+    total_recognized_amount = calculation_result_field(
+        "total_recognized_amount", BigInteger
+    )
+    filters = _start_date_filters(start_date_from, start_date_to)
+
+    totals_statement = select(
+        func.count(),
+        func.min(recognized_rounds),
+        func.max(recognized_rounds),
+        func.avg(recognized_rounds),
+        func.coalesce(func.sum(total_recognized_amount), 0),
+        func.avg(total_recognized_amount),
+    ).select_from(HousingSubscriptionDetail).where(*filters)
+    (
+        detail_count,
+        min_recognized_rounds,
+        max_recognized_rounds,
+        average_recognized_rounds,
+        sum_total_recognized_amount,
+        average_total_recognized_amount,
+    ) = session.exec(totals_statement).one()
+
+    bucket = ((recognized_rounds // bucket_size) * bucket_size).label("bucket")
+    distribution_statement = (
+        select(bucket, func.count())
+        .select_from(HousingSubscriptionDetail)
+        .where(*filters)
+        .group_by(bucket)
+        .order_by(bucket)
+    )
+    distribution = [
+        RecognizedRoundsBucket(recognized_rounds_from=bucket_from, detail_count=count)
+        for bucket_from, count in session.exec(distribution_statement).all()
+        if bucket_from is not None
+    ]
+
+    return HousingSubscriptionDetailStats(
+        detail_count=detail_count,
+        min_recognized_rounds=min_recognized_rounds,
+        max_recognized_rounds=max_recognized_rounds,
+        average_recognized_rounds=average_recognized_rounds,
+        sum_total_recognized_amount=sum_total_recognized_amount,
+        average_total_recognized_amount=average_total_recognized_amount,
+        recognized_rounds_distribution=distribution,
+    )
+
+
 def withdraw_user(*, session: Session, user: User) -> None:
     # Record user withdrawal
     user_withdrawal_record = UserWithdrawal(
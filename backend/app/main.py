@@ -1,16 +1,22 @@
 import sentry_sdk
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
 from app.core.config import settings
+from app.services.recognition_errors import RecognitionRequestError
+from app.services.recognition_rules import reload_rule_table
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
     return f"{route.tags[0]}-{route.name}"
 
 
+if settings.RECOGNITION_RULES_FILE:
+    reload_rule_table(settings.RECOGNITION_RULES_FILE)
+
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
@@ -20,6 +26,14 @@ app = FastAPI(
     generate_unique_id_function=custom_generate_unique_id,
 )
 
+
+@app.exception_handler(RecognitionRequestError)
+def recognition_request_error_handler(
+    request: Request, exc: RecognitionRequestError
+) -> JSONResponse:
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
+
+
 # Set all CORS enabled origins
 if settings.all_cors_origins:
     app.add_middleware(
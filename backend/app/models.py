@@ -1,13 +1,30 @@
-from typing import Optional
 import uuid
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, timedelta, timezone
 from enum import Enum
+from typing import Any, Optional
 
 from pydantic import EmailStr
-from sqlalchemy import JSON, Column, DateTime
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    SmallInteger,
+    Text,
+    Uuid,
+    cast,
+    event,
+    literal_column,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.types import TypeEngine
 from sqlmodel import Field, Relationship, SQLModel
 
-
 KST = timezone(timedelta(hours=9))
 
 
@@ -82,7 +99,18 @@ class Item(ItemBase, table=True):
 
 class HousingSubscriptionDetail(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    calculation_result: dict = Field(default={}, sa_column=Column(JSON))
+    calculation_result: dict = Field(default={}, sa_column=Column(JSONB))
+    # Compact RecognitionCalculatorRequest (without as_of) of a detail whose
+    # rounds are calculated on read. calculation_result then only holds the
+    # totals as of the save.
+    calculation_request: Optional[dict] = Field(
+        default=None, sa_column=Column(JSONB, nullable=True)
+    )
+    # Full result packed by recognition_storage; calculation_result then only
+    # holds the totals and details is filled from this column on load
+    calculation_result_packed: Optional[bytes] = Field(
+        default=None, sa_column=Column(LargeBinary, nullable=True)
+    )
     created_at: datetime = Field(
         sa_column=Column(DateTime(timezone=True), default=kst_now, nullable=False)
     )
@@ -95,6 +123,92 @@ class HousingSubscriptionDetail(SQLModel, table=True):
     user: "User" = Relationship(back_populates="housing_subscription_detail")
 
 
+@event.listens_for(HousingSubscriptionDetail, "load")
+@event.listens_for(HousingSubscriptionDetail, "refresh")
+def _unpack_calculation_result(
+    target: HousingSubscriptionDetail, _context: Any, _attrs: Any = None
+) -> None:
+    # Loaded rows look the same whether their details are packed or JSON
+    if target.calculation_result_packed is not None:
+        # Imported here: recognition_storage depends on app.schemas, which
+        # imports this module
+        from app.services.recognition_storage import unpack_calculation_result
+
+        set_committed_value(
+            target,
+            "calculation_result",
+            unpack_calculation_result(target.calculation_result_packed),
+        )
+
+
+def calculation_result_field(
+    name: str, type_: Optional[TypeEngine] = None
+) -> ColumnElement:
+    """
+    Top-level field of calculation_result as text, or cast to type_.
+    Written exactly like the expression indexes below so queries can use them.
+    """
+    field = HousingSubscriptionDetail.__table__.c.calculation_result.op(
+        "->>", return_type=Text
+    )(literal_column(f"'{name}'"))
+    return field if type_ is None else cast(field, type_)
+
+
+Index(
+    "ix_housingsubscriptiondetail_recognized_rounds",
+    calculation_result_field("recognized_rounds", Integer),
+)
+Index(
+    "ix_housingsubscriptiondetail_total_recognized_amount",
+    calculation_result_field("total_recognized_amount", BigInteger),
+)
+# ISO dates compare correctly as text, and a text to date cast is not immutable
+Index(
+    "ix_housingsubscriptiondetail_start_date",
+    calculation_result_field("start_date"),
+)
+
+
+class SubscriptionRound(SQLModel, table=True):
+    """
+    One round of a stored calculation result (RecognitionRoundRecord), kept
+    next to the JSON document so rounds can be queried by date with indexes
+    """
+
+    __tablename__ = "subscription_round"
+
+    detail_id: uuid.UUID = Field(
+        sa_column=Column(
+            Uuid,
+            ForeignKey("housingsubscriptiondetail.id", ondelete="CASCADE"),
+            primary_key=True,
+        )
+    )
+    installment_no: int = Field(primary_key=True)
+    due_date: date
+    paid_date: Optional[date] = None
+    recognized_date: Optional[date] = Field(default=None, index=True)
+    delay_days: int
+    total_delay_days: int
+    prepaid_days: int
+    total_prepaid_days: int
+    # PaymentStatusCode value
+    status: int = Field(sa_column=Column(SmallInteger, nullable=False))
+    is_recognized: bool
+    paid_amount: int = Field(sa_column=Column(BigInteger, nullable=False))
+    recognized_amount_for_round: int = Field(
+        sa_column=Column(BigInteger, nullable=False)
+    )
+
+
+# Delayed rounds by due date, e.g. users with a delayed round in a given year
+Index(
+    "ix_subscription_round_delayed_due_date",
+    SubscriptionRound.__table__.c.due_date,
+    postgresql_where=SubscriptionRound.__table__.c.delay_days > 0,
+)
+
+
 class UserWithdrawal(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID = Field(index=True)
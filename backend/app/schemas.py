@@ -1,6 +1,6 @@
 from datetime import date, datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 import uuid
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field, model_validator
@@ -36,6 +36,7 @@ class RecalcRequest(BaseModel):
     open_date: date
     end_date: date
     payments: List[PaymentInput]
+    as_of: Optional[date] = None
 
 
 class PaymentRespose(BaseModel):
@@ -45,6 +46,13 @@ class PaymentRespose(BaseModel):
     payments: List[PaymentRecord]
 
 
+# Trailing record of a streamed (NDJSON) payment schedule
+class PaymentStreamSummary(BaseModel):
+    total_installments: int
+    total_delay_days: int = 0
+    total_prepaid_days: int = 0
+
+
 class PaymentAmountOption(str, Enum):
     standard = "standard"
     maximum = "maximum"
@@ -64,6 +72,47 @@ class RecognitionCalculatorRequest(BaseModel):
     payment_amount_option: PaymentAmountOption
     standard_payment_amount: Optional[int] = None
     payments: Optional[List[CustomPaymentInput]] = None
+    # Date used to decide whether a round is recognized (default: today)
+    as_of: Optional[date] = None
+
+
+class RecognitionRule(BaseModel):
+    effective_from: date
+    # Recognized amount cap of a round paid on or after effective_from
+    max_recognized_amount: int
+    # Longest allowed prepayment of a single round, in days
+    max_prepaid_days: int
+    # How far before its due date a round of recalc_payments may be paid
+    prepayment_window_months: int
+
+
+class RecognitionRuleSet(BaseModel):
+    version: str
+    rules: List[RecognitionRule]
+
+
+class RecognitionSweepRequest(BaseModel):
+    payment_day_from: int = 1
+    payment_day_to: int = 28
+    # Start dates run monthly from start_date_from up to start_date_to
+    start_date_from: date
+    start_date_to: date
+    end_date: date
+    payment_amount_option: PaymentAmountOption
+    standard_payment_amount: Optional[int] = None
+    payments: Optional[List[CustomPaymentInput]] = None
+    as_of: Optional[date] = None
+
+
+class RecognitionSweepResult(BaseModel):
+    end_date: date
+    payment_days: List[int]
+    start_dates: List[date]
+    # One row per start date and one column per payment day.
+    # None marks variants that fail (prepayment over 721 days).
+    recognized_rounds: List[List[Optional[int]]]
+    unrecognized_rounds: List[List[Optional[int]]]
+    total_recognized_amount: List[List[Optional[int]]]
 
 
 class PaymentStatus(str, Enum):
@@ -98,6 +147,146 @@ class RecognitionCalculationResult(BaseModel):
     details: List[RecognitionRoundRecord]
 
 
+# Compact status codes used by the columnar and binary encodings
+class PaymentStatusCode(int, Enum):
+    normal = 0
+    delay = 1
+    prepaid = 2
+    missed = 3
+
+
+class ColumnarDateFormat(str, Enum):
+    iso = "iso"
+    # Days since 1970-01-01
+    ordinal = "ordinal"
+
+
+# RecognitionRoundRecord fields as one array per field
+class RecognitionRoundColumns(BaseModel):
+    installment_no: List[int]
+    due_date: List[Union[date, int]]
+    paid_date: List[Union[date, int, None]]
+    recognized_date: List[Union[date, int, None]]
+    delay_days: List[int]
+    total_delay_days: List[int]
+    prepaid_days: List[int]
+    total_prepaid_days: List[int]
+    status: List[PaymentStatusCode]
+    is_recognized: List[bool]
+    paid_amount: List[int]
+    recognized_amount_for_round: List[int]
+
+
+class RecognitionColumnarResult(BaseModel):
+    payment_day: int
+    start_date: date
+    end_date: date
+    recognized_rounds: int
+    unrecognized_rounds: int
+    total_recognized_amount: int
+    date_format: ColumnarDateFormat
+    details: RecognitionRoundColumns
+
+
+# Trailing record of a streamed (NDJSON) recognition calculation
+class RecognitionStreamSummary(BaseModel):
+    payment_day: int
+    start_date: date
+    end_date: date
+    recognized_rounds: int
+    unrecognized_rounds: int
+    total_recognized_amount: int
+
+
+class RecognitionScenario(BaseModel):
+    name: Optional[str] = None
+    payment_amount_option: PaymentAmountOption
+    standard_payment_amount: Optional[int] = None
+    payments: Optional[List[CustomPaymentInput]] = None
+
+
+class RecognitionComparisonRequest(BaseModel):
+    payment_day: int
+    start_date: date
+    end_date: date
+    # The first scenario is the baseline the others are compared with
+    scenarios: List[RecognitionScenario]
+    as_of: Optional[date] = None
+
+
+class RecognitionRoundDiff(BaseModel):
+    installment_no: int
+    baseline_is_recognized: bool
+    is_recognized: bool
+    # Scenario minus baseline (None when either round has no payment)
+    recognized_date_diff_days: Optional[int] = None
+    recognized_amount_diff: int
+
+
+class RecognitionScenarioResult(BaseModel):
+    name: Optional[str] = None
+    result: RecognitionCalculationResult
+    recognized_rounds_diff: int
+    total_recognized_amount_diff: int
+    # Only rounds that differ from the baseline
+    round_diffs: List[RecognitionRoundDiff]
+
+
+class RecognitionComparisonResult(BaseModel):
+    scenarios: List[RecognitionScenarioResult]
+
+
+class RecognitionRecalculationRequest(BaseModel):
+    previous: RecognitionCalculationResult
+    payment_amount_option: PaymentAmountOption
+    standard_payment_amount: Optional[int] = None
+    payments: List[CustomPaymentInput]
+    as_of: Optional[date] = None
+
+
+class RecognitionCurveRequest(RecognitionCalculatorRequest):
+    curve_start: date
+    curve_end: date
+
+
+class RecognitionCurvePoint(BaseModel):
+    as_of: date
+    recognized_rounds: int
+    total_recognized_amount: int
+
+
+class RecognitionCurveResult(BaseModel):
+    payment_day: int
+    start_date: date
+    end_date: date
+    points: List[RecognitionCurvePoint]
+
+
+class RecognitionCacheStats(BaseModel):
+    entries: int
+    max_entries: int
+    hits: int
+    misses: int
+    # Entries dropped to stay within max_entries
+    evictions: int
+    # Entries dropped after their TTL or the day they were calculated on
+    expirations: int
+
+
+class SingleFlightStats(BaseModel):
+    in_flight: int
+    computations: int
+    # Callers served by all computations, including the one that computed
+    callers: int
+    max_callers_per_computation: int
+    computations_by_callers: Dict[int, int]
+
+
+class RecognitionBatchItemResult(BaseModel):
+    result: Optional[RecognitionCalculationResult] = None
+    error: Optional[str] = None
+
+
 class GoogleToken(BaseModel):
     token: str
 
@@ -227,11 +416,13 @@ class HousingSubscriptionDetailBase(BaseModel):
 
 
 class HousingSubscriptionDetailCreate(HousingSubscriptionDetailBase):
-    pass
+    # Set when the rounds are calculated on read instead of being stored
+    calculation_request: Optional[RecognitionCalculatorRequest] = None
 
 
 class HousingSubscriptionDetailPublic(HousingSubscriptionDetailBase):
     id: uuid.UUID
+    calculation_request: Optional[RecognitionCalculatorRequest] = None
     user_id: uuid.UUID
     created_at: datetime
     updated_at: datetime
@@ -239,6 +430,26 @@ class HousingSubscriptionDetailPublic(HousingSubscriptionDetailBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class RecognizedRoundsBucket(BaseModel):
+    recognized_rounds_from: int
+    detail_count: int
+
+
+class HousingSubscriptionDetailStats(BaseModel):
+    """
+    Totals of the stored calculation results, aggregated in the database
+    """
+
+    detail_count: int
+    min_recognized_rounds: Optional[int] = None
+    max_recognized_rounds: Optional[int] = None
+    average_recognized_rounds: Optional[float] = None
+    sum_total_recognized_amount: int = 0
+    average_total_recognized_amount: Optional[float] = None
+    # Details per range of bucket_size recognized rounds
+    recognized_rounds_distribution: List[RecognizedRoundsBucket] = []
+
+
 # Shared properties
 class ItemBase(BaseModel):
     title: str
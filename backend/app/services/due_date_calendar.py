@@ -0,0 +1,97 @@
+import calendar
+from array import array
+from datetime import date, timedelta
+
+from app.services.recognition_errors import RecognitionRequestError
+
+# Range of due dates served from the table. Built once per process and only
+# read afterwards; dates outside it are calculated directly.
+MIN_YEAR = 1950
+MAX_YEAR = 2150
+
+DATE_OUT_OF_RANGE_DETAIL = "계산할 수 없는 날짜가 포함되어 있습니다."
+
+_MIN_MONTH_INDEX = MIN_YEAR * 12
+_MAX_MONTH_INDEX = MAX_YEAR * 12 + 11
+
+
+def _build_due_ordinal_table() -> array:
+    """
+    Ordinal of the due date for every (year, month, day 1..31) in the supported
+    range, with days past the end of a month clamped to its last day
+    """
+    table = array("i")
+    for year in range(MIN_YEAR, MAX_YEAR + 1):
+        for month in range(1, 13):
+            first_ordinal = date(year, month, 1).toordinal()
+            days_in_month = calendar.monthrange(year, month)[1]
+            table.extend(
+                first_ordinal + min(day, days_in_month) - 1 for day in range(1, 32)
+            )
+    return table
+
+
+DUE_ORDINAL_TABLE = _build_due_ordinal_table()
+
+
+def month_index(value: date) -> int:
+    return value.year * 12 + value.month - 1
+
+
+def check_day(day: int) -> None:
+    if not 1 <= day <= 31:
+        raise RecognitionRequestError("납입일은 1일부터 31일 사이여야 합니다.")
+
+
+def in_table(month_index_value: int) -> bool:
+    return _MIN_MONTH_INDEX <= month_index_value <= _MAX_MONTH_INDEX
+
+
+def table_offset(month_index_value: int, day: int) -> int:
+    """
+    Position of (month, day) in DUE_ORDINAL_TABLE. The month must be in_table.
+    """
+    check_day(day)
+    if not in_table(month_index_value):
+        raise ValueError(f"month is outside the table {MIN_YEAR}..{MAX_YEAR}")
+    return (month_index_value - _MIN_MONTH_INDEX) * 31 + day - 1
+
+
+def _calculate_due_ordinal(month_index_value: int, day: int) -> int:
+    year, month = divmod(month_index_value, 12)
+    if not 1 <= year <= 9999:
+        raise RecognitionRequestError(DATE_OUT_OF_RANGE_DETAIL)
+    days_in_month = calendar.monthrange(year, month + 1)[1]
+    return date(year, month + 1, min(day, days_in_month)).toordinal()
+
+
+def due_ordinal(month_index_value: int, day: int) -> int:
+    """
+    Ordinal of the due date on day of the given month, clamped to the month end
+    """
+    check_day(day)
+    if in_table(month_index_value):
+        offset = (month_index_value - _MIN_MONTH_INDEX) * 31 + day - 1
+        return DUE_ORDINAL_TABLE[offset]
+    return _calculate_due_ordinal(month_index_value, day)
+
+
+def due_date(year: int, month: int, day: int) -> date:
+    return date.fromordinal(due_ordinal(year * 12 + month - 1, day))
+
+
+def add_months(value: date, months: int) -> date:
+    """
+    Same day months later (or earlier), clamped to the end of the target month
+    """
+    return date.fromordinal(due_ordinal(month_index(value) + months, value.day))
+
+
+def add_days(value: date, days: int) -> date:
+    """
+    value + days, rejected as a request error past the supported date range
+    """
+    try:
+        return value + timedelta(days=days)
+    except OverflowError:
+        raise RecognitionRequestError(DATE_OUT_OF_RANGE_DETAIL) from None
@@ -0,0 +1,85 @@
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import List, Optional, Sequence
+
+from app.schemas import (
+    RecognitionBatchItemResult,
+    RecognitionCalculatorRequest,
+    RecognitionRuleSet,
+)
+from app.services.recognition_rules import get_rule_table, set_rule_table
+from app.services.recognized_date_calc import calculate_recognition_details
+
+BATCH_CHUNK_SIZE = 32
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def get_process_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Return the process pool shared by batch calculations, creating it on first use
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            # spawn instead of fork: the web server process runs threads
+            _process_pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_pool
+
+
+def calculate_recognition_item(
+    request: RecognitionCalculatorRequest,
+) -> RecognitionBatchItemResult:
+    try:
+        return RecognitionBatchItemResult(result=calculate_recognition_details(request))
+    except ValueError as e:
+        # RecognitionRequestError and invalid dates alike
+        return RecognitionBatchItemResult(error=str(e))
+
+
+def calculate_recognition_chunk_json(
+    requests: Sequence[RecognitionCalculatorRequest],
+    rule_set: Optional[RecognitionRuleSet] = None,
+) -> List[bytes]:
+    # Workers are spawned with the built-in rules and never see a reload in
+    # the parent, so chunks carry the rule set the batch started with.
+    if rule_set is not None and get_rule_table().to_rule_set() != rule_set:
+        set_rule_table(rule_set)
+    # Items leave the worker already serialized: pickling JSON bytes back to
+    # the parent is far cheaper than pickling hundreds of round models.
+    return [
+        calculate_recognition_item(request).model_dump_json().encode()
+        for request in requests
+    ]
+
+
+def calculate_recognition_batch_json(
+    requests: Sequence[RecognitionCalculatorRequest],
+    executor: Optional[Executor] = None,
+    chunk_size: int = BATCH_CHUNK_SIZE,
+) -> bytes:
+    """
+    Calculate every request and return a JSON array of RecognitionBatchItemResult,
+    reporting failures per item instead of raising.
+    Batches larger than one chunk are split and fanned out to the executor,
+    together with the current rule set.
+    """
+    if executor is None or len(requests) <= chunk_size:
+        items = calculate_recognition_chunk_json(requests)
+    else:
+        chunks = [
+            requests[i : i + chunk_size] for i in range(0, len(requests), chunk_size)
+        ]
+        calculate_chunk = partial(
+            calculate_recognition_chunk_json, rule_set=get_rule_table().to_rule_set()
+        )
+        items = []
+        for chunk_items in executor.map(calculate_chunk, chunks):
+            items.extend(chunk_items)
+    return b"[" + b",".join(items) + b"]"
@@ -0,0 +1,195 @@
+import hashlib
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Optional, Tuple
+
+from pydantic import BaseModel
+
+from app.schemas import (
+    PaymentAmountOption,
+    RecognitionCacheStats,
+    RecognitionCalculatorRequest,
+)
+from app.services.recognition_rules import get_rule_table
+from app.services.recognized_date_calc import _resolve_paid_amount
+
+
+def canonical_request_key(
+    request: RecognitionCalculatorRequest, as_of: Optional[date] = None
+) -> str:
+    """
+    Hash of the request after normalization, so requests that calculate the
+    same result share a key: payments are deduplicated (the last one per
+    installment wins, as in the calculation) and sorted, paid amounts are
+    resolved, and options that only differ in unused fields collapse.
+    The rule table version is part of the key, so a reload invalidates entries.
+    """
+    as_of = as_of or request.as_of or date.today()
+    rules = get_rule_table()
+
+    standard_payment_amount = 0
+    if request.payment_amount_option == PaymentAmountOption.standard:
+        standard_payment_amount = request.standard_payment_amount or 0
+    option = request.payment_amount_option
+    if option == PaymentAmountOption.standard and standard_payment_amount == 0:
+        # Rounds without a custom payment are missed either way. Negative
+        # amounts are not: such rounds keep the amount and are not missed.
+        option = PaymentAmountOption.custom
+
+    custom_payments = {}
+    for cp in request.payments or []:
+        if cp.installment_no >= 1:
+            custom_payments[cp.installment_no] = cp
+    payments = []
+    for installment_no in sorted(custom_payments):
+        cp = custom_payments[installment_no]
+        paid_amount = _resolve_paid_amount(
+            cp,
+            request.payment_amount_option,
+            request.standard_payment_amount,
+            cp.paid_date,
+            rules,
+        )
+        # The paid date of a round without a payment is never used
+        paid_day = cp.paid_date.toordinal() if paid_amount > 0 else None
+        # Amounts are not clamped: 0 is missed but a negative amount is not
+        payments.append((installment_no, paid_day, paid_amount))
+
+    normalized = [
+        request.payment_day,
+        request.start_date.toordinal(),
+        request.end_date.toordinal(),
+        option.value,
+        standard_payment_amount,
+        payments,
+        as_of.toordinal(),
+        rules.version,
+    ]
+    encoded = json.dumps(normalized, separators=(",", ":")).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def payment_request_key(request: BaseModel, as_of: Optional[date] = None) -> str:
+    """
+    Hash of a payment schedule request as sent, together with the as-of date
+    it is calculated for and the rule table version
+    """
+    normalized = [
+        type(request).__name__,
+        request.model_dump(mode="json"),
+        None if as_of is None else as_of.toordinal(),
+        get_rule_table().version,
+    ]
+    encoded = json.dumps(normalized, separators=(",", ":")).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def detail_result_key(
+    detail_id: uuid.UUID, updated_at: datetime, as_of: date
+) -> str:
+    """
+    Key of a stored request's result. A save changes updated_at, so entries of
+    replaced requests are never hit again and age out of the LRU.
+    """
+    rules_version = get_rule_table().version
+    return f"{detail_id}:{updated_at.isoformat()}:{as_of.isoformat()}:{rules_version}"
+
+
+class ResultCache:
+    """
+    Thread safe LRU cache of serialized results with a time to live.
+    Entries also expire at the next midnight, since results depend on the
+    current date.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], datetime] = datetime.now,
+    ):
+        self.max_entries = max_entries
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[bytes, datetime]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def _expires_at(self, now: datetime) -> datetime:
+        next_midnight = datetime.combine(
+            now.date() + timedelta(days=1), datetime.min.time(), now.tzinfo
+        )
+        return min(now + self.ttl, next_midnight)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if self._clock() < expires_at:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._entries[key]
+                self._expirations += 1
+            self._misses += 1
+            return None
+
+    def put(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (value, self._expires_at(self._clock()))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get_or_compute(self, key: str, compute: Callable[[], bytes]) -> bytes:
+        """
+        Cached value for key, computing and storing it on a miss.
+        Errors raised by compute are not cached.
+        """
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> RecognitionCacheStats:
+        with self._lock:
+            return RecognitionCacheStats(
+                entries=len(self._entries),
+                max_entries=self.max_entries,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+            )
+
+
+_result_caches: Dict[str, ResultCache] = {}
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache(
+    max_entries: int, ttl_seconds: float, name: str = "calculator"
+) -> ResultCache:
+    """
+    Return the named result cache shared by the process, creating it on first use.
+    "calculator" holds calculator responses and "detail" the results of
+    stored calculation requests.
+    """
+    with _result_cache_lock:
+        cache = _result_caches.get(name)
+        if cache is None:
+            cache = _result_caches[name] = ResultCache(max_entries, ttl_seconds)
+        return cache
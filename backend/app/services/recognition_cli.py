@@ -0,0 +1,184 @@
+"""
+Offline batch calculation of JSONL calculator requests.
+
+    python -m app.services.recognized_date_calc batch in.jsonl out.jsonl
+
+Each input line is a RecognitionCalculatorRequest. Each output line is the
+RecognitionBatchItemResult of that line (a result or an error) together with
+the input line number. Blank input lines are skipped. "-" reads stdin or
+writes stdout. --rules calculates with a JSON rule set (the format of
+RECOGNITION_RULES_FILE) instead of the built-in rules.
+
+Only the calculator and its schemas are imported. The web layer, the database
+and the settings (which need the Postgres environment) are not.
+"""
+
+import argparse
+import sys
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import ExitStack
+from itertools import islice
+from typing import BinaryIO, Deque, Iterator, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+
+from app.schemas import (
+    RecognitionBatchItemResult,
+    RecognitionCalculatorRequest,
+    RecognitionRuleSet,
+)
+from app.services.recognition_batch import calculate_recognition_item
+from app.services.recognition_rules import load_rule_set, set_rule_table
+
+CLI_CHUNK_LINES = 256
+
+# (output lines, error count) of one chunk
+_ChunkResult = Tuple[List[bytes], int]
+
+
+def calculate_jsonl_chunk(lines: List[Tuple[int, bytes]]) -> _ChunkResult:
+    """
+    Calculate (line number, request JSON) pairs into output lines.
+    Runs in the worker processes, so parsing is parallel too.
+    """
+    output = []
+    errors = 0
+    for line_no, raw in lines:
+        try:
+            request = RecognitionCalculatorRequest.model_validate_json(raw)
+        except ValidationError as e:
+            item = RecognitionBatchItemResult(error=str(e))
+        else:
+            item = calculate_recognition_item(request)
+        errors += item.error is not None
+        encoded = item.model_dump_json().encode()
+        output.append(b'{"line":%d,' % line_no + encoded[1:])
+    return output, errors
+
+
+def _read_chunks(
+    source: BinaryIO, chunk_lines: int
+) -> Iterator[List[Tuple[int, bytes]]]:
+    numbered = (
+        (line_no, raw)
+        for line_no, raw in enumerate(source, start=1)
+        if raw.strip()
+    )
+    while True:
+        chunk = list(islice(numbered, chunk_lines))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _write(target: BinaryIO, result: _ChunkResult) -> int:
+    output, errors = result
+    for line in output:
+        target.write(line)
+        target.write(b"\n")
+    return errors
+
+
+def run_batch(
+    source: BinaryIO,
+    target: BinaryIO,
+    workers: int = 1,
+    ordered: bool = True,
+    chunk_lines: int = CLI_CHUNK_LINES,
+    rule_set: Optional[RecognitionRuleSet] = None,
+) -> Tuple[int, int]:
+    """
+    Calculate every request line of source into target and return
+    (processed lines, errors). Input is read lazily: with several workers at
+    most two chunks per worker are in flight, so memory does not grow with
+    the input. Unordered output is written as chunks finish.
+    A rule_set replaces the rules of this process and of every worker.
+    """
+    chunks = _read_chunks(source, chunk_lines)
+    lines = 0
+    errors = 0
+    if rule_set is not None:
+        set_rule_table(rule_set)
+    if workers <= 1:
+        for chunk in chunks:
+            lines += len(chunk)
+            errors += _write(target, calculate_jsonl_chunk(chunk))
+        return lines, errors
+
+    max_in_flight = workers * 2
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=None if rule_set is None else set_rule_table,
+        initargs=() if rule_set is None else (rule_set,),
+    ) as executor:
+        if ordered:
+            queue: Deque[Future] = deque()
+            for chunk in chunks:
+                lines += len(chunk)
+                queue.append(executor.submit(calculate_jsonl_chunk, chunk))
+                if len(queue) >= max_in_flight:
+                    errors += _write(target, queue.popleft().result())
+            while queue:
+                errors += _write(target, queue.popleft().result())
+        else:
+            pending: Set[Future] = set()
+            for chunk in chunks:
+                lines += len(chunk)
+                pending.add(executor.submit(calculate_jsonl_chunk, chunk))
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        errors += _write(target, future.result())
+            for future in wait(pending).done:
+                errors += _write(target, future.result())
+    return lines, errors
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.services.recognized_date_calc",
+        description="Recognition calculator command line",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    batch = commands.add_parser(
+        "batch", help="calculate a JSONL file of calculator requests"
+    )
+    batch.add_argument("input", help="JSONL requests ('-' for stdin)")
+    batch.add_argument("output", help="JSONL results ('-' for stdout)")
+    batch.add_argument(
+        "--workers", type=int, default=1, help="worker processes (default: 1)"
+    )
+    batch.add_argument(
+        "--unordered",
+        action="store_true",
+        help="write results as they finish instead of in input order",
+    )
+    batch.add_argument("--chunk-lines", type=int, default=CLI_CHUNK_LINES)
+    batch.add_argument(
+        "--rules", help="JSON rule set to calculate with (default: built-in rules)"
+    )
+    args = parser.parse_args(argv)
+    rule_set = load_rule_set(args.rules) if args.rules else None
+
+    with ExitStack() as stack:
+        source = (
+            sys.stdin.buffer
+            if args.input == "-"
+            else stack.enter_context(open(args.input, "rb"))
+        )
+        target = (
+            sys.stdout.buffer
+            if args.output == "-"
+            else stack.enter_context(open(args.output, "wb"))
+        )
+        lines, errors = run_batch(
+            source,
+            target,
+            workers=args.workers,
+            ordered=not args.unordered,
+            chunk_lines=args.chunk_lines,
+            rule_set=rule_set,
+        )
+    print(f"{lines} requests, {errors} errors", file=sys.stderr)
+    return 0
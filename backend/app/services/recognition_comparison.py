@@ -0,0 +1,173 @@
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from app.schemas import (
+    CustomPaymentInput,
+    RecognitionCalculationResult,
+    RecognitionComparisonRequest,
+    RecognitionComparisonResult,
+    RecognitionRoundDiff,
+    RecognitionScenario,
+    RecognitionScenarioResult,
+)
+from app.services.recognition_errors import RecognitionRequestError
+from app.services.recognition_rules import RecognitionRuleTable, get_rule_table
+from app.services.recognized_date_calc import (
+    RecognitionRound,
+    _apply_recognition,
+    _apply_recognized_dates,
+    _build_result,
+    _resolve_paid_amount,
+    iter_due_dates,
+)
+
+MAX_COMPARISON_SCENARIOS = 10
+
+# Step C output of one round: recognized date, delay, prepaid and running totals
+_RecognizedDates = Tuple[Optional[date], int, int, int, int]
+
+
+def _build_scenario_rounds(
+    due_dates: List[date], scenario: RecognitionScenario, rules: RecognitionRuleTable
+) -> List[RecognitionRound]:
+    # Step B: Apply Custom Payments of the scenario to the shared schedule
+    custom_payments_map: Dict[int, CustomPaymentInput] = {}
+    if scenario.payments:
+        for cp in scenario.payments:
+            custom_payments_map[cp.installment_no] = cp
+
+    rounds = []
+    for installment_no, due_date in enumerate(due_dates, start=1):
+        custom_payment = custom_payments_map.get(installment_no)
+        paid_date_input = custom_payment.paid_date if custom_payment else due_date
+        paid_amount = _resolve_paid_amount(
+            custom_payment,
+            scenario.payment_amount_option,
+            scenario.standard_payment_amount,
+            paid_date_input,
+            rules,
+        )
+        rounds.append(
+            RecognitionRound(installment_no, due_date, paid_date_input, paid_amount)
+        )
+    return rounds
+
+
+def _apply_shared_recognized_dates(
+    rounds: List[RecognitionRound],
+    step_c_cache: Dict[Tuple[Optional[date], ...], List[_RecognizedDates]],
+    rules: RecognitionRuleTable,
+) -> None:
+    """
+    Step C only depends on which rounds were paid and when, not on amounts,
+    so scenarios with the same paid dates reuse one pass.
+    """
+    signature = tuple(round_state.paid_date for round_state in rounds)
+    cached = step_c_cache.get(signature)
+    if cached is None:
+        _apply_recognized_dates(rounds, rules)
+        step_c_cache[signature] = [
+            (
+                r.recognized_date,
+                r.delay_days,
+                r.prepaid_days,
+                r.total_delay_days,
+                r.total_prepaid_days,
+            )
+            for r in rounds
+        ]
+        return
+    for round_state, recognized in zip(rounds, cached):
+        (
+            round_state.recognized_date,
+            round_state.delay_days,
+            round_state.prepaid_days,
+            round_state.total_delay_days,
+            round_state.total_prepaid_days,
+        ) = recognized
+
+
+def _round_diffs(
+    baseline: List[RecognitionRound], rounds: List[RecognitionRound]
+) -> List[RecognitionRoundDiff]:
+    diffs = []
+    for base_round, round_state in zip(baseline, rounds):
+        recognized_date_diff_days = None
+        if base_round.recognized_date and round_state.recognized_date:
+            recognized_date_diff_days = (
+                round_state.recognized_date - base_round.recognized_date
+            ).days
+        recognized_amount_diff = (
+            round_state.recognized_amount_for_round
+            - base_round.recognized_amount_for_round
+        )
+        if (
+            base_round.is_recognized == round_state.is_recognized
+            and base_round.recognized_date == round_state.recognized_date
+            and recognized_amount_diff == 0
+        ):
+            continue
+        diffs.append(
+            RecognitionRoundDiff(
+                installment_no=round_state.installment_no,
+                baseline_is_recognized=base_round.is_recognized,
+                is_recognized=round_state.is_recognized,
+                recognized_date_diff_days=recognized_date_diff_days,
+                recognized_amount_diff=recognized_amount_diff,
+            )
+        )
+    return diffs
+
+
+def compare_recognition_scenarios(
+    request: RecognitionComparisonRequest,
+) -> RecognitionComparisonResult:
+    """
+    Calculate every scenario on one schedule and compare each with the first.
+    Due dates (Step A) are generated once, and the delay/prepaid pass (Step C)
+    runs once per distinct set of paid dates.
+    """
+    if not request.scenarios:
+        raise RecognitionRequestError("비교할 시나리오가 없습니다.")
+    if len(request.scenarios) > MAX_COMPARISON_SCENARIOS:
+        raise RecognitionRequestError(
+            f"시나리오는 최대 {MAX_COMPARISON_SCENARIOS}개까지 비교할 수 있습니다."
+        )
+
+    due_dates = list(
+        iter_due_dates(request.payment_day, request.start_date, request.end_date)
+    )
+    as_of = request.as_of or date.today()
+    rules = get_rule_table()
+    step_c_cache: Dict[Tuple[Optional[date], ...], List[_RecognizedDates]] = {}
+
+    scenario_rounds: List[List[RecognitionRound]] = []
+    results: List[RecognitionCalculationResult] = []
+    for scenario in request.scenarios:
+        rounds = _build_scenario_rounds(due_dates, scenario, rules)
+        _apply_shared_recognized_dates(rounds, step_c_cache, rules)
+        _apply_recognition(rounds, as_of, rules)
+        scenario_rounds.append(rounds)
+        results.append(
+            _build_result(
+                request.payment_day, request.start_date, request.end_date, rounds
+            )
+        )
+
+    baseline = results[0]
+    return RecognitionComparisonResult(
+        scenarios=[
+            RecognitionScenarioResult(
+                name=scenario.name,
+                result=result,
+                recognized_rounds_diff=result.recognized_rounds
+                - baseline.recognized_rounds,
+                total_recognized_amount_diff=result.total_recognized_amount
+                - baseline.total_recognized_amount,
+                round_diffs=_round_diffs(scenario_rounds[0], rounds),
+            )
+            for scenario, result, rounds in zip(
+                request.scenarios, results, scenario_rounds
+            )
+        ]
+    )
@@ -0,0 +1,244 @@
+import importlib
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from app.schemas import (
+    ColumnarDateFormat,
+    PaymentRecord,
+    PaymentRespose,
+    PaymentStatus,
+    PaymentStatusCode,
+    RecognitionCalculatorRequest,
+    RecognitionColumnarResult,
+    RecognitionRoundColumns,
+    RecognitionRoundRecord,
+)
+from app.services.recognition_errors import EncodingUnavailableError
+from app.services.recognized_date_calc import (
+    RecognitionRound,
+    calculate_recognition_rounds,
+    summarize_rounds,
+)
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Library and display name of each binary media type
+_ENCODING_MODULES = {
+    **{media_type: ("msgpack", "MessagePack") for media_type in MSGPACK_MEDIA_TYPES},
+    ARROW_MEDIA_TYPE: ("pyarrow", "Arrow"),
+}
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+STATUS_CODES = {status: PaymentStatusCode[status.name] for status in PaymentStatus}
+
+
+def to_epoch_day(value: date) -> int:
+    return value.toordinal() - EPOCH_ORDINAL
+
+
+def _to_optional_epoch_day(value: Optional[date]) -> Optional[int]:
+    return None if value is None else value.toordinal() - EPOCH_ORDINAL
+
+
+def _date_encoder(
+    date_format: ColumnarDateFormat,
+) -> Callable[[Optional[date]], Union[date, int, None]]:
+    if date_format == ColumnarDateFormat.ordinal:
+        return _to_optional_epoch_day
+    return lambda value: value
+
+
+def _recognition_column_lists(
+    rounds: Sequence[Union[RecognitionRound, RecognitionRoundRecord]],
+    encode_date: Callable[[Optional[date]], Union[date, int, None]],
+    encode_status: Callable[[PaymentStatus], Union[PaymentStatusCode, int]],
+) -> Dict[str, list]:
+    return {
+        "installment_no": [r.installment_no for r in rounds],
+        "due_date": [encode_date(r.due_date) for r in rounds],
+        "paid_date": [encode_date(r.paid_date) for r in rounds],
+        "recognized_date": [encode_date(r.recognized_date) for r in rounds],
+        "delay_days": [r.delay_days for r in rounds],
+        "total_delay_days": [r.total_delay_days for r in rounds],
+        "prepaid_days": [r.prepaid_days for r in rounds],
+        "total_prepaid_days": [r.total_prepaid_days for r in rounds],
+        "status": [encode_status(r.status) for r in rounds],
+        "is_recognized": [r.is_recognized for r in rounds],
+        "paid_amount": [r.paid_amount for r in rounds],
+        "recognized_amount_for_round": [
+            r.recognized_amount_for_round for r in rounds
+        ],
+    }
+
+
+def build_recognition_columns(
+    rounds: List[RecognitionRound],
+    date_format: ColumnarDateFormat = ColumnarDateFormat.iso,
+) -> RecognitionRoundColumns:
+    columns = _recognition_column_lists(
+        rounds, _date_encoder(date_format), STATUS_CODES.__getitem__
+    )
+    # Values are produced by the calculator itself, so validation is skipped
+    return RecognitionRoundColumns.model_construct(**columns)
+
+
+def calculate_recognition_columnar(
+    request: RecognitionCalculatorRequest,
+    date_format: ColumnarDateFormat = ColumnarDateFormat.iso,
+) -> RecognitionColumnarResult:
+    """
+    calculate_recognition_details with details laid out as one array per field
+    """
+    rounds = calculate_recognition_rounds(request)
+    recognized_rounds, unrecognized_rounds, total_recognized_amount = (
+        summarize_rounds(rounds)
+    )
+    return RecognitionColumnarResult(
+        payment_day=request.payment_day,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        recognized_rounds=recognized_rounds,
+        unrecognized_rounds=unrecognized_rounds,
+        total_recognized_amount=total_recognized_amount,
+        date_format=date_format,
+        details=build_recognition_columns(rounds, date_format),
+    )
+
+
+# Binary encodings. Dates are days since 1970-01-01 (Arrow date32) and status
+# is the PaymentStatusCode value. Both libraries are optional dependencies
+# (the "encodings" extra) and are only imported when a client asks for them.
+
+_RECOGNITION_ARROW_TYPES = {
+    "installment_no": "int32",
+    "due_date": "date32",
+    "paid_date": "date32",
+    "recognized_date": "date32",
+    "delay_days": "int32",
+    "total_delay_days": "int32",
+    "prepaid_days": "int32",
+    "total_prepaid_days": "int32",
+    "status": "int8",
+    "is_recognized": "bool_",
+    "paid_amount": "int64",
+    "recognized_amount_for_round": "int64",
+}
+
+_PAYMENT_ARROW_TYPES = {
+    "installment_no": "int32",
+    "due_date": "date32",
+    "paid_date": "date32",
+    "delay_days": "int32",
+    "total_delay_days": "int32",
+    "prepaid_days": "int32",
+    "total_prepaid_days": "int32",
+    "recognized_date": "date32",
+    "is_recognized": "bool_",
+}
+
+
+def _payment_column_lists(payments: Sequence[PaymentRecord]) -> Dict[str, list]:
+    return {
+        "installment_no": [p.installment_no for p in payments],
+        "due_date": [p.due_date.toordinal() - EPOCH_ORDINAL for p in payments],
+        "paid_date": [p.paid_date.toordinal() - EPOCH_ORDINAL for p in payments],
+        "delay_days": [p.delay_days for p in payments],
+        "total_delay_days": [p.total_delay_days for p in payments],
+        "prepaid_days": [p.prepaid_days for p in payments],
+        "total_prepaid_days": [p.total_prepaid_days for p in payments],
+        "recognized_date": [
+            p.recognized_date.toordinal() - EPOCH_ORDINAL for p in payments
+        ],
+        "is_recognized": [p.is_recognized for p in payments],
+    }
+
+
+def _import_encoding(media_type: str) -> Any:
+    module_name, name = _ENCODING_MODULES[media_type]
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        raise EncodingUnavailableError(
+            f"{name} 응답을 지원하지 않는 서버입니다."
+        ) from None
+
+
+def check_encoding_available(media_type: str) -> None:
+    """
+    Raise EncodingUnavailableError when the library of a binary media type is
+    not installed, so callers can refuse it before calculating anything
+    """
+    _import_encoding(media_type)
+
+
+def _encode_msgpack(
+    summary: Dict[str, Any], table_name: str, columns: Dict[str, list]
+) -> bytes:
+    msgpack = _import_encoding(MSGPACK_MEDIA_TYPES[0])
+    return msgpack.packb({**summary, table_name: columns})
+
+
+def _encode_arrow(
+    summary: Dict[str, Any], columns: Dict[str, list], arrow_types: Dict[str, str]
+) -> bytes:
+    pa = _import_encoding(ARROW_MEDIA_TYPE)
+    # One record batch holding the table; the totals travel as schema metadata
+    batch = pa.record_batch(
+        [
+            pa.array(values, type=getattr(pa, arrow_types[name])())
+            for name, values in columns.items()
+        ],
+        names=list(columns),
+        metadata={key: str(value) for key, value in summary.items()},
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def encode_recognition_result(
+    request: RecognitionCalculatorRequest,
+    rounds: List[RecognitionRound],
+    media_type: str,
+) -> bytes:
+    """
+    Binary version of RecognitionCalculationResult for the given media type.
+    MessagePack holds the totals and a details map of column arrays; Arrow IPC
+    holds the details as a record batch with the totals in the schema metadata.
+    """
+    recognized_rounds, unrecognized_rounds, total_recognized_amount = (
+        summarize_rounds(rounds)
+    )
+    summary = {
+        "payment_day": request.payment_day,
+        "start_date": to_epoch_day(request.start_date),
+        "end_date": to_epoch_day(request.end_date),
+        "recognized_rounds": recognized_rounds,
+        "unrecognized_rounds": unrecognized_rounds,
+        "total_recognized_amount": total_recognized_amount,
+    }
+    columns = _recognition_column_lists(
+        rounds, _to_optional_epoch_day, lambda status: STATUS_CODES[status].value
+    )
+    if media_type == ARROW_MEDIA_TYPE:
+        return _encode_arrow(summary, columns, _RECOGNITION_ARROW_TYPES)
+    return _encode_msgpack(summary, "details", columns)
+
+
+def encode_payment_response(response: PaymentRespose, media_type: str) -> bytes:
+    """
+    Binary version of PaymentRespose for the given media type, laid out like
+    encode_recognition_result with payments as the table
+    """
+    summary = {
+        "total_installments": response.total_installments,
+        "total_delay_days": response.total_delay_days,
+        "total_prepaid_days": response.total_prepaid_days,
+    }
+    columns = _payment_column_lists(response.payments)
+    if media_type == ARROW_MEDIA_TYPE:
+        return _encode_arrow(summary, columns, _PAYMENT_ARROW_TYPES)
+    return _encode_msgpack(summary, "payments", columns)
@@ -0,0 +1,17 @@
+class RecognitionRequestError(ValueError):
+    """
+    Calculator request that cannot be calculated.
+    Services raise it instead of HTTPException so they can run without the web
+    layer (batch jobs, the command line); the API answers it with status_code.
+    """
+
+    def __init__(self, detail: str, status_code: int = 400):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+class EncodingUnavailableError(Exception):
+    """
+    Binary encoding whose library is not installed on this server
+    """
@@ -0,0 +1,199 @@
+import json
+import logging
+import os
+import threading
+from bisect import bisect_right
+from datetime import date
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.schemas import RecognitionRule, RecognitionRuleSet
+from app.services.recognition_errors import RecognitionRequestError
+
+DEFAULT_RULE_SET = RecognitionRuleSet(
+    version="default",
+    rules=[
+        RecognitionRule(
+            effective_from=date(1900, 1, 1),
+            max_recognized_amount=100000,
+            max_prepaid_days=721,
+            prepayment_window_months=24,
+        ),
+        RecognitionRule(
+            effective_from=date(2024, 11, 1),
+            max_recognized_amount=250000,
+            max_prepaid_days=721,
+            prepayment_window_months=24,
+        ),
+    ],
+)
+
+
+def prepaid_limit_detail(max_prepaid_days: int) -> str:
+    if max_prepaid_days == 721:
+        return "회차별 선납일수는 최대 2년(721일)을 초과할 수 없습니다."
+    return f"회차별 선납일수는 최대 {max_prepaid_days}일을 초과할 수 없습니다."
+
+
+class RecognitionRuleTable:
+    """
+    Effective-dated recognition rules compiled for lookup.
+    The rule of a date is the last one whose effective_from is on or before it
+    (the first rule also covers earlier dates). Columns are kept both as lists
+    for bisect lookups and as numpy arrays for the vectorized engine.
+    """
+
+    def __init__(self, rule_set: RecognitionRuleSet):
+        rules = sorted(rule_set.rules, key=lambda rule: rule.effective_from)
+        if not rules:
+            raise ValueError("recognition rule set is empty")
+        if len({rule.effective_from for rule in rules}) != len(rules):
+            raise ValueError("recognition rules must have distinct effective dates")
+        self.version = rule_set.version
+        self.rules = rules
+        self.effective_ordinals: List[int] = [
+            rule.effective_from.toordinal() for rule in rules
+        ]
+        self.max_recognized_amounts: List[int] = [
+            rule.max_recognized_amount for rule in rules
+        ]
+        self.max_prepaid_days: List[int] = [rule.max_prepaid_days for rule in rules]
+        self.prepayment_window_months: List[int] = [
+            rule.prepayment_window_months for rule in rules
+        ]
+        self.effective_ordinal_array = np.array(self.effective_ordinals, dtype=np.int64)
+        self.max_recognized_amount_array = np.array(
+            self.max_recognized_amounts, dtype=np.int64
+        )
+        self.max_prepaid_days_array = np.array(self.max_prepaid_days, dtype=np.int64)
+
+    def index_at(self, ordinal: int) -> int:
+        return max(bisect_right(self.effective_ordinals, ordinal) - 1, 0)
+
+    def indexes_at(self, ordinals: np.ndarray) -> np.ndarray:
+        """
+        Vectorized index_at over an array of day ordinals
+        """
+        indexes = np.searchsorted(self.effective_ordinal_array, ordinals, side="right")
+        return np.maximum(indexes - 1, 0)
+
+    def rule_at(self, value: date) -> RecognitionRule:
+        return self.rules[self.index_at(value.toordinal())]
+
+    def max_recognized_amount_at(self, value: date) -> int:
+        return self.max_recognized_amounts[self.index_at(value.toordinal())]
+
+    def max_prepaid_days_at(self, value: date) -> int:
+        return self.max_prepaid_days[self.index_at(value.toordinal())]
+
+    def prepayment_window_months_at(self, value: date) -> int:
+        return self.prepayment_window_months[self.index_at(value.toordinal())]
+
+    def check_prepaid_days(self, prepaid_days: int, paid_date: date) -> None:
+        max_prepaid_days = self.max_prepaid_days_at(paid_date)
+        if prepaid_days > max_prepaid_days:
+            raise RecognitionRequestError(prepaid_limit_detail(max_prepaid_days))
+
+    def to_rule_set(self) -> RecognitionRuleSet:
+        return RecognitionRuleSet(version=self.version, rules=self.rules)
+
+
+_rule_table = RecognitionRuleTable(DEFAULT_RULE_SET)
+_rule_table_lock = threading.Lock()
+# File the table follows and its (mtime, size) when last read. Each server
+# worker re-reads the file once it changes, so a reload reaches all of them.
+_rule_file: Optional[str] = None
+_rule_file_stamp: Optional[Tuple[int, int]] = None
+
+logger = logging.getLogger(__name__)
+
+
+def get_rule_table() -> RecognitionRuleTable:
+    """
+    Current rule table. Calculations take it once and use it throughout, so a
+    reload never mixes two versions within one result.
+    """
+    if _rule_file is not None:
+        _refresh_rule_table()
+    return _rule_table
+
+
+def set_rule_table(rule_set: RecognitionRuleSet) -> RecognitionRuleTable:
+    """
+    Use rule_set from now on, no longer following a rules file
+    """
+    global _rule_table, _rule_file, _rule_file_stamp
+    table = RecognitionRuleTable(rule_set)
+    with _rule_table_lock:
+        _rule_table = table
+        _rule_file = None
+        _rule_file_stamp = None
+    return table
+
+
+def reload_rule_table(path: Optional[str] = None) -> RecognitionRuleTable:
+    """
+    Replace the rule table with the rule set stored as JSON at path,
+    or with the built-in rules when no path is given.
+    The table then follows the file: changes are picked up on the next lookup.
+    """
+    global _rule_table, _rule_file, _rule_file_stamp
+    if path is None:
+        return set_rule_table(DEFAULT_RULE_SET)
+    stamp = _file_stamp(path)
+    table = RecognitionRuleTable(load_rule_set(path))
+    with _rule_table_lock:
+        _check_version(_rule_table, table)
+        _rule_table = table
+        _rule_file = path
+        _rule_file_stamp = stamp
+    return table
+
+
+def load_rule_set(path: str) -> RecognitionRuleSet:
+    with open(path, encoding="utf-8") as f:
+        return RecognitionRuleSet.model_validate(json.load(f))
+
+
+def _file_stamp(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _check_version(current: RecognitionRuleTable, table: RecognitionRuleTable) -> None:
+    # Cached results are keyed by version, so new rules need a new version
+    if table.version == current.version and table.rules != current.rules:
+        raise ValueError(
+            f"recognition rules changed but version {table.version!r} did not"
+        )
+
+
+def _refresh_rule_table() -> None:
+    global _rule_table, _rule_file_stamp
+    path = _rule_file
+    if path is None:
+        return
+    try:
+        stamp = _file_stamp(path)
+    except OSError:
+        return
+    if stamp == _rule_file_stamp:
+        return
+    with _rule_table_lock:
+        if path != _rule_file or stamp == _rule_file_stamp:
+            return
+        # Recorded before reading: a later write changes the stamp again
+        _rule_file_stamp = stamp
+        try:
+            table = RecognitionRuleTable(load_rule_set(path))
+            _check_version(_rule_table, table)
+        except (OSError, ValueError) as e:
+            logger.warning(
+                "Keeping recognition rules %r, %s not loaded: %s",
+                _rule_table.version,
+                path,
+                e,
+            )
+            return
+        _rule_table = table
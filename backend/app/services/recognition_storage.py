@@ -0,0 +1,105 @@
+"""
+Compact binary storage of RecognitionCalculationResult.
+
+A packed result is one format byte followed by the compressed MessagePack of
+the columnar layout of the msgpack media type: the totals plus a details map
+of column arrays, with dates as days since 1970-01-01 and status as the
+PaymentStatusCode value. The format byte names the compression, so readers
+keep accepting every format ever written and rows can be repacked later.
+
+msgpack (the "encodings" extra) is required. zstd is used when the zstandard
+package is installed, and zlib otherwise.
+"""
+
+import zlib
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from app.schemas import RecognitionCalculationResult
+from app.services.recognition_encoding import (
+    EPOCH_ORDINAL,
+    STATUS_CODES,
+    _recognition_column_lists,
+    _to_optional_epoch_day,
+    to_epoch_day,
+)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Format bytes. New formats get new values; existing ones never change.
+PACKED_FORMAT_ZSTD_MSGPACK = 1
+PACKED_FORMAT_ZLIB_MSGPACK = 2
+
+ZSTD_LEVEL = 9
+ZLIB_LEVEL = 9
+
+_STATUS_VALUES = {code.value: status.value for status, code in STATUS_CODES.items()}
+
+
+def _from_epoch_day(value: Optional[int]) -> Optional[str]:
+    if value is None:
+        return None
+    return date.fromordinal(value + EPOCH_ORDINAL).isoformat()
+
+
+def pack_calculation_result(result: RecognitionCalculationResult) -> bytes:
+    import msgpack
+
+    summary = {
+        "payment_day": result.payment_day,
+        "start_date": to_epoch_day(result.start_date),
+        "end_date": to_epoch_day(result.end_date),
+        "recognized_rounds": result.recognized_rounds,
+        "unrecognized_rounds": result.unrecognized_rounds,
+        "total_recognized_amount": result.total_recognized_amount,
+    }
+    columns = _recognition_column_lists(
+        result.details,
+        _to_optional_epoch_day,
+        lambda status: STATUS_CODES[status].value,
+    )
+    payload = msgpack.packb({**summary, "details": columns})
+    if zstandard is not None:
+        compressed = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(payload)
+        return bytes((PACKED_FORMAT_ZSTD_MSGPACK,)) + compressed
+    return bytes((PACKED_FORMAT_ZLIB_MSGPACK,)) + zlib.compress(payload, ZLIB_LEVEL)
+
+
+def unpack_calculation_result(data: bytes) -> Dict[str, Any]:
+    """
+    Inverse of pack_calculation_result, returned as the JSON document
+    (RecognitionCalculationResult.model_dump(mode="json")) it was packed from
+    """
+    import msgpack
+
+    if not data:
+        raise ValueError("Empty packed calculation result")
+    packed_format = data[0]
+    if packed_format == PACKED_FORMAT_ZSTD_MSGPACK:
+        if zstandard is None:
+            raise ValueError("zstandard is required to read this calculation result")
+        payload = zstandard.ZstdDecompressor().decompress(data[1:])
+    elif packed_format == PACKED_FORMAT_ZLIB_MSGPACK:
+        payload = zlib.decompress(data[1:])
+    else:
+        raise ValueError(f"Unknown packed calculation result format {packed_format}")
+
+    unpacked = msgpack.unpackb(payload)
+    columns: Dict[str, List[Any]] = unpacked.pop("details")
+    columns["due_date"] = [_from_epoch_day(d) for d in columns["due_date"]]
+    columns["paid_date"] = [_from_epoch_day(d) for d in columns["paid_date"]]
+    columns["recognized_date"] = [
+        _from_epoch_day(d) for d in columns["recognized_date"]
+    ]
+    columns["status"] = [_STATUS_VALUES[code] for code in columns["status"]]
+    names = list(columns)
+    details = [dict(zip(names, values)) for values in zip(*columns.values())]
+    return {
+        **unpacked,
+        "start_date": _from_epoch_day(unpacked["start_date"]),
+        "end_date": _from_epoch_day(unpacked["end_date"]),
+        "details": details,
+    }
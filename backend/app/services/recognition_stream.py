@@ -0,0 +1,122 @@
+from datetime import date
+from typing import Iterable, Iterator, List, Optional
+
+from pydantic import BaseModel
+
+from app.schemas import (
+    PaymentInput,
+    PaymentRecord,
+    PaymentStreamSummary,
+    RecognitionCalculatorRequest,
+    RecognitionStreamSummary,
+)
+from app.services.recognized_date_calc import (
+    check_normal_payments,
+    check_recalc_payments,
+    iter_normal_payments,
+    iter_recalc_payments,
+    iter_recognition_rounds,
+)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Lines are sent in small groups: one body message per round costs more than
+# the round itself, while a fixed group size keeps memory flat.
+NDJSON_CHUNK_LINES = 64
+
+
+def _summary_line(summary: BaseModel) -> bytes:
+    return b'{"summary":' + summary.model_dump_json().encode() + b"}\n"
+
+
+def _chunk_lines(lines: Iterable[bytes]) -> Iterator[bytes]:
+    chunk: List[bytes] = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= NDJSON_CHUNK_LINES:
+            yield b"".join(chunk)
+            chunk = []
+    if chunk:
+        yield b"".join(chunk)
+
+
+def _payment_lines(
+    payments: Iterable[PaymentRecord], current_date: date
+) -> Iterator[bytes]:
+    # Same totals as _build_payment_response in the payment schedule routes
+    total_installments = 0
+    last_payment: Optional[PaymentRecord] = None
+    for payment in payments:
+        if payment.recognized_date <= current_date:
+            total_installments += 1
+        if last_payment is None or payment.installment_no > last_payment.installment_no:
+            last_payment = payment
+        yield payment.model_dump_json().encode() + b"\n"
+
+    summary = PaymentStreamSummary(total_installments=total_installments)
+    if last_payment is not None:
+        summary.total_delay_days = last_payment.total_delay_days
+        summary.total_prepaid_days = last_payment.total_prepaid_days
+    yield _summary_line(summary)
+
+
+def stream_normal_payments(
+    open_date: date, due_day: int, end_date: date
+) -> Iterator[bytes]:
+    """
+    NDJSON version of generate_normal_payments: one PaymentRecord per line,
+    followed by a {"summary": PaymentStreamSummary} line.
+    Request errors are raised by this call, before anything is streamed.
+    """
+    check_normal_payments(open_date, due_day, end_date)
+    payments = iter_normal_payments(open_date, due_day, end_date)
+    return _chunk_lines(_payment_lines(payments, end_date))
+
+
+def stream_recalc_payments(
+    payments: List[PaymentInput], end_date: date, as_of: Optional[date] = None
+) -> Iterator[bytes]:
+    """
+    NDJSON version of recalc_payments: one PaymentRecord per line,
+    followed by a {"summary": PaymentStreamSummary} line.
+    Request errors are raised by this call, before anything is streamed.
+    """
+    check_recalc_payments(payments)
+    records = iter_recalc_payments(payments, as_of)
+    return _chunk_lines(_payment_lines(records, end_date))
+
+
+def stream_recognition_details(
+    request: RecognitionCalculatorRequest,
+) -> Iterator[bytes]:
+    """
+    NDJSON version of calculate_recognition_details: one RecognitionRoundRecord
+    per line, followed by a {"summary": RecognitionStreamSummary} line.
+    Request errors are raised by this call, before anything is streamed.
+    """
+    rounds = iter_recognition_rounds(request)
+
+    def lines() -> Iterator[bytes]:
+        recognized_rounds = 0
+        unrecognized_rounds = 0
+        total_recognized_amount = 0
+        for round_state in rounds:
+            if round_state.is_recognized:
+                recognized_rounds += 1
+                total_recognized_amount += round_state.recognized_amount_for_round
+            else:
+                unrecognized_rounds += 1
+            yield round_state.to_record().model_dump_json().encode() + b"\n"
+
+        yield _summary_line(
+            RecognitionStreamSummary(
+                payment_day=request.payment_day,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                recognized_rounds=recognized_rounds,
+                unrecognized_rounds=unrecognized_rounds,
+                total_recognized_amount=total_recognized_amount,
+            )
+        )
+
+    return _chunk_lines(lines())
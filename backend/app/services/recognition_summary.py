@@ -0,0 +1,365 @@
+from bisect import bisect_left
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from app.schemas import (
+    CustomPaymentInput,
+    PaymentAmountOption,
+    RecognitionCalculationResult,
+    RecognitionCalculatorRequest,
+    RecognitionSweepRequest,
+    RecognitionSweepResult,
+)
+from app.services.due_date_calendar import add_months, due_ordinal, month_index
+from app.services.recognition_errors import RecognitionRequestError
+from app.services.recognition_rules import (
+    RecognitionRuleTable,
+    get_rule_table,
+    prepaid_limit_detail,
+)
+from app.services.recognized_date_calc import (
+    _resolve_paid_amount,
+    calculate_recognition_details,
+)
+
+
+def _count_due_dates_until(
+    first_month_index: int, payment_day: int, round_count: int, until: date
+) -> int:
+    """
+    Number of the first round_count monthly due dates that fall on or before until
+    """
+    until_month_index = month_index(until)
+    if until_month_index < first_month_index:
+        return 0
+    if until_month_index >= first_month_index + round_count:
+        return round_count
+    count = until_month_index - first_month_index
+    if until.toordinal() >= due_ordinal(until_month_index, payment_day):
+        count += 1
+    return min(count, round_count)
+
+
+class _SegmentSchedule:
+    """
+    Monthly schedule of a request, evaluated segment by segment.
+    Rounds between custom payments are uniform: paid on the due date with the
+    option's default amount, so they leave the running delay/prepaid balance
+    unchanged and their recognized dates follow due_date + balance // round.
+    Uniform rounds are counted per recognition rule, by the rule of their due date.
+    """
+
+    def __init__(
+        self,
+        request: RecognitionCalculatorRequest,
+        as_of: date,
+        rules: RecognitionRuleTable,
+    ):
+        self.request = request
+        self.rules = rules
+        self.payment_day = request.payment_day
+        self.first_month_index = month_index(request.start_date)
+        self.round_count = _count_due_dates_until(
+            self.first_month_index,
+            self.payment_day,
+            max(month_index(request.end_date) - self.first_month_index + 1, 0),
+            request.end_date,
+        )
+        self.as_of_ordinal = as_of.toordinal()
+        # Rounds rule_starts[k] + 1..rule_starts[k + 1] are due under rule k
+        self.rule_starts = [0] + [
+            _count_due_dates_until(
+                self.first_month_index,
+                self.payment_day,
+                self.round_count,
+                rule.effective_from - timedelta(days=1),
+            )
+            for rule in rules.rules[1:]
+        ]
+        # Rounds 1..due_until_as_of are due on or before as_of
+        self.due_until_as_of = _count_due_dates_until(
+            self.first_month_index, self.payment_day, self.round_count, as_of
+        )
+
+    def due_ordinal(self, installment_no: int) -> int:
+        return due_ordinal(
+            self.first_month_index + installment_no - 1, self.payment_day
+        )
+
+    def uniform_amounts(self) -> List[int]:
+        """
+        Default paid amount of a uniform round due under each rule.
+        All are positive or none is.
+        """
+        rule_count = len(self.rule_starts)
+        if self.request.payment_amount_option == PaymentAmountOption.standard:
+            return [self.request.standard_payment_amount or 0] * rule_count
+        if self.request.payment_amount_option == PaymentAmountOption.maximum:
+            return list(self.rules.max_recognized_amounts)
+        return [0] * rule_count
+
+    def fits_date_range(self, custom_payments: List[Tuple[int, int, int]]) -> bool:
+        """
+        Whether every recognized date is certain to stay on or before date.max.
+        Adjustments never exceed the sum of the delays, and due dates never
+        exceed the last one.
+        """
+        if self.round_count == 0:
+            return True
+        late_days = sum(
+            max(paid_ordinal - self.due_ordinal(installment_no), 0)
+            for installment_no, paid_ordinal, paid_amount in custom_payments
+            if installment_no <= self.round_count and paid_amount > 0
+        )
+        last_due_ordinal = self.due_ordinal(self.round_count)
+        return last_due_ordinal + late_days <= date.max.toordinal()
+
+    def is_recognized(self, installment_no: int, balance: int) -> bool:
+        adjustment = balance // installment_no
+        return self.due_ordinal(installment_no) + adjustment <= self.as_of_ordinal
+
+    def count_recognized(self, first: int, last: int, balance: int) -> List[int]:
+        """
+        Recognized uniform rounds in first..last, counted per rule
+        """
+        if first > last:
+            return [0] * len(self.rule_starts)
+        if balance == 0:
+            recognized_last = min(last, self.due_until_as_of)
+            return self._split_by_rules(first, recognized_last)
+
+        counts = [0] * len(self.rule_starts)
+        installment_no = first
+        # recognized dates only grow with the round once balance / (i * (i + 1))
+        # drops below a month; earlier rounds are checked one by one
+        while (
+            installment_no <= last
+            and installment_no * (installment_no + 1) * 27 < balance
+        ):
+            if self.is_recognized(installment_no, balance):
+                counts[bisect_left(self.rule_starts, installment_no) - 1] += 1
+            installment_no += 1
+
+        low, high = installment_no, last + 1
+        while low < high:
+            middle = (low + high) // 2
+            if self.is_recognized(middle, balance):
+                low = middle + 1
+            else:
+                high = middle
+        sorted_counts = self._split_by_rules(installment_no, low - 1)
+        return [
+            count + sorted_count for count, sorted_count in zip(counts, sorted_counts)
+        ]
+
+    def _split_by_rules(self, first: int, last: int) -> List[int]:
+        rule_ends = self.rule_starts[1:] + [self.round_count]
+        return [
+            max(0, min(last, rule_end) - max(first, rule_start + 1) + 1)
+            for rule_start, rule_end in zip(self.rule_starts, rule_ends)
+        ]
+
+
+def _resolve_custom_payments(
+    request: RecognitionCalculatorRequest, rules: RecognitionRuleTable
+) -> List[Tuple[int, int, int]]:
+    """
+    (installment_no, paid ordinal, paid amount) of every custom payment sorted
+    by installment, the last one per installment winning as in Step B.
+    Paid amounts only depend on the paid date, so they hold for any schedule.
+    """
+    custom_payments_map: Dict[int, CustomPaymentInput] = {}
+    if request.payments:
+        for cp in request.payments:
+            if cp.installment_no >= 1:
+                custom_payments_map[cp.installment_no] = cp
+
+    custom_payments = []
+    for installment_no in sorted(custom_payments_map):
+        cp = custom_payments_map[installment_no]
+        paid_amount = _resolve_paid_amount(
+            cp,
+            request.payment_amount_option,
+            request.standard_payment_amount,
+            cp.paid_date,
+            rules,
+        )
+        custom_payments.append((installment_no, cp.paid_date.toordinal(), paid_amount))
+    return custom_payments
+
+
+def _summarize_schedule(
+    schedule: _SegmentSchedule, custom_payments: List[Tuple[int, int, int]]
+) -> Tuple[int, int]:
+    """
+    (recognized rounds, total recognized amount) of the schedule
+    """
+    rules = schedule.rules
+    uniform_amounts = schedule.uniform_amounts()
+    uniform_recognized_amounts = [
+        min(amount, max_amount)
+        for amount, max_amount in zip(uniform_amounts, rules.max_recognized_amounts)
+    ]
+
+    # Running total_delay_days - total_prepaid_days
+    balance = 0
+    recognized_rounds = 0
+    total_recognized_amount = 0
+
+    def add_uniform_segment(first: int, last: int) -> None:
+        nonlocal recognized_rounds, total_recognized_amount
+        # Uniform rounds without an amount are missed and never recognized
+        if uniform_amounts[0] <= 0:
+            return
+        counts = schedule.count_recognized(first, last, balance)
+        recognized_rounds += sum(counts)
+        total_recognized_amount += sum(
+            count * amount for count, amount in zip(counts, uniform_recognized_amounts)
+        )
+
+    segment_start = 1
+    for installment_no, paid_ordinal, paid_amount in custom_payments:
+        if installment_no > schedule.round_count:
+            break
+        add_uniform_segment(segment_start, installment_no - 1)
+        segment_start = installment_no + 1
+
+        if paid_amount <= 0:
+            continue
+        rule_index = rules.index_at(paid_ordinal)
+        delay_days = paid_ordinal - schedule.due_ordinal(installment_no)
+        if -delay_days > rules.max_prepaid_days[rule_index]:
+            raise RecognitionRequestError(
+                prepaid_limit_detail(rules.max_prepaid_days[rule_index])
+            )
+        balance += delay_days
+        if schedule.is_recognized(installment_no, balance):
+            recognized_rounds += 1
+            total_recognized_amount += min(
+                paid_amount, rules.max_recognized_amounts[rule_index]
+            )
+    add_uniform_segment(segment_start, schedule.round_count)
+
+    return recognized_rounds, total_recognized_amount
+
+
+def _summarize_request(
+    request: RecognitionCalculatorRequest,
+    schedule: _SegmentSchedule,
+    custom_payments: List[Tuple[int, int, int]],
+) -> Tuple[int, int]:
+    """
+    (recognized rounds, total recognized amount) of the request's schedule
+    """
+    if not schedule.fits_date_range(custom_payments):
+        # Schedules running into date.max fail exactly like the full engine
+        result = calculate_recognition_details(request)
+        return result.recognized_rounds, result.total_recognized_amount
+    return _summarize_schedule(schedule, custom_payments)
+
+
+def _summarize_segments(
+    request: RecognitionCalculatorRequest,
+) -> RecognitionCalculationResult:
+    rules = get_rule_table()
+    schedule = _SegmentSchedule(request, request.as_of or date.today(), rules)
+    recognized_rounds, total_recognized_amount = _summarize_request(
+        request, schedule, _resolve_custom_payments(request, rules)
+    )
+
+    return RecognitionCalculationResult(
+        payment_day=request.payment_day,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        recognized_rounds=recognized_rounds,
+        unrecognized_rounds=schedule.round_count - recognized_rounds,
+        total_recognized_amount=total_recognized_amount,
+        details=[],
+    )
+
+
+def calculate_recognition_summary(
+    request: RecognitionCalculatorRequest,
+) -> RecognitionCalculationResult:
+    """
+    Totals of calculate_recognition_details without the per-round details.
+    Only rounds with a custom payment are evaluated individually; the uniform
+    stretches between them are counted arithmetically, so the cost grows with
+    the number of custom payments rather than the length of the schedule.
+    """
+    # Invalid days fall back so that they fail exactly like the full engine
+    if not 1 <= request.payment_day <= 31:
+        result = calculate_recognition_details(request)
+        return result.model_copy(update={"details": []})
+    return _summarize_segments(request)
+
+
+def calculate_recognition_sweep(
+    request: RecognitionSweepRequest,
+) -> RecognitionSweepResult:
+    """
+    Summary totals for every payment day and monthly start date in the ranges.
+    Custom payments are resolved once and shared by every variant, and each
+    variant is summarized segment by segment without building its schedule.
+    """
+    if not 1 <= request.payment_day_from <= request.payment_day_to <= 31:
+        raise RecognitionRequestError("납입일 범위는 1일부터 31일 사이여야 합니다.")
+    if request.start_date_to < request.start_date_from:
+        raise RecognitionRequestError("시작일 범위의 종료일은 시작일 이후여야 합니다.")
+
+    payment_days = list(range(request.payment_day_from, request.payment_day_to + 1))
+    start_dates = []
+    start_date = request.start_date_from
+    while start_date <= request.start_date_to:
+        start_dates.append(start_date)
+        start_date = add_months(request.start_date_from, len(start_dates))
+
+    base = RecognitionCalculatorRequest(
+        payment_day=request.payment_day_from,
+        start_date=request.start_date_from,
+        end_date=request.end_date,
+        payment_amount_option=request.payment_amount_option,
+        standard_payment_amount=request.standard_payment_amount,
+        payments=request.payments,
+        as_of=request.as_of,
+    )
+    rules = get_rule_table()
+    custom_payments = _resolve_custom_payments(base, rules)
+    as_of = request.as_of or date.today()
+
+    recognized_rows: List[List[Optional[int]]] = []
+    unrecognized_rows: List[List[Optional[int]]] = []
+    amount_rows: List[List[Optional[int]]] = []
+    for start_date in start_dates:
+        recognized_row: List[Optional[int]] = []
+        unrecognized_row: List[Optional[int]] = []
+        amount_row: List[Optional[int]] = []
+        for payment_day in payment_days:
+            variant = base.model_copy(
+                update={"payment_day": payment_day, "start_date": start_date}
+            )
+            schedule = _SegmentSchedule(variant, as_of, rules)
+            try:
+                recognized_rounds, total_recognized_amount = _summarize_request(
+                    variant, schedule, custom_payments
+                )
+            except RecognitionRequestError:
+                recognized_row.append(None)
+                unrecognized_row.append(None)
+                amount_row.append(None)
+                continue
+            recognized_row.append(recognized_rounds)
+            unrecognized_row.append(schedule.round_count - recognized_rounds)
+            amount_row.append(total_recognized_amount)
+        recognized_rows.append(recognized_row)
+        unrecognized_rows.append(unrecognized_row)
+        amount_rows.append(amount_row)
+
+    return RecognitionSweepResult(
+        end_date=request.end_date,
+        payment_days=payment_days,
+        start_dates=start_dates,
+        recognized_rounds=recognized_rows,
+        unrecognized_rounds=unrecognized_rows,
+        total_recognized_amount=amount_rows,
+    )
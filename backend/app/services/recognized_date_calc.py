@@ -1,8 +1,5 @@
-from datetime import date, timedelta
-from typing import Dict, List
-
-from dateutil.relativedelta import relativedelta
-from fastapi import HTTPException
+from datetime import date
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
 
 from app.schemas import (
     CustomPaymentInput,
@@ -12,266 +9,667 @@ from app.schemas import (
     PaymentStatus,
     RecognitionCalculationResult,
     RecognitionCalculatorRequest,
+    RecognitionCurvePoint,
+    RecognitionCurveRequest,
+    RecognitionCurveResult,
+    RecognitionRecalculationRequest,
     RecognitionRoundRecord,
 )
+from app.services.due_date_calendar import (
+    add_days,
+    add_months,
+    check_day,
+    due_ordinal,
+    month_index,
+)
+from app.services.recognition_errors import RecognitionRequestError
+from app.services.recognition_rules import RecognitionRuleTable, get_rule_table
+
+
+class RoundStep(NamedTuple):
+    """
+    One round as calculated by step_round
+    """
+
+    paid_date: Optional[date]
+    recognized_date: Optional[date]
+    delay_days: int
+    prepaid_days: int
+    total_delay_days: int
+    total_prepaid_days: int
+
+
+def step_round(
+    installment_no: int,
+    due_date: date,
+    paid_date: Optional[date],
+    total_delay_days: int,
+    total_prepaid_days: int,
+    rules: RecognitionRuleTable,
+    clamp_prepayment: bool = False,
+) -> RoundStep:
+    """
+    Schedule kernel shared by payment records and the recognition calculator.
+    Advances the running delay/prepaid totals by one round and moves its due
+    date by their per-round average. A missed round (paid_date None) leaves
+    the totals unchanged and has no recognized date.
+    Prepayments beyond the rule of the paid date are either moved to the
+    start of its prepayment window (clamp_prepayment) or rejected.
+    """
+    if paid_date is None:
+        return RoundStep(None, None, 0, 0, total_delay_days, total_prepaid_days)
+
+    if clamp_prepayment:
+        # 선납 인정은 최대 24회차(=24개월)까지만 허용
+        max_recognized_date = add_months(
+            due_date, -rules.prepayment_window_months_at(due_date)
+        )
+        if paid_date < max_recognized_date:
+            paid_date = max_recognized_date
+
+    delay_days = (paid_date - due_date).days
+    prepaid_days = 0
+    if delay_days > 0:
+        total_delay_days += delay_days
+    elif delay_days < 0:
+        prepaid_days = -delay_days
+        if not clamp_prepayment:
+            rules.check_prepaid_days(prepaid_days, paid_date)
+        total_prepaid_days += prepaid_days
+        delay_days = 0
+
+    adjustment = 0
+    if installment_no > 0:
+        adjustment = (total_delay_days - total_prepaid_days) // installment_no
+    return RoundStep(
+        paid_date,
+        add_days(due_date, adjustment),
+        delay_days,
+        prepaid_days,
+        total_delay_days,
+        total_prepaid_days,
+    )
 
 
 def generate_normal_payments(
     open_date: date, due_day: int, end_date: date
 ) -> List[PaymentRecord]:
     """
-    Generate normal payment records from open_date to end_date with given due_day
-    """
-    results = []
-    i = 1
-    current = date(open_date.year, open_date.month, open_date.day)
-
-    while current <= end_date:
-        results.append(
-            PaymentRecord(
-                installment_no=i,
-                due_date=current,
-                paid_date=current,
-                delay_days=0,
-                total_delay_days=0,
-                prepaid_days=0,
-                total_prepaid_days=0,
-                recognized_date=current,
-                is_recognized=True,
-            )
+    Generate normal payment records from open_date to end_date with given due_day.
+    The due day is clamped to the last day of shorter months.
+    """
+    return list(iter_normal_payments(open_date, due_day, end_date))
+
+
+def iter_normal_payments(
+    open_date: date, due_day: int, end_date: date
+) -> Iterator[PaymentRecord]:
+    """
+    Generator version of generate_normal_payments
+    """
+    rules = get_rule_table()
+    due_dates = iter_due_dates(due_day, open_date, end_date)
+    for installment_no, due_date in enumerate(due_dates, start=1):
+        # Paid on the due date: the kernel leaves every total at zero
+        step = step_round(installment_no, due_date, due_date, 0, 0, rules)
+        assert step.recognized_date is not None
+        yield PaymentRecord(
+            installment_no=installment_no,
+            due_date=due_date,
+            paid_date=due_date,
+            delay_days=step.delay_days,
+            total_delay_days=step.total_delay_days,
+            prepaid_days=step.prepaid_days,
+            total_prepaid_days=step.total_prepaid_days,
+            recognized_date=step.recognized_date,
+            is_recognized=True,
         )
 
-        next_month = current.month + 1
-        next_year = current.year + (next_month - 1) // 12
-        next_month = (next_month - 1) % 12 + 1
-        current = date(next_year, next_month, open_date.day)
-        i += 1
 
-    return results
+def check_normal_payments(open_date: date, due_day: int, end_date: date) -> None:
+    """
+    Raise the request errors of iter_normal_payments before iterating
+    """
+    if month_index(open_date) <= month_index(end_date):
+        check_day(due_day)
 
 
-def recalc_payments(payments: List[PaymentInput]) -> List[PaymentRecord]:
+def recalc_payments(
+    payments: List[PaymentInput], as_of: Optional[date] = None
+) -> List[PaymentRecord]:
     """
-    Recalculate recognized dates based on payment records
+    Recalculate recognized dates based on payment records.
+    Rounds are recognized when their recognized date is on or before as_of
+    (default: today).
     """
-    results = []
+    return list(iter_recalc_payments(payments, as_of))
+
+
+def _iter_recalc_steps(
+    payments: List[PaymentInput], rules: RecognitionRuleTable
+) -> Iterator[Tuple[PaymentInput, RoundStep]]:
     total_delay_days = 0
     total_prepaid_days = 0
-
     for payment in payments:
-        # 선납 인정은 최대 24회차(=24개월)까지만 허용
-        max_recognized_date = payment.due_date.replace(
-            year=payment.due_date.year - (payment.due_date.month + 23) // 12,
-            month=(payment.due_date.month + 23) % 12 + 1
+        step = step_round(
+            payment.installment_no,
+            payment.due_date,
+            payment.paid_date,
+            total_delay_days,
+            total_prepaid_days,
+            rules,
+            clamp_prepayment=True,
         )
-        if payment.paid_date < max_recognized_date:
-            payment.paid_date = max_recognized_date
-
-        delay_days = (payment.paid_date - payment.due_date).days
-        prepaid_days = 0
-
-        if delay_days > 0:
-            total_delay_days += delay_days
-        elif delay_days < 0:
-            prepaid_days = abs(delay_days)
-            total_prepaid_days += prepaid_days
-
-        adjusment = (total_delay_days - total_prepaid_days) // payment.installment_no
-        recognized_date = payment.due_date + timedelta(days=adjusment)
-
-        results.append(
-            PaymentRecord(
-                installment_no=payment.installment_no,
-                due_date=payment.due_date,
-                paid_date=payment.paid_date,
-                delay_days=delay_days if delay_days > 0 else 0,
-                total_delay_days=total_delay_days,
-                prepaid_days=prepaid_days,
-                total_prepaid_days=total_prepaid_days,
-                recognized_date=recognized_date,
-                is_recognized=recognized_date <= date.today(),
-            )
+        total_delay_days = step.total_delay_days
+        total_prepaid_days = step.total_prepaid_days
+        yield payment, step
+
+
+def iter_recalc_payments(
+    payments: List[PaymentInput], as_of: Optional[date] = None
+) -> Iterator[PaymentRecord]:
+    """
+    Generator version of recalc_payments
+    """
+    as_of = as_of or date.today()
+    for payment, step in _iter_recalc_steps(payments, get_rule_table()):
+        # Every input round is paid, so the kernel always returns its dates
+        assert step.paid_date is not None and step.recognized_date is not None
+        payment.paid_date = step.paid_date
+
+        yield PaymentRecord(
+            installment_no=payment.installment_no,
+            due_date=payment.due_date,
+            paid_date=step.paid_date,
+            delay_days=step.delay_days,
+            total_delay_days=step.total_delay_days,
+            prepaid_days=step.prepaid_days,
+            total_prepaid_days=step.total_prepaid_days,
+            recognized_date=step.recognized_date,
+            is_recognized=step.recognized_date <= as_of,
         )
 
-    return results
 
+def check_recalc_payments(payments: List[PaymentInput]) -> None:
+    """
+    Raise the request errors of iter_recalc_payments before iterating.
+    Runs the schedule kernel over the payments without building any records.
+    """
+    for _ in _iter_recalc_steps(payments, get_rule_table()):
+        pass
 
-RECOGNITION_AMOUNT_CHANGE_DATE = date(2024, 11, 1)
 
+MAX_CURVE_DAYS = 366 * 100
 
-def calculate_recognition_details(
-    request: RecognitionCalculatorRequest,
+
+def _resolve_paid_amount(
+    custom_payment: Optional[CustomPaymentInput],
+    payment_amount_option: PaymentAmountOption,
+    standard_payment_amount: Optional[int],
+    paid_date_input: date,
+    rules: RecognitionRuleTable,
+) -> int:
+    paid_amount = 0
+    if custom_payment and custom_payment.paid_amount is not None:
+        paid_amount = custom_payment.paid_amount
+    elif payment_amount_option == PaymentAmountOption.standard:
+        paid_amount = standard_payment_amount or 0
+    elif payment_amount_option == PaymentAmountOption.maximum:
+        paid_amount = rules.max_recognized_amount_at(paid_date_input)
+    return paid_amount
+
+
+class RecognitionRound:
+    """
+    Per-round state shared by every calculation step.
+    Converted to a RecognitionRoundRecord only when the result is assembled.
+    """
+
+    __slots__ = (
+        "installment_no",
+        "due_date",
+        "paid_date",
+        "paid_amount",
+        "recognized_date",
+        "delay_days",
+        "prepaid_days",
+        "total_delay_days",
+        "total_prepaid_days",
+        "status",
+        "is_recognized",
+        "recognized_amount_for_round",
+    )
+
+    def __init__(
+        self,
+        installment_no: int,
+        due_date: date,
+        paid_date_input: date,
+        paid_amount: int,
+    ):
+        self.installment_no = installment_no
+        self.due_date = due_date
+        self.paid_date = paid_date_input if paid_amount > 0 else None
+        self.paid_amount = paid_amount
+        self.recognized_date: Optional[date] = None  # Will be calculated in Step C
+        self.delay_days = 0
+        self.prepaid_days = 0
+        self.total_delay_days = 0
+        self.total_prepaid_days = 0
+        self.status = PaymentStatus.normal  # Will be calculated in Step D
+        self.is_recognized = False
+        self.recognized_amount_for_round = 0
+
+    def to_record(self) -> RecognitionRoundRecord:
+        # Values are produced by the calculator itself, so validation is skipped
+        return RecognitionRoundRecord.model_construct(
+            installment_no=self.installment_no,
+            due_date=self.due_date,
+            paid_date=self.paid_date,
+            recognized_date=self.recognized_date,
+            delay_days=self.delay_days,
+            total_delay_days=self.total_delay_days,
+            prepaid_days=self.prepaid_days,
+            total_prepaid_days=self.total_prepaid_days,
+            status=self.status,
+            is_recognized=self.is_recognized,
+            paid_amount=self.paid_amount,
+            recognized_amount_for_round=self.recognized_amount_for_round,
+        )
+
+
+def _apply_recognized_dates(
+    rounds: List[RecognitionRound],
+    rules: RecognitionRuleTable,
+    total_delay_days: int = 0,
+    total_prepaid_days: int = 0,
+) -> None:
+    """
+    Fill recognized dates and running totals in place, continuing from the
+    totals carried over from the rounds before the given ones
+    """
+    for payment in rounds:
+        (
+            _,
+            payment.recognized_date,
+            payment.delay_days,
+            payment.prepaid_days,
+            total_delay_days,
+            total_prepaid_days,
+        ) = step_round(
+            payment.installment_no,
+            payment.due_date,
+            payment.paid_date if payment.paid_amount > 0 else None,
+            total_delay_days,
+            total_prepaid_days,
+            rules,
+        )
+        payment.total_delay_days = total_delay_days
+        payment.total_prepaid_days = total_prepaid_days
+
+
+def _recognized_amount(
+    round_state: RecognitionRound, rules: RecognitionRuleTable
+) -> int:
+    # Recognized amount is the minimum of paid_amount and the max allowed for that date
+    paid_date_for_amount = round_state.paid_date or round_state.due_date
+    max_allowed_amount = rules.max_recognized_amount_at(paid_date_for_amount)
+    return min(round_state.paid_amount, max_allowed_amount)
+
+
+def _apply_recognition(
+    rounds: List[RecognitionRound], as_of: date, rules: RecognitionRuleTable
+) -> None:
+    """
+    Fill recognition status and recognized amounts in place
+    """
+    for round_state in rounds:
+        recognized_date_value = round_state.recognized_date
+        round_state.is_recognized = (
+            recognized_date_value is not None and recognized_date_value <= as_of
+        )
+        round_state.recognized_amount_for_round = (
+            _recognized_amount(round_state, rules) if round_state.is_recognized else 0
+        )
+
+        status = PaymentStatus.normal
+        if round_state.paid_amount == 0:
+            status = PaymentStatus.missed
+        elif round_state.delay_days > 0:
+            status = PaymentStatus.delay
+        elif round_state.prepaid_days > 0:
+            status = PaymentStatus.prepaid
+        round_state.status = status
+
+
+def summarize_rounds(rounds: List[RecognitionRound]) -> Tuple[int, int, int]:
+    """
+    (recognized rounds, unrecognized rounds, total recognized amount)
+    """
+    final_recognized_rounds = 0
+    final_unrecognized_rounds = 0
+    final_total_recognized_amount = 0
+
+    for round_state in rounds:
+        if round_state.is_recognized:
+            final_recognized_rounds += 1
+            final_total_recognized_amount += round_state.recognized_amount_for_round
+        else:
+            final_unrecognized_rounds += 1
+
+    return (
+        final_recognized_rounds,
+        final_unrecognized_rounds,
+        final_total_recognized_amount,
+    )
+
+
+def _build_result(
+    payment_day: int,
+    start_date: date,
+    end_date: date,
+    rounds: List[RecognitionRound],
 ) -> RecognitionCalculationResult:
-    all_rounds_data: List[Dict] = []
-    installment_no_counter = 1
-    current_month_start = request.start_date.replace(day=1)
-    end_month_start = request.end_date.replace(day=1)
+    (
+        final_recognized_rounds,
+        final_unrecognized_rounds,
+        final_total_recognized_amount,
+    ) = summarize_rounds(rounds)
 
+    return RecognitionCalculationResult(
+        payment_day=payment_day,
+        start_date=start_date,
+        end_date=end_date,
+        recognized_rounds=final_recognized_rounds,
+        unrecognized_rounds=final_unrecognized_rounds,
+        total_recognized_amount=final_total_recognized_amount,
+        details=[round_state.to_record() for round_state in rounds],
+    )
+
+
+def iter_due_dates(
+    payment_day: int, start_date: date, end_date: date
+) -> Iterator[date]:
+    """
+    Monthly due dates from the month of start_date up to end_date (Step A).
+    payment_day is clamped to the last day of shorter months.
+    """
+    current_month_index = month_index(start_date)
+    end_month_index = month_index(end_date)
+    while current_month_index <= end_month_index:
+        due_date = date.fromordinal(due_ordinal(current_month_index, payment_day))
+        # Ensure due_date is not past the end_date if end_date is mid-month
+        if due_date > end_date:
+            break
+        yield due_date
+        current_month_index += 1
+
+
+def _iter_base_rounds(
+    request: RecognitionCalculatorRequest, rules: RecognitionRuleTable
+) -> Iterator[RecognitionRound]:
     # Step A: Generate Base Schedule & Step B: Apply Custom Payments (initial setup)
     custom_payments_map: Dict[int, CustomPaymentInput] = {}
     if request.payments:
         for cp in request.payments:
             custom_payments_map[cp.installment_no] = cp
 
-    while current_month_start <= end_month_start:
-        due_date = date(
-            current_month_start.year, current_month_start.month, request.payment_day
-        )
-        # Ensure due_date is not past the end_date if end_date is mid-month
-        if due_date > request.end_date:
-            break
-
-        custom_payment_for_round = custom_payments_map.get(installment_no_counter)
+    due_dates = iter_due_dates(
+        request.payment_day, request.start_date, request.end_date
+    )
+    for installment_no, due_date in enumerate(due_dates, start=1):
+        custom_payment_for_round = custom_payments_map.get(installment_no)
         paid_date_input = (
             custom_payment_for_round.paid_date if custom_payment_for_round else due_date
         )
 
         # Determine paid_amount for this round
-        paid_amount = 0
-        if custom_payment_for_round and custom_payment_for_round.paid_amount is not None:
-            paid_amount = custom_payment_for_round.paid_amount
-        elif request.payment_amount_option == PaymentAmountOption.standard:
-            paid_amount = request.standard_payment_amount or 0
-        elif request.payment_amount_option == PaymentAmountOption.maximum:
-            if paid_date_input < RECOGNITION_AMOUNT_CHANGE_DATE:
-                paid_amount = 100000
-            else:
-                paid_amount = 250000
-
-        has_payment = paid_amount > 0
-        paid_date = paid_date_input if has_payment else None
-
-        all_rounds_data.append(
-            {
-                "installment_no": installment_no_counter,
-                "due_date": due_date,
-                "paid_date": paid_date,
-                "paid_amount": paid_amount,
-                "recognized_date": None,  # Will be calculated in next step
-                "delay_days": 0,
-                "prepaid_days": 0,
-                "total_delay_days": 0,
-                "total_prepaid_days": 0,
-            }
+        paid_amount = _resolve_paid_amount(
+            custom_payment_for_round,
+            request.payment_amount_option,
+            request.standard_payment_amount,
+            paid_date_input,
+            rules,
         )
-        installment_no_counter += 1
-        current_month_start += relativedelta(months=1)
+
+        yield RecognitionRound(installment_no, due_date, paid_date_input, paid_amount)
+
+
+def _build_rounds(
+    request: RecognitionCalculatorRequest, rules: RecognitionRuleTable
+) -> List[RecognitionRound]:
+    all_rounds = list(_iter_base_rounds(request, rules))
 
     # Step C: Calculate Recognized Dates (adapted from recalc_payments logic)
-    total_delay_days = 0
-    total_prepaid_days = 0
+    _apply_recognized_dates(all_rounds, rules)
+    return all_rounds
 
-    for i, round_data in enumerate(all_rounds_data):
-        payment = round_data  # Using round_data as payment for clarity
-
-        # 선납 인정은 최대 24회차(=24개월)까지만 허용 (original logic from recalc_payments)
-        # This logic needs to be adapted to the new structure.
-        # For simplicity in this simulation, we'll assume paid_date is the actual paid date
-        # and not adjust it based on max_recognized_date from the original recalc_payments
-        # as the user's request is about *actual* paid dates.
-        # If the user wants this specific "max 24 months prepayment" rule applied to their
-        # custom paid_dates, it would need further clarification.
-        # For now, we'll calculate delay/prepaid based on provided paid_date vs due_date.
-
-        has_payment = payment["paid_amount"] > 0
-        paid_date_for_calc = (
-            payment["paid_date"] if has_payment and payment["paid_date"] else payment["due_date"]
-        )
 
-        delay_days_current = (
-            (paid_date_for_calc - payment["due_date"]).days if has_payment else 0
+def _check_prepaid_limit(
+    request: RecognitionCalculatorRequest, rules: RecognitionRuleTable
+) -> None:
+    """
+    Raise the Step C prepayment error up front. Only custom payments can be
+    paid before their due date, so the schedule itself is not generated.
+    """
+    if not request.payments:
+        return
+    first_month_index = month_index(request.start_date)
+    end_month_index = month_index(request.end_date)
+    end_ordinal = request.end_date.toordinal()
+    # Later entries for the same installment win, as in Step B
+    custom_payments_map = {cp.installment_no: cp for cp in request.payments}
+    # The first round over its limit is reported, as in Step C
+    for installment_no in sorted(custom_payments_map):
+        cp = custom_payments_map[installment_no]
+        round_month_index = first_month_index + cp.installment_no - 1
+        if cp.installment_no < 1 or round_month_index > end_month_index:
+            continue
+        due_date_ordinal = due_ordinal(round_month_index, request.payment_day)
+        if due_date_ordinal > end_ordinal:
+            continue
+        paid_amount = _resolve_paid_amount(
+            cp,
+            request.payment_amount_option,
+            request.standard_payment_amount,
+            cp.paid_date,
+            rules,
         )
-        prepaid_days_current = 0
-
-        if delay_days_current > 0:
-            total_delay_days += delay_days_current
-        elif delay_days_current < 0:
-            prepaid_days_current = abs(delay_days_current)
-            if prepaid_days_current > 721:
-                raise HTTPException(status_code=400, detail="회차별 선납일수는 최대 2년(721일)을 초과할 수 없습니다.")
-            total_prepaid_days += prepaid_days_current
-
-        # This adjustment logic is from the original recalc_payments
-        # It seems to apply a cumulative adjustment based on total delay/prepaid days
-        # divided by the current installment number.
-        # This might need careful review if the user's intent for "recognized_date"
-        # is different from the original system's definition.
-        # For now, I'll keep it as it was in recalc_payments.
-        adjusment = (total_delay_days - total_prepaid_days)
-        if payment["installment_no"] > 0:  # Avoid division by zero
-            adjusment //= payment["installment_no"]
-        else:
-            adjusment = 0  # Or handle as an error if installment_no can be 0
+        if paid_amount > 0:
+            rules.check_prepaid_days(
+                due_date_ordinal - cp.paid_date.toordinal(), cp.paid_date
+            )
+
+
+def iter_recognition_rounds(
+    request: RecognitionCalculatorRequest,
+) -> Iterator[RecognitionRound]:
+    """
+    Rounds of calculate_recognition_details, fully calculated one at a time.
+    Request errors are raised by this call rather than while iterating, so
+    callers can report them before producing any output.
+    """
+    # Invalid payment days fail here like they do in the full calculation
+    if month_index(request.start_date) <= month_index(request.end_date):
+        due_ordinal(month_index(request.start_date), request.payment_day)
+    rules = get_rule_table()
+    _check_prepaid_limit(request, rules)
+    return _iter_recognition_rounds(request, request.as_of or date.today(), rules)
 
-        recognized_date = (
-            payment["due_date"] + timedelta(days=adjusment) if has_payment else None
+
+def _iter_recognition_rounds(
+    request: RecognitionCalculatorRequest, as_of: date, rules: RecognitionRuleTable
+) -> Iterator[RecognitionRound]:
+    total_delay_days = 0
+    total_prepaid_days = 0
+    for round_state in _iter_base_rounds(request, rules):
+        _apply_recognized_dates(
+            [round_state], rules, total_delay_days, total_prepaid_days
         )
+        _apply_recognition([round_state], as_of, rules)
+        total_delay_days = round_state.total_delay_days
+        total_prepaid_days = round_state.total_prepaid_days
+        yield round_state
 
-        round_data["recognized_date"] = recognized_date
-        round_data["delay_days"] = delay_days_current if delay_days_current > 0 else 0
-        round_data["prepaid_days"] = prepaid_days_current
-        round_data["total_delay_days"] = total_delay_days
-        round_data["total_prepaid_days"] = total_prepaid_days
 
+def calculate_recognition_rounds(
+    request: RecognitionCalculatorRequest,
+) -> List[RecognitionRound]:
+    """
+    Steps A to D of calculate_recognition_details, without assembling records
+    """
+    rules = get_rule_table()
+    all_rounds = _build_rounds(request, rules)
+    _apply_recognition(all_rounds, request.as_of or date.today(), rules)
+    return all_rounds
 
-    # Step D: Aggregate Final Results & Step E: Assemble and Return
-    final_recognized_rounds = 0
-    final_unrecognized_rounds = 0
-    final_total_recognized_amount = 0
-    detailed_records: List[RecognitionRoundRecord] = []
 
-    for round_data in all_rounds_data:
-        recognized_date_value = round_data["recognized_date"]
-        is_recognized = (
-            recognized_date_value is not None and recognized_date_value <= date.today()
-        )
+def calculate_recognition_details(
+    request: RecognitionCalculatorRequest,
+) -> RecognitionCalculationResult:
+    # Step D: Aggregate Final Results & Step E: Assemble and Return
+    all_rounds = calculate_recognition_rounds(request)
+    return _build_result(
+        request.payment_day, request.start_date, request.end_date, all_rounds
+    )
 
-        recognized_amount_for_round = 0
-        if is_recognized:
-            # Recognized amount is the minimum of paid_amount and the max allowed for that date
-            max_allowed_amount = 0
-            paid_date_for_amount = round_data["paid_date"] or round_data["due_date"]
-            if paid_date_for_amount < RECOGNITION_AMOUNT_CHANGE_DATE:
-                max_allowed_amount = 100000
-            else:
-                max_allowed_amount = 250000
-            recognized_amount_for_round = min(round_data["paid_amount"], max_allowed_amount)
-            final_recognized_rounds += 1
-            final_total_recognized_amount += recognized_amount_for_round
-        else:
-            final_unrecognized_rounds += 1
 
-        status = PaymentStatus.normal
-        if round_data["paid_amount"] == 0:
-            status = PaymentStatus.missed
-        elif round_data["delay_days"] > 0:
-            status = PaymentStatus.delay
-        elif round_data["prepaid_days"] > 0:
-            status = PaymentStatus.prepaid
+def calculate_recognition_curve(
+    request: RecognitionCurveRequest,
+) -> RecognitionCurveResult:
+    """
+    Recognized round count and amount for every date from curve_start to curve_end.
+    Rounds are calculated once; their recognized dates are sorted and swept
+    with running totals instead of recalculating per date.
+    """
+    if request.curve_end < request.curve_start:
+        raise RecognitionRequestError("조회 종료일은 시작일 이후여야 합니다.")
+    if (request.curve_end - request.curve_start).days >= MAX_CURVE_DAYS:
+        raise RecognitionRequestError(f"조회 기간은 최대 {MAX_CURVE_DAYS}일입니다.")
+
+    rules = get_rule_table()
+    recognitions = sorted(
+        (round_state.recognized_date, _recognized_amount(round_state, rules))
+        for round_state in _build_rounds(request, rules)
+        if round_state.recognized_date is not None
+    )
 
-        detailed_records.append(
-            RecognitionRoundRecord(
-                installment_no=round_data["installment_no"],
-                due_date=round_data["due_date"],
-                paid_date=round_data["paid_date"],
-                recognized_date=round_data["recognized_date"],
-                delay_days=round_data["delay_days"],
-                total_delay_days=round_data["total_delay_days"],
-                prepaid_days=round_data["prepaid_days"],
-                total_prepaid_days=round_data["total_prepaid_days"],
-                status=status,
-                is_recognized=is_recognized,
-                paid_amount=round_data["paid_amount"],
-                recognized_amount_for_round=recognized_amount_for_round,
+    points: List[RecognitionCurvePoint] = []
+    next_index = 0
+    recognized_rounds = 0
+    total_recognized_amount = 0
+    for ordinal in range(
+        request.curve_start.toordinal(), request.curve_end.toordinal() + 1
+    ):
+        current = date.fromordinal(ordinal)
+        while (
+            next_index < len(recognitions) and recognitions[next_index][0] <= current
+        ):
+            recognized_rounds += 1
+            total_recognized_amount += recognitions[next_index][1]
+            next_index += 1
+        points.append(
+            RecognitionCurvePoint(
+                as_of=current,
+                recognized_rounds=recognized_rounds,
+                total_recognized_amount=total_recognized_amount,
             )
         )
 
-    return RecognitionCalculationResult(
+    return RecognitionCurveResult(
         payment_day=request.payment_day,
         start_date=request.start_date,
         end_date=request.end_date,
-        recognized_rounds=final_recognized_rounds,
-        unrecognized_rounds=final_unrecognized_rounds,
-        total_recognized_amount=final_total_recognized_amount,
-        details=detailed_records,
+        points=points,
+    )
+
+
+def recalculate_recognition_details(
+    request: RecognitionRecalculationRequest,
+) -> RecognitionCalculationResult:
+    """
+    Recalculate a previous result after some installments were edited.
+    Rounds before the first edited installment are reused together with their
+    running delay/prepaid totals, and only the rounds from there on are
+    recomputed. The amount option must be the one the previous result was
+    calculated with. Recognition is decided again for every round with as_of.
+    """
+    previous = request.previous
+    round_count = len(previous.details)
+    rules = get_rule_table()
+
+    changed_payments_map: Dict[int, CustomPaymentInput] = {}
+    for cp in request.payments:
+        if 1 <= cp.installment_no <= round_count:
+            changed_payments_map[cp.installment_no] = cp
+
+    first_changed_no = min(changed_payments_map, default=round_count + 1)
+    kept_records = previous.details[: first_changed_no - 1]
+    previous_suffix_records = previous.details[first_changed_no - 1 :]
+    if (
+        previous_suffix_records
+        and previous_suffix_records[0].installment_no != first_changed_no
+    ):
+        raise RecognitionRequestError("이전 계산 결과의 회차 정보가 올바르지 않습니다.")
+
+    total_delay_days = 0
+    total_prepaid_days = 0
+    if kept_records:
+        total_delay_days = kept_records[-1].total_delay_days
+        total_prepaid_days = kept_records[-1].total_prepaid_days
+
+    # Kept rounds keep their Step C values; only their recognition is redone
+    kept_rounds = [_round_from_record(record) for record in kept_records]
+
+    suffix_rounds: List[RecognitionRound] = []
+    for record in previous_suffix_records:
+        changed_payment = changed_payments_map.get(record.installment_no)
+        if changed_payment:
+            paid_date_input = changed_payment.paid_date
+            paid_amount = _resolve_paid_amount(
+                changed_payment,
+                request.payment_amount_option,
+                request.standard_payment_amount,
+                paid_date_input,
+                rules,
+            )
+        else:
+            paid_date_input = record.paid_date or record.due_date
+            paid_amount = record.paid_amount
+        suffix_rounds.append(
+            RecognitionRound(
+                record.installment_no, record.due_date, paid_date_input, paid_amount
+            )
+        )
+
+    _apply_recognized_dates(
+        suffix_rounds, rules, total_delay_days, total_prepaid_days
+    )
+    rounds = kept_rounds + suffix_rounds
+    _apply_recognition(rounds, request.as_of or date.today(), rules)
+    return _build_result(
+        previous.payment_day, previous.start_date, previous.end_date, rounds
+    )
+
+
+def _round_from_record(record: RecognitionRoundRecord) -> RecognitionRound:
+    round_state = RecognitionRound(
+        record.installment_no,
+        record.due_date,
+        record.paid_date or record.due_date,
+        record.paid_amount,
     )
+    round_state.recognized_date = record.recognized_date
+    round_state.delay_days = record.delay_days
+    round_state.prepaid_days = record.prepaid_days
+    round_state.total_delay_days = record.total_delay_days
+    round_state.total_prepaid_days = record.total_prepaid_days
+    return round_state
+
+
+if __name__ == "__main__":
+    import sys
+
+    from app.services.recognition_cli import main
+
+    sys.exit(main())
@@ -0,0 +1,208 @@
+from datetime import date
+from typing import Dict, List
+
+import numpy as np
+
+from app.schemas import (
+    CustomPaymentInput,
+    PaymentAmountOption,
+    PaymentStatus,
+    RecognitionCalculationResult,
+    RecognitionCalculatorRequest,
+    RecognitionRoundRecord,
+)
+from app.services.due_date_calendar import (
+    DATE_OUT_OF_RANGE_DETAIL,
+    DUE_ORDINAL_TABLE,
+    check_day,
+    due_ordinal,
+    in_table,
+    month_index,
+    table_offset,
+)
+from app.services.recognition_errors import RecognitionRequestError
+from app.services.recognition_rules import get_rule_table, prepaid_limit_detail
+
+# Dates are handled as int32 day ordinals counted from 1970-01-01
+# (the numpy datetime64[D] epoch).
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+_MAX_DAY = date.max.toordinal() - _EPOCH_ORDINAL
+
+_DUE_DAY_TABLE = np.frombuffer(DUE_ORDINAL_TABLE, dtype=np.int32) - _EPOCH_ORDINAL
+
+_STATUS_BY_CODE = [
+    PaymentStatus.normal,
+    PaymentStatus.delay,
+    PaymentStatus.prepaid,
+    PaymentStatus.missed,
+]
+
+
+def _to_day(value: date) -> int:
+    return value.toordinal() - _EPOCH_ORDINAL
+
+
+def _to_date(day: int) -> date:
+    return date.fromordinal(day + _EPOCH_ORDINAL)
+
+
+def _build_due_days(request: RecognitionCalculatorRequest) -> np.ndarray:
+    """
+    Build the due date of every round as int32 day ordinals
+    """
+    start_month_index = month_index(request.start_date)
+    end_month_index = month_index(request.end_date)
+    if end_month_index < start_month_index:
+        return np.empty(0, dtype=np.int32)
+
+    check_day(request.payment_day)
+    if in_table(start_month_index) and in_table(end_month_index):
+        # Consecutive months sit 31 entries apart in the calendar table
+        first = table_offset(start_month_index, request.payment_day)
+        last = table_offset(end_month_index, request.payment_day)
+        due_days = _DUE_DAY_TABLE[first : last + 1 : 31]
+    else:
+        due_days = np.array(
+            [
+                due_ordinal(index, request.payment_day) - _EPOCH_ORDINAL
+                for index in range(start_month_index, end_month_index + 1)
+            ],
+            dtype=np.int32,
+        )
+    # Only the last month can end up past a mid-month end_date
+    return due_days[due_days <= _to_day(request.end_date)]
+
+
+def calculate_recognition_details_vectorized(
+    request: RecognitionCalculatorRequest,
+) -> RecognitionCalculationResult:
+    """
+    Array based engine returning the same result as calculate_recognition_details
+    """
+    rules = get_rule_table()
+    as_of_day = _to_day(request.as_of or date.today())
+
+    # Step A: Generate Base Schedule
+    due_days = _build_due_days(request)
+    round_count = due_days.size
+    installment_nos = np.arange(1, round_count + 1, dtype=np.int64)
+
+    # Step B: Apply Custom Payments
+    custom_payments_map: Dict[int, CustomPaymentInput] = {}
+    if request.payments:
+        for cp in request.payments:
+            custom_payments_map[cp.installment_no] = cp
+
+    paid_input_days = due_days.copy()
+    custom_amounts = np.zeros(round_count, dtype=np.int64)
+    has_custom_amount = np.zeros(round_count, dtype=bool)
+    for installment_no, cp in custom_payments_map.items():
+        if 1 <= installment_no <= round_count:
+            index = installment_no - 1
+            paid_input_days[index] = _to_day(cp.paid_date)
+            if cp.paid_amount is not None:
+                custom_amounts[index] = cp.paid_amount
+                has_custom_amount[index] = True
+
+    # Rule in effect on each paid date
+    rule_indexes = rules.indexes_at(paid_input_days + _EPOCH_ORDINAL)
+    max_allowed_amounts = rules.max_recognized_amount_array[rule_indexes]
+
+    if request.payment_amount_option == PaymentAmountOption.standard:
+        default_amounts = np.full(
+            round_count, request.standard_payment_amount or 0, dtype=np.int64
+        )
+    elif request.payment_amount_option == PaymentAmountOption.maximum:
+        default_amounts = max_allowed_amounts
+    else:
+        default_amounts = np.zeros(round_count, dtype=np.int64)
+    paid_amounts = np.where(has_custom_amount, custom_amounts, default_amounts)
+    has_payment = paid_amounts > 0
+
+    # Step C: Calculate Recognized Dates
+    delays = np.where(has_payment, paid_input_days - due_days, 0).astype(np.int64)
+    delay_days = np.maximum(delays, 0)
+    prepaid_days = np.maximum(-delays, 0)
+    max_prepaid_days = rules.max_prepaid_days_array[rule_indexes]
+    over_limit = np.flatnonzero(prepaid_days > max_prepaid_days)
+    if over_limit.size:
+        raise RecognitionRequestError(
+            prepaid_limit_detail(int(max_prepaid_days[over_limit[0]]))
+        )
+
+    total_delay_days = np.cumsum(delay_days)
+    total_prepaid_days = np.cumsum(prepaid_days)
+    adjustments = (total_delay_days - total_prepaid_days) // installment_nos
+    recognized_days = due_days + adjustments
+    if np.any(has_payment & (recognized_days > _MAX_DAY)):
+        raise RecognitionRequestError(DATE_OUT_OF_RANGE_DETAIL)
+
+    # Step D: Aggregate Final Results
+    is_recognized = has_payment & (recognized_days <= as_of_day)
+    recognized_amounts = np.where(
+        is_recognized, np.minimum(paid_amounts, max_allowed_amounts), 0
+    )
+    status_codes = np.select(
+        [paid_amounts == 0, delay_days > 0, prepaid_days > 0], [3, 1, 2], default=0
+    )
+
+    final_recognized_rounds = int(np.count_nonzero(is_recognized))
+
+    # Step E: Assemble and Return (values are trusted, validation is skipped)
+    detailed_records: List[RecognitionRoundRecord] = []
+    for (
+        installment_no,
+        due_day,
+        paid_day,
+        recognized_day,
+        has_paid,
+        delay,
+        total_delay,
+        prepaid,
+        total_prepaid,
+        status_code,
+        recognized,
+        paid_amount,
+        recognized_amount,
+    ) in zip(
+        installment_nos.tolist(),
+        due_days.tolist(),
+        paid_input_days.tolist(),
+        recognized_days.tolist(),
+        has_payment.tolist(),
+        delay_days.tolist(),
+        total_delay_days.tolist(),
+        prepaid_days.tolist(),
+        total_prepaid_days.tolist(),
+        status_codes.tolist(),
+        is_recognized.tolist(),
+        paid_amounts.tolist(),
+        recognized_amounts.tolist(),
+    ):
+        detailed_records.append(
+            RecognitionRoundRecord.model_construct(
+                installment_no=installment_no,
+                due_date=_to_date(due_day),
+                paid_date=_to_date(paid_day) if has_paid else None,
+                recognized_date=_to_date(recognized_day) if has_paid else None,
+                delay_days=delay,
+                total_delay_days=total_delay,
+                prepaid_days=prepaid,
+                total_prepaid_days=total_prepaid,
+                status=_STATUS_BY_CODE[status_code],
+                is_recognized=recognized,
+                paid_amount=paid_amount,
+                recognized_amount_for_round=recognized_amount,
+            )
+        )
+
+    return RecognitionCalculationResult(
+        payment_day=request.payment_day,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        recognized_rounds=final_recognized_rounds,
+        unrecognized_rounds=round_count - final_recognized_rounds,
+        total_recognized_amount=int(recognized_amounts.sum()),
+        details=detailed_records,
+    )
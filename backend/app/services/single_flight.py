@@ -0,0 +1,98 @@
+import threading
+from typing import Callable, Dict, Optional
+
+from app.schemas import SingleFlightStats
+
+
+class _Call:
+    __slots__ = ("done", "value", "error", "callers")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        # Set before done is set whenever error is None
+        self.value = b""
+        self.error: Optional[BaseException] = None
+        self.callers = 1
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller computes
+    and every caller that arrives while it runs waits for and shares its bytes
+    (or its error). Nothing is kept once the computation finishes.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self._computations = 0
+        self._callers = 0
+        self._max_callers = 0
+        # Number of computations by how many callers they served
+        self._callers_histogram: Dict[int, int] = {}
+
+    def do(self, key: str, compute: Callable[[], bytes]) -> bytes:
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                call.callers += 1
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = compute()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                self._record(call.callers)
+            call.done.set()
+        return call.value
+
+    def callers(self, key: str) -> int:
+        """
+        Callers of the computation in flight for key (0 when there is none)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            return 0 if call is None else call.callers
+
+    def _record(self, callers: int) -> None:
+        self._computations += 1
+        self._callers += callers
+        self._max_callers = max(self._max_callers, callers)
+        self._callers_histogram[callers] = self._callers_histogram.get(callers, 0) + 1
+
+    def stats(self) -> SingleFlightStats:
+        with self._lock:
+            return SingleFlightStats(
+                in_flight=len(self._calls),
+                computations=self._computations,
+                callers=self._callers,
+                max_callers_per_computation=self._max_callers,
+                computations_by_callers=dict(self._callers_histogram),
+            )
+
+
+_single_flight: Optional[SingleFlight] = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """
+    Return the single-flight group shared by calculator requests
+    """
+    global _single_flight
+    with _single_flight_lock:
+        if _single_flight is None:
+            _single_flight = SingleFlight()
+        return _single_flight
@@ -1,12 +1,20 @@
+from datetime import date
+
+import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session, select
 
 from app import crud
 from app.core.config import settings
-from app.models import HousingSubscriptionDetail
-from app.schemas import RecognitionCalculationResult
+from app.models import HousingSubscriptionDetail, SubscriptionRound
+from app.schemas import (
+    CustomPaymentInput,
+    PaymentAmountOption,
+    RecognitionCalculatorRequest,
+)
+from app.services.recognized_date_calc import calculate_recognition_details
 from app.tests.utils.user import authentication_token_from_email
-from app.tests.utils.utils import random_email
+from app.tests.utils.utils import get_superuser_token_headers, random_email
 
 
 def test_save_housing_subscription_detail_unauthorized(client: TestClient) -> None:
@@ -94,6 +102,9 @@ def test_update_housing_subscription_detail(client: TestClient, db: Session) ->
         session=db, user_id=user.id
     )
     assert db_detail1
+    first_id = db_detail1.id
+    first_created_at = db_detail1.created_at
+    first_updated_at = db_detail1.updated_at
 
     # 2. Save the second detail, which should replace the first one
     payload2 = {
@@ -114,12 +125,15 @@ def test_update_housing_subscription_detail(client: TestClient, db: Session) ->
     data2 = response2.json()
     assert data2["calculation_result"]["recognized_rounds"] == 36
 
-    db.refresh(user)
+    db.expire_all()
     db_detail2 = crud.get_housing_subscription_detail_by_user_id(
         session=db, user_id=user.id
     )
     assert db_detail2
-    assert db_detail1.id != db_detail2.id  # Should be a new record
+    # Replaced in place: same record, original created_at, newer updated_at
+    assert db_detail2.id == first_id
+    assert db_detail2.created_at == first_created_at
+    assert db_detail2.updated_at > first_updated_at
     assert db_detail2.calculation_result["recognized_rounds"] == 36
 
     # 3. Ensure there is only one detail record for the user
@@ -189,3 +203,270 @@ def test_get_housing_subscription_detail_exist(client: TestClient, db: Session)
     assert data["user_id"] == str(user.id)
     assert data["calculation_result"]["recognized_rounds"] == 24
     assert data["calculation_result"]["total_recognized_amount"] == 2400000
+
+
+def test_read_housing_subscription_detail_stats(
+    client: TestClient, db: Session
+) -> None:
+    """
+    Test the database-side aggregates over saved details.
+    """
+    # Logged in here: the module-scoped fixture would log in before db
+    # recreates the superuser
+    superuser_token_headers = get_superuser_token_headers(client)
+    for recognized_rounds, start_date in ((10, "2020-01-01"), (30, "2022-06-01")):
+        email = random_email()
+        headers = authentication_token_from_email(client=client, email=email, db=db)
+        payload = {
+            "payment_day": 10,
+            "start_date": start_date,
+            "end_date": "2025-12-31",
+            "recognized_rounds": recognized_rounds,
+            "unrecognized_rounds": 0,
+            "total_recognized_amount": recognized_rounds * 100000,
+            "details": [],
+        }
+        response = client.post(
+            f"{settings.API_V1_STR}/me/housing-subscription-detail",
+            headers=headers,
+            json=payload,
+        )
+        assert response.status_code == 200
+
+    response = client.get(
+        f"{settings.API_V1_STR}/housing-subscription-details/stats",
+        headers=superuser_token_headers,
+        params={"start_date_from": "2019-01-01", "bucket_size": 12},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["detail_count"] == 2
+    assert data["min_recognized_rounds"] == 10
+    assert data["max_recognized_rounds"] == 30
+    assert data["sum_total_recognized_amount"] == 4000000
+    assert data["recognized_rounds_distribution"] == [
+        {"recognized_rounds_from": 0, "detail_count": 1},
+        {"recognized_rounds_from": 24, "detail_count": 1},
+    ]
+
+    filtered = client.get(
+        f"{settings.API_V1_STR}/housing-subscription-details/stats",
+        headers=superuser_token_headers,
+        params={"start_date_from": "2021-01-01"},
+    )
+    assert filtered.json()["detail_count"] == 1
+
+
+def test_save_housing_subscription_detail_stores_rounds(
+    client: TestClient, db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Test that saved rounds are stored in subscription_round and can be queried by date.
+    """
+    monkeypatch.setattr(settings, "STORE_SUBSCRIPTION_ROUNDS", True)
+    email = random_email()
+    headers = authentication_token_from_email(client=client, email=email, db=db)
+    user = crud.get_user_by_email(session=db, email=email)
+    assert user
+
+    request = RecognitionCalculatorRequest(
+        payment_day=10,
+        start_date=date(2024, 6, 1),
+        end_date=date(2026, 1, 31),
+        payment_amount_option=PaymentAmountOption.maximum,
+        payments=[CustomPaymentInput(installment_no=8, paid_date=date(2025, 3, 1))],
+        as_of=date(2025, 6, 1),
+    )
+    result = calculate_recognition_details(request)
+    # Saving twice replaces the rounds instead of duplicating them
+    for _ in range(2):
+        response = client.post(
+            f"{settings.API_V1_STR}/me/housing-subscription-detail",
+            headers=headers,
+            json=result.model_dump(mode="json"),
+        )
+        assert response.status_code == 200
+    detail_id = response.json()["id"]
+
+    rounds = db.exec(
+        select(SubscriptionRound).where(SubscriptionRound.detail_id == detail_id)
+    ).all()
+    assert len(rounds) == len(result.details)
+
+    delayed_user_ids = crud.get_user_ids_with_delayed_round(
+        session=db, due_date_from=date(2025, 1, 1), due_date_to=date(2025, 12, 31)
+    )
+    assert delayed_user_ids == [user.id]
+
+    recognized = crud.get_rounds_recognized_between(
+        session=db,
+        recognized_from=date(2025, 1, 5),
+        recognized_to=date(2025, 2, 12),
+    )
+    assert [r.installment_no for r in recognized] == [8]
+    assert recognized[0].recognized_date == result.details[7].recognized_date
+
+    # Saving the request instead keeps its rounds queryable
+    response = client.post(
+        f"{settings.API_V1_STR}/me/housing-subscription-detail/request",
+        headers=headers,
+        json=request.model_dump(mode="json"),
+    )
+    assert response.status_code == 200
+    rounds = db.exec(
+        select(SubscriptionRound).where(SubscriptionRound.detail_id == detail_id)
+    ).all()
+    assert len(rounds) == len(result.details)
+    assert crud.get_user_ids_with_delayed_round(
+        session=db, due_date_from=date(2025, 1, 1), due_date_to=date(2025, 12, 31)
+    ) == [user.id]
+
+
+def test_save_housing_subscription_detail_request(
+    client: TestClient, db: Session
+) -> None:
+    """
+    Test that a detail saved as a request stores only the request and totals,
+    and is calculated as of today on read.
+    """
+    email = random_email()
+    headers = authentication_token_from_email(client=client, email=email, db=db)
+    user = crud.get_user_by_email(session=db, email=email)
+    assert user
+
+    request = RecognitionCalculatorRequest(
+        payment_day=10,
+        start_date=date(2024, 6, 1),
+        end_date=date(2026, 1, 31),
+        payment_amount_option=PaymentAmountOption.maximum,
+        payments=[CustomPaymentInput(installment_no=8, paid_date=date(2025, 3, 1))],
+        as_of=date(2020, 1, 1),
+    )
+    response = client.post(
+        f"{settings.API_V1_STR}/me/housing-subscription-detail/request",
+        headers=headers,
+        json=request.model_dump(mode="json"),
+    )
+    assert response.status_code == 200
+    expected = calculate_recognition_details(
+        request.model_copy(update={"as_of": date.today()})
+    )
+    assert response.json()["calculation_result"] == expected.model_dump(mode="json")
+    assert response.json()["calculation_request"]["as_of"] is None
+
+    db_detail = crud.get_housing_subscription_detail_by_user_id(
+        session=db, user_id=user.id
+    )
+    assert db_detail
+    assert "as_of" not in db_detail.calculation_request
+    assert db_detail.calculation_result["details"] == []
+    assert (
+        db_detail.calculation_result["recognized_rounds"] == expected.recognized_rounds
+    )
+
+    # Reads are calculated (or served from the cache) the same way
+    for _ in range(2):
+        response = client.get(
+            f"{settings.API_V1_STR}/me/housing-subscription-detail", headers=headers
+        )
+        assert response.status_code == 200
+        assert response.json()["calculation_result"] == expected.model_dump(
+            mode="json"
+        )
+
+    # Saving a full result afterwards clears the stored request
+    response = client.post(
+        f"{settings.API_V1_STR}/me/housing-subscription-detail",
+        headers=headers,
+        json=expected.model_dump(mode="json"),
+    )
+    assert response.status_code == 200
+    assert response.json()["calculation_request"] is None
+
+
+def test_save_housing_subscription_detail_request_invalid(
+    client: TestClient, db: Session
+) -> None:
+    """
+    Test that an invalid request is rejected before anything is saved.
+    """
+    email = random_email()
+    headers = authentication_token_from_email(client=client, email=email, db=db)
+    payload = {
+        "payment_day": 0,
+        "start_date": "2024-06-01",
+        "end_date": "2026-01-31",
+        "payment_amount_option": "maximum",
+    }
+    response = client.post(
+        f"{settings.API_V1_STR}/me/housing-subscription-detail/request",
+        headers=headers,
+        json=payload,
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "납입일은 1일부터 31일 사이여야 합니다."
+    user = crud.get_user_by_email(session=db, email=email)
+    assert user
+    assert (
+        crud.get_housing_subscription_detail_by_user_id(session=db, user_id=user.id)
+        is None
+    )
+
+
+def test_save_packed_housing_subscription_detail(
+    client: TestClient, db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Test that packed results read like JSON ones and that JSON rows are packed.
+    """
+    email = random_email()
+    headers = authentication_token_from_email(client=client, email=email, db=db)
+    user = crud.get_user_by_email(session=db, email=email)
+    assert user
+    result = calculate_recognition_details(
+        RecognitionCalculatorRequest(
+            payment_day=10,
+            start_date=date(2024, 6, 1),
+            end_date=date(2026, 1, 31),
+            payment_amount_option=PaymentAmountOption.maximum,
+            as_of=date(2025, 6, 1),
+        )
+    )
+    document = result.model_dump(mode="json")
+
+    # 1. Saved as JSON, then packed in the background when read
+    response = client.post(
+        f"{settings.API_V1_STR}/me/housing-subscription-detail",
+        headers=headers,
+        json=document,
+    )
+    assert response.status_code == 200
+    monkeypatch.setattr(settings, "STORE_PACKED_CALCULATION_RESULTS", True)
+    response = client.get(
+        f"{settings.API_V1_STR}/me/housing-subscription-detail", headers=headers
+    )
+    assert response.json()["calculation_result"] == document
+
+    db.expire_all()
+    db_detail = crud.get_housing_subscription_detail_by_user_id(
+        session=db, user_id=user.id
+    )
+    assert db_detail
+    assert db_detail.calculation_result_packed is not None
+    assert db_detail.calculation_result == document
+
+    # 2. Saved packed directly
+    response = client.post(
+        f"{settings.API_V1_STR}/me/housing-subscription-detail",
+        headers=headers,
+        json=document,
+    )
+    assert response.json()["calculation_result"] == document
+    stored = db.exec(
+        select(HousingSubscriptionDetail.__table__.c.calculation_result).where(
+            HousingSubscriptionDetail.user_id == user.id
+        )
+    ).one()
+    assert stored["details"] == []
+    assert stored["recognized_rounds"] == result.recognized_rounds
+
@@ -1,5 +1,12 @@
+import importlib
+import json
+import sys
+from datetime import date
+
+import pytest
 from fastapi.testclient import TestClient
 
+from app.api.routes import payment_schedule
 from app.core.config import settings
 from app.main import app
 
@@ -61,3 +68,468 @@ def test_recalc_schedule_with_delays():
     assert second["delay_days"] == 9
     assert second["total_delay_days"] == 9
     assert second["recognized_date"] > second["due_date"]  # 인정일이 뒤로 밀렸는지 확인
+
+
+def test_calculate_recognition_batch_reports_errors_per_item():
+    """
+    인정회차 일괄 계산 API 테스트 - 실패한 요청은 해당 항목에만 오류로 표시
+    """
+    valid = {
+        "payment_day": 10,
+        "start_date": "2024-01-01",
+        "end_date": "2024-03-31",
+        "payment_amount_option": "standard",
+        "standard_payment_amount": 100000,
+    }
+    over_prepaid = {
+        **valid,
+        "payment_amount_option": "maximum",
+        "payments": [{"installment_no": 2, "paid_date": "2021-01-10"}],
+    }
+    payload = [valid, over_prepaid, valid]
+
+    response = client.post(
+        f"{settings.API_V1_STR}/payments/calculate-recognition/batch", json=payload
+    )
+    assert response.status_code == 200
+
+    data = response.json()
+    assert len(data) == 3
+    assert data[0]["error"] is None
+    assert data[0]["result"]["recognized_rounds"] == 3
+    assert data[0]["result"]["total_recognized_amount"] == 300000
+    assert data[1]["result"] is None
+    assert "721" in data[1]["error"]
+    assert data[2] == data[0]
+
+
+def test_calculate_recognition_summary_only():
+    """
+    인정회차 계산 API 테스트 - 합계만 조회
+    """
+    payload = {
+        "payment_day": 10,
+        "start_date": "2024-10-01",
+        "end_date": "2025-01-31",
+        "payment_amount_option": "maximum",
+        "as_of": "2025-02-01",
+    }
+
+    response = client.post(
+        f"{settings.API_V1_STR}/payments/calculate-recognition",
+        params={"summary_only": True},
+        json=payload,
+    )
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["recognized_rounds"] == 4
+    assert data["unrecognized_rounds"] == 0
+    assert data["total_recognized_amount"] == 850000
+    assert data["details"] == []
+
+
+def test_calculate_recognition_ndjson_stream():
+    """
+    인정회차 계산 API 테스트 - NDJSON 스트리밍 응답 (회차별 한 줄 + 마지막 합계 줄)
+    """
+    payload = {
+        "payment_day": 10,
+        "start_date": "2024-10-01",
+        "end_date": "2025-01-31",
+        "payment_amount_option": "maximum",
+        "as_of": "2025-02-01",
+    }
+
+    response = client.post(
+        f"{settings.API_V1_STR}/payments/calculate-recognition",
+        headers={"Accept": "application/x-ndjson"},
+        json=payload,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    expected = client.post(
+        f"{settings.API_V1_STR}/payments/calculate-recognition", json=payload
+    ).json()
+    assert lines[:-1] == expected["details"]
+    assert lines[-1] == {
+        "summary": {key: value for key, value in expected.items() if key != "details"}
+    }
+
+
+def test_calculate_recognition_ndjson_stream_rejects_invalid_request():
+    """
+    인정회차 계산 API 테스트 - 스트리밍 전에 선납 한도 오류를 400으로 반환
+    """
+    payload = {
+        "payment_day": 20,
+        "start_date": "2024-01-01",
+        "end_date": "2024-03-31",
+        "payment_amount_option": "maximum",
+        "payments": [{"installment_no": 2, "paid_date": "2021-02-20"}],
+    }
+
+    response = client.post(
+        f"{settings.API_V1_STR}/payments/calculate-recognition",
+        headers={"Accept": "application/x-ndjson"},
+        json=payload,
+    )
+    assert response.status_code == 400
+    assert "721" in response.json()["detail"]
+
+
+def test_calculate_recognition_rejects_invalid_payment_day():
+    """
+    인정회차 계산 API 테스트 - 1~31일 밖의 납입일은 400으로 반환
+    """
+    payload = {
+        "payment_day": 0,
+        "start_date": "2024-01-01",
+        "end_date": "2024-03-31",
+        "payment_amount_option": "maximum",
+    }
+
+    for summary_only in ("false", "true"):
+        response = client.post(
+            f"{settings.API_V1_STR}/payments/calculate-recognition",
+            params={"summary_only": summary_only},
+            json=payload,
+        )
+        assert response.status_code == 400
+        assert "납입일" in response.json()["detail"]
+
+
+def test_calculate_recognition_rejects_dates_past_date_max():
+    """
+    인정회차 계산 API 테스트 - 9999-12-31을 넘는 인정일은 400으로 반환
+    """
+    payload = {
+        "payment_day": 28,
+        "start_date": "9990-01-01",
+        "end_date": "9999-12-31",
+        "payment_amount_option": "standard",
+        "standard_payment_amount": 100000,
+        "payments": [{"installment_no": 1, "paid_date": "9999-12-31"}],
+    }
+
+    for summary_only in ("false", "true"):
+        response = client.post(
+            f"{settings.API_V1_STR}/payments/calculate-recognition",
+            params={"summary_only": summary_only},
+            json=payload,
+        )
+        assert response.status_code == 400
+        assert "날짜" in response.json()["detail"]
+
+    # And: The same dates are still accepted when they fit
+    response = client.post(
+        f"{settings.API_V1_STR}/payments/calculate-recognition",
+        params={"summary_only": "true"},
+        json={**payload, "payment_day": 1, "as_of": "9999-12-31"},
+    )
+    assert response.status_code == 200
+    assert response.json()["recognized_rounds"] == 120
+
+
+def test_recalc_schedule_before_calendar_table():
+    """
+    재계산 API 테스트 - 1950년 이전을 돌아보는 정상 납입도 계산
+    """
+    payload = {
+        "payments": [
+            {"installment_no": 1, "due_date": "1951-03-05", "paid_date": "1951-03-05"}
+        ],
+        "open_date": "1951-03-05",
+        "end_date": "1951-03-31",
+    }
+
+    response = client.post(f"{settings.API_V1_STR}/payments/recalc", json=payload)
+    assert response.status_code == 200
+    assert response.json()["payments"][0]["recognized_date"] == "1951-03-05"
+
+
+def test_recalc_schedule_ndjson_stream():
+    """
+    납입내역 재계산 API 테스트 - NDJSON 스트리밍 응답
+    """
+    payload = {
+        "payments": [
+            {"installment_no": 1, "due_date": "2025-01-10", "paid_date": "2025-01-10"},
+            {"installment_no": 2, "due_date": "2025-02-10", "paid_date": "2025-02-19"},
+        ],
+        "open_date": "2025-01-01",
+        "end_date": "2025-06-30",
+        "as_of": "2025-06-30",
+    }
+
+    response = client.post(
+        f"{settings.API_V1_STR}/payments/recalc",
+        headers={"Accept": "application/x-ndjson"},
+        json=payload,
+    )
+    assert response.status_code == 200
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    expected = client.post(
+        f"{settings.API_V1_STR}/payments/recalc", json=payload
+    ).json()
+    assert lines[:-1] == expected["payments"]
+    assert lines[-1]["summary"]["total_delay_days"] == expected["total_delay_days"]
+    assert lines[-1]["summary"]["total_installments"] == expected["total_installments"]
+
+
+def test_normal_schedule_ndjson_stream_rejects_invalid_due_day():
+    """
+    정상 납입 API 테스트 - 스트리밍 전에 납입일 오류를 400으로 반환
+    """
+    payload = {"open_date": "2025-01-01", "due_day": 0, "end_date": "2025-06-30"}
+
+    for headers in ({}, {"Accept": "application/x-ndjson"}):
+        response = client.post(
+            f"{settings.API_V1_STR}/payments/normal", headers=headers, json=payload
+        )
+        assert response.status_code == 400
+        assert "납입일" in response.json()["detail"]
+
+
+def test_recalc_schedule_ndjson_stream_rejects_invalid_payments():
+    """
+    납입내역 재계산 API 테스트 - 스트리밍 전에 계산할 수 없는 날짜를 400으로 반환
+    """
+    payload = {
+        "payments": [
+            {"installment_no": 1, "due_date": "2025-01-10", "paid_date": "2025-01-10"},
+            {"installment_no": 2, "due_date": "9999-11-01", "paid_date": "9999-12-31"},
+            {"installment_no": 3, "due_date": "9999-12-15", "paid_date": "9999-12-15"},
+        ],
+        "open_date": "2025-01-01",
+        "end_date": "9999-12-31",
+    }
+
+    for headers in ({}, {"Accept": "application/x-ndjson"}):
+        response = client.post(
+            f"{settings.API_V1_STR}/payments/recalc", headers=headers, json=payload
+        )
+        assert response.status_code == 400
+        assert "날짜" in response.json()["detail"]
+
+
+def test_calculate_recognition_columnar():
+    """
+    인정회차 계산 API 테스트 - 필드별 배열(columnar) 응답
+    """
+    payload = {
+        "payment_day": 20,
+        "start_date": "2024-01-01",
+        "end_date": "2024-04-30",
+        "payment_amount_option": "maximum",
+        "payments": [
+            {"installment_no": 2, "paid_date": "2024-02-25"},
+            {"installment_no": 3, "paid_date": "2024-03-20", "paid_amount": 0},
+        ],
+        "as_of": "2024-12-31",
+    }
+    expected = client.post(
+        f"{settings.API_V1_STR}/payments/calculate-recognition", json=payload
+    ).json()
+
+    response = client.post(
+        f"{settings.API_V1_STR}/payments/calculate-recognition/columnar",
+        params={"date_format": "ordinal"},
+        json=payload,
+    )
+    assert response.status_code == 200
+
+    data = response.json()
+    columns = data["details"]
+    assert data["date_format"] == "ordinal"
+    assert data["recognized_rounds"] == expected["recognized_rounds"]
+    assert data["total_recognized_amount"] == expected["total_recognized_amount"]
+    assert columns["installment_no"] == [1, 2, 3, 4]
+    # 2024-01-20 is day 19742 since 1970-01-01
+    assert columns["due_date"][0] == 19742
+    assert columns["paid_date"][2] is None
+    assert columns["status"] == [0, 1, 3, 0]
+    assert columns["recognized_amount_for_round"] == [
+        record["recognized_amount_for_round"] for record in expected["details"]
+    ]
+
+    iso_response = client.post(
+        f"{settings.API_V1_STR}/payments/calculate-recognition/columnar",
+        json=payload,
+    )
+    assert iso_response.json()["details"]["due_date"] == [
+        record["due_date"] for record in expected["details"]
+    ]
+
+
+RECOGNITION_PAYLOAD = {
+    "payment_day": 20,
+    "start_date": "2024-01-01",
+    "end_date": "2024-04-30",
+    "payment_amount_option": "maximum",
+    "payments": [
+        {"installment_no": 2, "paid_date": "2024-02-25"},
+        {"installment_no": 3, "paid_date": "2024-03-20", "paid_amount": 0},
+    ],
+    "as_of": "2024-12-31",
+}
+
+
+def test_calculate_recognition_msgpack():
+    """
+    인정회차 계산 API 테스트 - MessagePack 응답
+    """
+    msgpack = pytest.importorskip("msgpack")
+
+    response = client.post(
+        f"{settings.API_V1_STR}/payments/calculate-recognition",
+        headers={"Accept": "application/msgpack"},
+        json=RECOGNITION_PAYLOAD,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/msgpack"
+
+    data = msgpack.unpackb(response.content)
+    assert data["recognized_rounds"] == 3
+    assert data["start_date"] == 19723  # 2024-01-01
+    assert data["details"]["due_date"][0] == 19742  # 2024-01-20
+    assert data["details"]["paid_date"][2] is None
+    assert data["details"]["status"] == [0, 1, 3, 0]
+
+
+def test_recalc_schedule_arrow():
+    """
+    납입내역 재계산 API 테스트 - Arrow IPC 응답
+    """
+    pa = pytest.importorskip("pyarrow")
+    payload = {
+        "payments": [
+            {"installment_no": 1, "due_date": "2025-01-10", "paid_date": "2025-01-10"},
+            {"installment_no": 2, "due_date": "2025-02-10", "paid_date": "2025-02-19"},
+        ],
+        "open_date": "2025-01-01",
+        "end_date": "2025-06-30",
+        "as_of": "2025-06-30",
+    }
+
+    response = client.post(
+        f"{settings.API_V1_STR}/payments/recalc",
+        headers={"Accept": "application/vnd.apache.arrow.stream"},
+        json=payload,
+    )
+    assert response.status_code == 200
+
+    table = pa.ipc.open_stream(response.content).read_all()
+    expected = client.post(
+        f"{settings.API_V1_STR}/payments/recalc", json=payload
+    ).json()
+    assert table.schema.metadata[b"total_delay_days"] == str(
+        expected["total_delay_days"]
+    ).encode()
+    assert table.column("due_date").to_pylist() == [
+        date.fromisoformat(p["due_date"]) for p in expected["payments"]
+    ]
+    assert table.column("delay_days").to_pylist() == [
+        p["delay_days"] for p in expected["payments"]
+    ]
+
+
+def test_binary_response_without_library_is_refused_before_calculating(monkeypatch):
+    """
+    인정회차 계산 API 테스트 - 라이브러리가 없는 형식은 계산 전에 406으로 반환
+    """
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    monkeypatch.setattr(payment_schedule, "calculate_recognition_rounds", None)
+    payload = {
+        "payment_day": 10,
+        "start_date": "2024-10-01",
+        "end_date": "2025-01-31",
+        "payment_amount_option": "maximum",
+    }
+
+    response = client.post(
+        f"{settings.API_V1_STR}/payments/calculate-recognition",
+        headers={"Accept": "application/vnd.apache.arrow.stream"},
+        json=payload,
+    )
+    assert response.status_code == 406
+    assert "Arrow" in response.json()["detail"]
+
+
+def test_calculator_endpoints_share_single_flight():
+    """
+    계산 API 테스트 - 정상/재계산/컬럼/바이너리 응답도 동일 요청을 한 번만 계산
+    """
+    requests = [
+        (
+            "/payments/normal",
+            {"open_date": "2025-01-10", "due_day": 10, "end_date": "2025-06-30"},
+            {},
+        ),
+        (
+            "/payments/recalc",
+            {
+                "payments": [
+                    {
+                        "installment_no": 1,
+                        "due_date": "2025-01-10",
+                        "paid_date": "2025-01-12",
+                    }
+                ],
+                "open_date": "2025-01-01",
+                "end_date": "2025-06-30",
+                "as_of": "2025-06-30",
+            },
+            {},
+        ),
+        ("/payments/calculate-recognition/columnar", RECOGNITION_PAYLOAD, {}),
+    ]
+    if importlib.util.find_spec("msgpack") is not None:
+        requests.append(
+            (
+                "/payments/calculate-recognition",
+                RECOGNITION_PAYLOAD,
+                {"Accept": "application/msgpack"},
+            )
+        )
+    stats_url = (
+        f"{settings.API_V1_STR}/payments/calculate-recognition/single-flight-stats"
+    )
+    before = client.get(stats_url).json()["computations"]
+
+    for path, payload, headers in requests:
+        response = client.post(
+            f"{settings.API_V1_STR}{path}", headers=headers, json=payload
+        )
+        assert response.status_code == 200
+
+    assert client.get(stats_url).json()["computations"] == before + len(requests)
+
+
+def test_calculate_recognition_uses_result_cache():
+    """
+    인정회차 계산 API 테스트 - 같은 요청은 캐시된 결과를 반환
+    """
+    payload = {**RECOGNITION_PAYLOAD, "as_of": "2030-01-01"}
+    before = client.get(
+        f"{settings.API_V1_STR}/payments/calculate-recognition/cache-stats"
+    ).json()
+
+    first = client.post(
+        f"{settings.API_V1_STR}/payments/calculate-recognition", json=payload
+    )
+    second = client.post(
+        f"{settings.API_V1_STR}/payments/calculate-recognition",
+        json={**payload, "payments": list(reversed(payload["payments"]))},
+    )
+    assert first.status_code == 200
+    assert second.content == first.content
+
+    after = client.get(
+        f"{settings.API_V1_STR}/payments/calculate-recognition/cache-stats"
+    ).json()
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
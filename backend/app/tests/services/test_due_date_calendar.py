@@ -0,0 +1,38 @@
+from datetime import date
+
+import pytest
+
+from app.services.due_date_calendar import add_months, due_date
+from app.services.recognition_errors import RecognitionRequestError
+
+
+def test_due_date_is_clamped_to_month_end():
+    # Given/When/Then: Days missing in short months fall on the last day
+    assert due_date(2024, 2, 31) == date(2024, 2, 29)
+    assert due_date(2025, 2, 29) == date(2025, 2, 28)
+    assert due_date(2025, 4, 31) == date(2025, 4, 30)
+    assert due_date(2025, 1, 31) == date(2025, 1, 31)
+
+
+def test_due_date_rejects_invalid_day():
+    # Given/When/Then: Days outside 1..31 are rejected as invalid requests
+    with pytest.raises(RecognitionRequestError):
+        due_date(2025, 1, 0)
+    with pytest.raises(RecognitionRequestError):
+        due_date(2025, 1, 32)
+
+
+def test_due_date_outside_table_range():
+    # Given/When/Then: Months outside the table are calculated directly
+    assert due_date(1900, 2, 31) == date(1900, 2, 28)
+    assert due_date(2400, 2, 30) == date(2400, 2, 29)
+    assert add_months(date(1950, 1, 31), -1) == date(1949, 12, 31)
+    with pytest.raises(RecognitionRequestError):
+        add_months(date(1, 1, 1), -1)
+
+
+def test_add_months():
+    # Given/When/Then: Months are added with month-end clamping
+    assert add_months(date(2026, 2, 28), -24) == date(2024, 2, 28)
+    assert add_months(date(2026, 3, 31), -1) == date(2026, 2, 28)
+    assert add_months(date(2024, 12, 15), 1) == date(2025, 1, 15)
@@ -0,0 +1,118 @@
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from app.schemas import (
+    CustomPaymentInput,
+    PaymentAmountOption,
+    RecognitionCalculatorRequest,
+    RecognitionRule,
+    RecognitionRuleSet,
+)
+from app.services.recognition_batch import calculate_recognition_batch_json
+from app.services.recognition_rules import reload_rule_table, set_rule_table
+from app.services.recognized_date_calc import calculate_recognition_details
+
+
+def test_calculate_recognition_batch_fans_out_chunks_in_order():
+    # Given: More requests than fit in one chunk, one of them invalid
+    requests = [
+        RecognitionCalculatorRequest(
+            payment_day=day,
+            start_date=date(2020, 1, 1),
+            end_date=date(2024, 12, 31),
+            payment_amount_option=PaymentAmountOption.maximum,
+        )
+        for day in range(1, 11)
+    ]
+    requests[6] = RecognitionCalculatorRequest(
+        payment_day=20,
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 3, 31),
+        payment_amount_option=PaymentAmountOption.maximum,
+        payments=[CustomPaymentInput(installment_no=2, paid_date=date(2021, 2, 20))],
+    )
+
+    # When: The batch is calculated on a process pool with small chunks
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        content = calculate_recognition_batch_json(
+            requests, executor=executor, chunk_size=3
+        )
+
+    # Then: Every item keeps its position and only the invalid one has an error
+    results = json.loads(content)
+    assert len(results) == len(requests)
+    for i, (request, item) in enumerate(zip(requests, results)):
+        if i == 6:
+            assert item["result"] is None
+            assert "721" in item["error"]
+        else:
+            assert item["error"] is None
+            expected = calculate_recognition_details(request)
+            assert item["result"] == expected.model_dump(mode="json")
+
+
+def test_calculate_recognition_batch_workers_use_current_rules():
+    # Given: Rules loaded in this process only, and spawned workers
+    low_cap = RecognitionRuleSet(
+        version="low-cap",
+        rules=[
+            RecognitionRule(
+                effective_from=date(1900, 1, 1),
+                max_recognized_amount=50000,
+                max_prepaid_days=721,
+                prepayment_window_months=24,
+            )
+        ],
+    )
+    request = RecognitionCalculatorRequest(
+        payment_day=10,
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 3, 31),
+        payment_amount_option=PaymentAmountOption.maximum,
+        as_of=date(2025, 1, 1),
+    )
+    context = multiprocessing.get_context("spawn")
+
+    try:
+        set_rule_table(low_cap)
+
+        # When: A batch larger than one chunk is fanned out to the workers
+        with ProcessPoolExecutor(max_workers=2, mp_context=context) as executor:
+            content = calculate_recognition_batch_json(
+                [request] * 4, executor=executor, chunk_size=1
+            )
+    finally:
+        reload_rule_table()
+
+    # Then: The workers should apply the parent's rules, like a small batch
+    results = json.loads(content)
+    assert [item["result"]["total_recognized_amount"] for item in results] == [
+        150000
+    ] * 4
+
+
+
+def test_calculate_recognition_batch_reports_dates_past_date_max_per_item():
+    # Given: A late payment pushing recognized dates past 9999-12-31
+    past_date_max = RecognitionCalculatorRequest(
+        payment_day=28,
+        start_date=date(9990, 1, 1),
+        end_date=date(9999, 12, 31),
+        payment_amount_option=PaymentAmountOption.standard,
+        standard_payment_amount=100000,
+        payments=[CustomPaymentInput(installment_no=1, paid_date=date(9999, 12, 31))],
+    )
+    valid = past_date_max.model_copy(update={"payment_day": 1})
+
+    # When: Both are calculated in one batch
+    results = json.loads(calculate_recognition_batch_json([past_date_max, valid]))
+
+    # Then: Only the overflowing request should fail, in its own item
+    assert results[0]["result"] is None
+    assert "날짜" in results[0]["error"]
+    assert results[1]["error"] is None
+    assert results[1]["result"] == calculate_recognition_details(valid).model_dump(
+        mode="json"
+    )
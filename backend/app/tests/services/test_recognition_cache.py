@@ -0,0 +1,123 @@
+from datetime import date, datetime
+
+from app.schemas import (
+    CustomPaymentInput,
+    PaymentAmountOption,
+    RecognitionCalculatorRequest,
+)
+from app.services.recognition_cache import ResultCache, canonical_request_key
+from app.services.recognized_date_calc import calculate_recognition_details
+
+
+def test_canonical_request_key_normalizes_request():
+    # Given: Requests differing only in payment order, duplicates and unused fields
+    request = RecognitionCalculatorRequest(
+        payment_day=10,
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 12, 31),
+        payment_amount_option=PaymentAmountOption.maximum,
+        payments=[
+            CustomPaymentInput(installment_no=2, paid_date=date(2024, 2, 15)),
+            CustomPaymentInput(
+                installment_no=5, paid_date=date(2024, 5, 10), paid_amount=0
+            ),
+        ],
+    )
+    equivalent = RecognitionCalculatorRequest(
+        payment_day=10,
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 12, 31),
+        payment_amount_option=PaymentAmountOption.maximum,
+        standard_payment_amount=70000,
+        payments=[
+            CustomPaymentInput(
+                installment_no=5, paid_date=date(2024, 5, 1), paid_amount=0
+            ),
+            CustomPaymentInput(installment_no=2, paid_date=date(2024, 2, 1)),
+            CustomPaymentInput(
+                installment_no=2, paid_date=date(2024, 2, 15), paid_amount=100000
+            ),
+        ],
+    )
+
+    # When/Then: They share a key for the same as-of day only
+    as_of = date(2025, 1, 1)
+    assert canonical_request_key(request, as_of) == canonical_request_key(
+        equivalent, as_of
+    )
+    assert canonical_request_key(request, as_of) != canonical_request_key(
+        request, date(2025, 1, 2)
+    )
+
+
+def test_canonical_request_key_keeps_negative_amounts():
+    # Given: Requests whose amounts differ only between zero and negative
+    base = RecognitionCalculatorRequest(
+        payment_day=10,
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 6, 30),
+        payment_amount_option=PaymentAmountOption.maximum,
+        as_of=date(2025, 1, 1),
+    )
+    pairs = [
+        (
+            base.model_copy(
+                update={
+                    "payments": [
+                        CustomPaymentInput(
+                            installment_no=2,
+                            paid_date=date(2024, 2, 10),
+                            paid_amount=amount,
+                        )
+                    ]
+                }
+            )
+            for amount in (0, -5)
+        ),
+        (
+            base.model_copy(
+                update={
+                    "payment_amount_option": option,
+                    "standard_payment_amount": amount,
+                }
+            )
+            for option, amount in (
+                (PaymentAmountOption.custom, None),
+                (PaymentAmountOption.standard, -3),
+            )
+        ),
+    ]
+
+    for pair in pairs:
+        zero, negative = pair
+
+        # When/Then: Their results differ, and so should their keys
+        assert calculate_recognition_details(zero) != calculate_recognition_details(
+            negative
+        )
+        assert canonical_request_key(zero) != canonical_request_key(negative)
+
+
+def test_result_cache_lru_and_day_boundary():
+    # Given: A cache of two entries and a controllable clock
+    now = [datetime(2025, 1, 1, 23, 0)]
+    cache = ResultCache(max_entries=2, ttl_seconds=7200, clock=lambda: now[0])
+
+    # When: Three entries are stored and the first is read again
+    cache.put("a", b"1")
+    cache.put("b", b"2")
+    assert cache.get("a") == b"1"
+    cache.put("c", b"3")
+
+    # Then: The least recently used entry is evicted
+    assert cache.get("b") is None
+    assert cache.get_or_compute("c", lambda: b"x") == b"3"
+
+    # When: The day changes before the TTL ends
+    now[0] = datetime(2025, 1, 2, 0, 0)
+
+    # Then: Entries expire and are recomputed
+    assert cache.get_or_compute("a", lambda: b"4") == b"4"
+    stats = cache.stats()
+    counts = (stats.hits, stats.misses, stats.evictions, stats.expirations)
+    assert counts == (2, 2, 1, 1)
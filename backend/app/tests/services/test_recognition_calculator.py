@@ -6,8 +6,17 @@ from app.schemas import (
     CustomPaymentInput,
     PaymentAmountOption,
     RecognitionCalculatorRequest,
+    RecognitionCurveRequest,
+    RecognitionRecalculationRequest,
+)
+from app.services.recognition_errors import RecognitionRequestError
+from app.services.recognition_rules import get_rule_table
+from app.services.recognized_date_calc import (
+    calculate_recognition_curve,
+    calculate_recognition_details,
+    recalculate_recognition_details,
+    step_round,
 )
-from app.services.recognized_date_calc import calculate_recognition_details
 
 
 def test_calculate_recognition_details_simulation_maximum_option():
@@ -245,4 +254,195 @@ def test_calculate_recognition_details_with_custom_paid_amount():
     assert result.details[2].paid_amount == 100000
     assert result.details[2].recognized_amount_for_round == 100000
 
-    assert result.total_recognized_amount == (70000 + 100000 + 100000)
\ No newline at end of file
+    assert result.total_recognized_amount == (70000 + 100000 + 100000)
+
+def test_recalculate_recognition_details_matches_full_calculation():
+    # Given: A long schedule with a few custom payments, already calculated
+    payments = [
+        CustomPaymentInput(installment_no=3, paid_date=date(2000, 3, 25)),
+        CustomPaymentInput(
+            installment_no=40, paid_date=date(2003, 4, 1), paid_amount=80000
+        ),
+    ]
+    request = RecognitionCalculatorRequest(
+        payment_day=20,
+        start_date=date(2000, 1, 1),
+        end_date=date(2024, 12, 31),
+        payment_amount_option=PaymentAmountOption.maximum,
+        payments=payments,
+    )
+    previous = calculate_recognition_details(request)
+
+    # When: Installments 150 and 151 are edited and only the suffix is recomputed
+    changes = [
+        CustomPaymentInput(installment_no=150, paid_date=date(2012, 7, 1)),
+        CustomPaymentInput(
+            installment_no=151, paid_date=date(2012, 7, 20), paid_amount=0
+        ),
+    ]
+    result = recalculate_recognition_details(
+        RecognitionRecalculationRequest(
+            previous=previous,
+            payment_amount_option=PaymentAmountOption.maximum,
+            payments=changes,
+        )
+    )
+
+    # Then: The result should equal a full calculation with the edited payments
+    expected = calculate_recognition_details(
+        request.model_copy(update={"payments": payments + changes})
+    )
+    assert result == expected
+    assert result.details[:149] == previous.details[:149]
+    assert result.details[149].status == "지연"
+    assert result.details[150].status == "미납"
+
+
+def test_recalculate_recognition_details_without_changes_returns_previous():
+    # Given: A calculated result and changes outside of its rounds
+    request = RecognitionCalculatorRequest(
+        payment_day=10,
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 3, 31),
+        payment_amount_option=PaymentAmountOption.maximum,
+    )
+    previous = calculate_recognition_details(request)
+
+    # When: The recalculation is performed
+    result = recalculate_recognition_details(
+        RecognitionRecalculationRequest(
+            previous=previous,
+            payment_amount_option=PaymentAmountOption.maximum,
+            payments=[
+                CustomPaymentInput(installment_no=10, paid_date=date(2024, 10, 10))
+            ],
+        )
+    )
+
+    # Then: The previous result should be returned unchanged
+    assert result == previous
+
+
+def test_recalculate_recognition_details_uses_new_as_of_date():
+    # Given: A result calculated as of an early date
+    request = RecognitionCalculatorRequest(
+        payment_day=10,
+        start_date=date(2023, 9, 1),
+        end_date=date(2025, 8, 31),
+        payment_amount_option=PaymentAmountOption.maximum,
+        as_of=date(2024, 3, 1),
+    )
+    previous = calculate_recognition_details(request)
+    later = request.model_copy(update={"as_of": date(2026, 1, 1)})
+    change = CustomPaymentInput(installment_no=20, paid_date=date(2025, 4, 20))
+
+    for payments in ([change], []):
+        # When: It is recalculated as of a later date, with and without edits
+        result = recalculate_recognition_details(
+            RecognitionRecalculationRequest(
+                previous=previous,
+                payment_amount_option=PaymentAmountOption.maximum,
+                payments=payments,
+                as_of=later.as_of,
+            )
+        )
+
+        # Then: Kept rounds should be recognized as of the new date too
+        expected = calculate_recognition_details(
+            later.model_copy(update={"payments": payments})
+        )
+        assert result == expected
+        assert result.recognized_rounds == 24
+
+
+def test_calculate_recognition_details_uses_as_of_date():
+    # Given: A request evaluated as of a date in the middle of the schedule
+    request = RecognitionCalculatorRequest(
+        payment_day=10,
+        start_date=date(2024, 10, 1),
+        end_date=date(2025, 1, 31),
+        payment_amount_option=PaymentAmountOption.maximum,
+        as_of=date(2024, 12, 9),
+    )
+
+    # When: The calculation is performed
+    result = calculate_recognition_details(request)
+
+    # Then: Only rounds recognized on or before as_of should count
+    assert result.recognized_rounds == 2
+    assert result.unrecognized_rounds == 2
+    assert result.total_recognized_amount == 100000 + 250000
+    assert [d.is_recognized for d in result.details] == [True, True, False, False]
+
+
+def test_calculate_recognition_curve_matches_per_date_calculation():
+    # Given: A schedule with a delayed round and a curve range around it
+    request = RecognitionCurveRequest(
+        payment_day=20,
+        start_date=date(2024, 9, 1),
+        end_date=date(2025, 1, 31),
+        payment_amount_option=PaymentAmountOption.maximum,
+        payments=[CustomPaymentInput(installment_no=2, paid_date=date(2024, 11, 5))],
+        curve_start=date(2024, 9, 15),
+        curve_end=date(2025, 2, 5),
+    )
+
+    # When: The curve is calculated
+    result = calculate_recognition_curve(request)
+
+    # Then: Every point should equal a full calculation as of that date
+    assert len(result.points) == (request.curve_end - request.curve_start).days + 1
+    for point in result.points:
+        expected = calculate_recognition_details(
+            request.model_copy(update={"as_of": point.as_of})
+        )
+        assert point.recognized_rounds == expected.recognized_rounds
+        assert point.total_recognized_amount == expected.total_recognized_amount
+    assert result.points[-1].recognized_rounds == 5
+
+
+def test_calculate_recognition_details_clamps_payment_day_to_month_end():
+    # Given: A payment day that short months do not have
+    request = RecognitionCalculatorRequest(
+        payment_day=31,
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 4, 30),
+        payment_amount_option=PaymentAmountOption.maximum,
+        as_of=date(2025, 1, 1),
+    )
+
+    # When: The calculation is performed
+    result = calculate_recognition_details(request)
+
+    # Then: Due dates should fall on the last day of short months
+    assert [r.due_date for r in result.details] == [
+        date(2024, 1, 31),
+        date(2024, 2, 29),
+        date(2024, 3, 31),
+        date(2024, 4, 30),
+    ]
+
+
+def test_step_round_prepayment_policies():
+    # Given: A round paid three years before its due date
+    rules = get_rule_table()
+    due_date = date(2024, 2, 20)
+    paid_date = date(2021, 2, 20)
+
+    # When: Payment records clamp the prepayment to the 24-month window
+    step = step_round(2, due_date, paid_date, 10, 0, rules, clamp_prepayment=True)
+
+    # Then: The paid date moves to the start of the window
+    assert step.paid_date == date(2022, 2, 20)
+    assert step.prepaid_days == 730
+    assert step.total_prepaid_days == 730
+    assert step.recognized_date == date(2023, 2, 25)
+
+    # When/Then: The calculator rejects the same prepayment instead
+    with pytest.raises(RecognitionRequestError):
+        step_round(2, due_date, paid_date, 10, 0, rules)
+
+    # When/Then: A missed round carries the totals over unchanged
+    missed = step_round(3, due_date, None, 10, 5, rules)
+    assert missed.recognized_date is None
+    assert (missed.total_delay_days, missed.total_prepaid_days) == (10, 5)
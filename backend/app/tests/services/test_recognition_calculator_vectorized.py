@@ -0,0 +1,136 @@
+from datetime import date
+
+import pytest
+
+from app.schemas import (
+    CustomPaymentInput,
+    PaymentAmountOption,
+    RecognitionCalculatorRequest,
+)
+from app.services.recognition_errors import RecognitionRequestError
+from app.services.recognized_date_calc import calculate_recognition_details
+from app.services.recognized_date_calc_vectorized import (
+    calculate_recognition_details_vectorized,
+)
+
+
+@pytest.mark.parametrize(
+    "request_in",
+    [
+        RecognitionCalculatorRequest(
+            payment_day=10,
+            start_date=date(2024, 10, 1),
+            end_date=date(2025, 1, 31),
+            payment_amount_option=PaymentAmountOption.maximum,
+        ),
+        RecognitionCalculatorRequest(
+            payment_day=15,
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 4, 30),
+            payment_amount_option=PaymentAmountOption.standard,
+            standard_payment_amount=50000,
+        ),
+        RecognitionCalculatorRequest(
+            payment_day=25,
+            start_date=date(1995, 3, 1),
+            end_date=date(2030, 3, 20),
+            payment_amount_option=PaymentAmountOption.maximum,
+        ),
+        RecognitionCalculatorRequest(
+            payment_day=20,
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 6, 30),
+            payment_amount_option=PaymentAmountOption.custom,
+            payments=[
+                CustomPaymentInput(
+                    installment_no=1, paid_date=date(2024, 1, 20), paid_amount=70000
+                ),
+                CustomPaymentInput(
+                    installment_no=2, paid_date=date(2024, 3, 2), paid_amount=300000
+                ),
+                CustomPaymentInput(
+                    installment_no=4, paid_date=date(2024, 4, 1), paid_amount=100000
+                ),
+                CustomPaymentInput(installment_no=5, paid_date=date(2024, 5, 20)),
+            ],
+        ),
+    ],
+)
+def test_vectorized_matches_reference(request_in):
+    # Given: A request that the reference calculator handles
+
+    # When: Both engines calculate it
+    expected = calculate_recognition_details(request_in)
+    result = calculate_recognition_details_vectorized(request_in)
+
+    # Then: The results should be identical field by field
+    assert result == expected
+
+
+def test_vectorized_empty_range():
+    # Given: An end date before the start month
+    request = RecognitionCalculatorRequest(
+        payment_day=10,
+        start_date=date(2024, 5, 1),
+        end_date=date(2024, 4, 30),
+        payment_amount_option=PaymentAmountOption.maximum,
+    )
+
+    # When: The calculation is performed
+    result = calculate_recognition_details_vectorized(request)
+
+    # Then: No rounds should be produced
+    assert result == calculate_recognition_details(request)
+    assert result.details == []
+
+
+def test_vectorized_prepayment_over_limit_raises_error():
+    # Given: A round paid more than 721 days early
+    request = RecognitionCalculatorRequest(
+        payment_day=20,
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 3, 31),
+        payment_amount_option=PaymentAmountOption.maximum,
+        payments=[CustomPaymentInput(installment_no=2, paid_date=date(2021, 2, 20))],
+    )
+
+    # When/Then: The same error as the reference calculator should be raised
+    with pytest.raises(RecognitionRequestError) as excinfo:
+        calculate_recognition_details_vectorized(request)
+    assert excinfo.value.status_code == 400
+
+
+def test_vectorized_recognized_date_past_date_max_raises_error():
+    # Given: A late payment pushing recognized dates past 9999-12-31
+    request = RecognitionCalculatorRequest(
+        payment_day=28,
+        start_date=date(9990, 1, 1),
+        end_date=date(9999, 12, 31),
+        payment_amount_option=PaymentAmountOption.standard,
+        standard_payment_amount=100000,
+        payments=[CustomPaymentInput(installment_no=1, paid_date=date(9999, 12, 31))],
+    )
+
+    # When/Then: Both engines should reject it as a request error
+    with pytest.raises(RecognitionRequestError):
+        calculate_recognition_details(request)
+    with pytest.raises(RecognitionRequestError):
+        calculate_recognition_details_vectorized(request)
+
+
+def test_vectorized_clamps_payment_day_to_month_end():
+    # Given: A payment day that short months do not have
+    request = RecognitionCalculatorRequest(
+        payment_day=30,
+        start_date=date(2023, 11, 1),
+        end_date=date(2024, 3, 29),
+        payment_amount_option=PaymentAmountOption.maximum,
+        as_of=date(2024, 6, 1),
+    )
+
+    # When: The calculation is performed
+    result = calculate_recognition_details_vectorized(request)
+
+    # Then: The result should match the reference calculator
+    assert result == calculate_recognition_details(request)
+    assert result.details[3].due_date == date(2024, 2, 29)
@@ -0,0 +1,166 @@
+import io
+import json
+import os
+import subprocess
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+from app.schemas import (
+    PaymentAmountOption,
+    RecognitionCalculatorRequest,
+    RecognitionRule,
+    RecognitionRuleSet,
+)
+from app.services.recognition_cli import main, run_batch
+from app.services.recognition_rules import reload_rule_table
+from app.services.recognized_date_calc import calculate_recognition_details
+
+BACKEND_DIR = Path(__file__).resolve().parents[3]
+
+
+def _requests():
+    return [
+        RecognitionCalculatorRequest(
+            payment_day=day,
+            start_date=date(2023, 1, 1) + timedelta(days=day * 17),
+            end_date=date(2025, 6, 30),
+            payment_amount_option=PaymentAmountOption.maximum,
+            as_of=date(2025, 1, 1),
+        )
+        for day in range(1, 29)
+    ]
+
+
+def test_run_batch_writes_one_line_per_request():
+    # Given: JSONL requests with a blank line and an invalid line
+    requests = _requests()
+    lines = [request.model_dump_json().encode() for request in requests]
+    source = io.BytesIO(b"\n".join(lines[:3] + [b"", b"not json"] + lines[3:]))
+    target = io.BytesIO()
+
+    # When: They are calculated in one process, in small chunks
+    processed, errors = run_batch(source, target, chunk_lines=4)
+
+    # Then: Every non-blank line should have its result or error, in input order
+    items = [json.loads(line) for line in target.getvalue().splitlines()]
+    assert (processed, errors) == (len(requests) + 1, 1)
+    assert [item["line"] for item in items] == [1, 2, 3, 5] + list(
+        range(6, len(requests) + 3)
+    )
+    assert items[3]["result"] is None and "Invalid JSON" in items[3]["error"]
+    results = [item["result"] for item in items if item["result"] is not None]
+    assert results == [
+        json.loads(calculate_recognition_details(request).model_dump_json())
+        for request in requests
+    ]
+
+
+def test_batch_command_with_unordered_workers(tmp_path):
+    # Given: A JSONL input file
+    requests = _requests()
+    input_path = tmp_path / "in.jsonl"
+    output_path = tmp_path / "out.jsonl"
+    input_path.write_bytes(
+        b"\n".join(request.model_dump_json().encode() for request in requests)
+    )
+
+    # When: The command runs with two worker processes and unordered output
+    exit_code = main(
+        [
+            "batch",
+            str(input_path),
+            str(output_path),
+            "--workers",
+            "2",
+            "--unordered",
+            "--chunk-lines",
+            "5",
+        ]
+    )
+
+    # Then: Each line number should appear once with its request's result
+    assert exit_code == 0
+    items = [json.loads(line) for line in output_path.read_bytes().splitlines()]
+    assert sorted(item["line"] for item in items) == list(range(1, len(requests) + 1))
+    for item in items:
+        expected = calculate_recognition_details(requests[item["line"] - 1])
+        assert item["result"] == json.loads(expected.model_dump_json())
+
+
+def test_batch_command_with_rules_file(tmp_path):
+    # Given: A rule set file with a lower cap and a JSONL input file
+    rules_path = tmp_path / "rules.json"
+    rules_path.write_text(
+        RecognitionRuleSet(
+            version="low-cap",
+            rules=[
+                RecognitionRule(
+                    effective_from=date(1900, 1, 1),
+                    max_recognized_amount=50000,
+                    max_prepaid_days=721,
+                    prepayment_window_months=24,
+                )
+            ],
+        ).model_dump_json()
+    )
+    request = RecognitionCalculatorRequest(
+        payment_day=10,
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 3, 31),
+        payment_amount_option=PaymentAmountOption.maximum,
+        as_of=date(2025, 1, 1),
+    )
+    input_path = tmp_path / "in.jsonl"
+    output_path = tmp_path / "out.jsonl"
+    input_path.write_bytes(b"\n".join([request.model_dump_json().encode()] * 6))
+
+    # When: The command runs with the rules on two workers
+    try:
+        exit_code = main(
+            [
+                "batch",
+                str(input_path),
+                str(output_path),
+                "--workers",
+                "2",
+                "--chunk-lines",
+                "2",
+                "--rules",
+                str(rules_path),
+            ]
+        )
+    finally:
+        reload_rule_table()
+
+    # Then: Every line should be calculated with the file's cap
+    assert exit_code == 0
+    items = [json.loads(line) for line in output_path.read_bytes().splitlines()]
+    assert [item["result"]["total_recognized_amount"] for item in items] == [
+        150000
+    ] * 6
+
+
+def test_cli_does_not_import_web_layer_or_settings():
+    # Given: An environment without the Postgres settings
+    env = {"PATH": os.environ.get("PATH", ""), "PYTHONPATH": str(BACKEND_DIR)}
+
+    # When: The command line module is imported
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, app.services.recognized_date_calc;"
+            "import app.services.recognition_cli;"
+            "print(sorted(m for m in sys.modules"
+            " if m.split('.')[0] == 'fastapi' or m.startswith('app.core')))",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # Then: Neither FastAPI nor the settings should be loaded
+    assert completed.stdout.strip() == "[]"
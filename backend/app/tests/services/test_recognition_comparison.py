@@ -0,0 +1,81 @@
+from datetime import date
+
+from app.schemas import (
+    CustomPaymentInput,
+    PaymentAmountOption,
+    RecognitionCalculatorRequest,
+    RecognitionComparisonRequest,
+    RecognitionScenario,
+)
+from app.services.recognition_comparison import compare_recognition_scenarios
+from app.services.recognized_date_calc import calculate_recognition_details
+
+
+def test_compare_scenarios_matches_individual_calculations():
+    # Given: Standard, maximum and custom scenarios on the same schedule
+    payments = [
+        CustomPaymentInput(installment_no=2, paid_date=date(2024, 9, 25)),
+        CustomPaymentInput(
+            installment_no=3, paid_date=date(2024, 10, 10), paid_amount=0
+        ),
+    ]
+    request = RecognitionComparisonRequest(
+        payment_day=10,
+        start_date=date(2024, 8, 1),
+        end_date=date(2025, 1, 31),
+        as_of=date(2025, 1, 15),
+        scenarios=[
+            RecognitionScenario(
+                name="standard",
+                payment_amount_option=PaymentAmountOption.standard,
+                standard_payment_amount=100000,
+                payments=payments,
+            ),
+            RecognitionScenario(
+                name="maximum",
+                payment_amount_option=PaymentAmountOption.maximum,
+                payments=payments,
+            ),
+            RecognitionScenario(
+                name="custom",
+                payment_amount_option=PaymentAmountOption.custom,
+                payments=[
+                    CustomPaymentInput(
+                        installment_no=1,
+                        paid_date=date(2024, 8, 10),
+                        paid_amount=300000,
+                    ),
+                ],
+            ),
+        ],
+    )
+
+    # When: The scenarios are compared
+    result = compare_recognition_scenarios(request)
+
+    # Then: Each scenario should match its own calculation
+    for scenario, scenario_result in zip(request.scenarios, result.scenarios):
+        expected = calculate_recognition_details(
+            RecognitionCalculatorRequest(
+                payment_day=request.payment_day,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                payment_amount_option=scenario.payment_amount_option,
+                standard_payment_amount=scenario.standard_payment_amount,
+                payments=scenario.payments,
+                as_of=request.as_of,
+            )
+        )
+        assert scenario_result.name == scenario.name
+        assert scenario_result.result == expected
+
+    # And: Differences should be relative to the first scenario
+    baseline, maximum, custom = result.scenarios
+    assert baseline.round_diffs == []
+    assert maximum.total_recognized_amount_diff == (
+        maximum.result.total_recognized_amount - baseline.result.total_recognized_amount
+    )
+    # Rounds 1-3 are paid before the amount change, round 4 onwards after
+    assert [diff.installment_no for diff in maximum.round_diffs] == [4, 5, 6]
+    assert {diff.recognized_amount_diff for diff in maximum.round_diffs} == {150000}
+    assert custom.recognized_rounds_diff == 1 - baseline.result.recognized_rounds
@@ -0,0 +1,209 @@
+import random
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, List
+
+import pytest
+
+from app.schemas import (
+    CustomPaymentInput,
+    PaymentAmountOption,
+    RecognitionCalculationResult,
+    RecognitionCalculatorRequest,
+    RecognitionComparisonRequest,
+    RecognitionRecalculationRequest,
+    RecognitionScenario,
+)
+from app.services.recognition_comparison import compare_recognition_scenarios
+from app.services.recognition_rules import get_rule_table
+from app.services.recognition_summary import calculate_recognition_summary
+from app.services.recognized_date_calc import (
+    _build_result,
+    calculate_recognition_details,
+    iter_recognition_rounds,
+    recalculate_recognition_details,
+)
+from app.services.recognized_date_calc_vectorized import (
+    calculate_recognition_details_vectorized,
+)
+
+CORPUS_SEEDS = range(8)
+REQUESTS_PER_SEED = 40
+
+Engine = Callable[[RecognitionCalculatorRequest], RecognitionCalculationResult]
+
+
+def generate_request(rng: random.Random) -> RecognitionCalculatorRequest:
+    """
+    Random calculator request. Besides ordinary schedules it produces the edge
+    cases the engines handle separately: payment days past the end of the
+    month or out of range, empty ranges, duplicated, out of range and
+    zero/negative custom payments, and prepayments beyond the 721 day limit.
+    """
+    start_date = date(2000, 1, 1) + timedelta(days=rng.randint(0, 9000))
+    end_date = start_date + timedelta(
+        days=rng.randint(-40, rng.choice((400, 2000, 6000)))
+    )
+    payments = []
+    for _ in range(rng.choice((0, 1, 3, 10, 40))):
+        installment_no = rng.randint(-1, 220)
+        due = start_date + timedelta(days=30 * max(installment_no - 1, 0))
+        # Mostly close to the due date, sometimes a prepayment past the limit
+        offset = rng.choice((0, rng.randint(-60, 400), rng.randint(-900, -600)))
+        payments.append(
+            CustomPaymentInput(
+                installment_no=installment_no,
+                paid_date=due + timedelta(days=offset),
+                paid_amount=rng.choice((None, None, 0, 50000, 300000, -5)),
+            )
+        )
+    payment_day = rng.randint(1, 31)
+    if rng.random() < 0.05:
+        payment_day = rng.choice((0, 32))
+    return RecognitionCalculatorRequest(
+        payment_day=payment_day,
+        start_date=start_date,
+        end_date=end_date,
+        payment_amount_option=rng.choice(list(PaymentAmountOption)),
+        standard_payment_amount=rng.choice((None, 0, -3, 70000, 120000, 300000)),
+        payments=payments or None,
+        as_of=start_date + timedelta(days=rng.randint(-100, 8000)),
+    )
+
+
+def _streamed(request: RecognitionCalculatorRequest) -> RecognitionCalculationResult:
+    rounds = list(iter_recognition_rounds(request))
+    return _build_result(
+        request.payment_day, request.start_date, request.end_date, rounds
+    )
+
+
+def _incremental(request: RecognitionCalculatorRequest) -> RecognitionCalculationResult:
+    # The later half of the payments edits a result calculated with the first
+    # half. Payments are deduplicated (the last one per installment wins, as in
+    # Step B) and ordered first, so the first half never holds a payment that a
+    # later one overrides, and its first error is also the full request's.
+    deduplicated = {cp.installment_no: cp for cp in request.payments or []}
+    payments = [deduplicated[no] for no in sorted(deduplicated)]
+    half = len(payments) // 2
+    previous = calculate_recognition_details(
+        request.model_copy(update={"payments": payments[:half]})
+    )
+    return recalculate_recognition_details(
+        RecognitionRecalculationRequest(
+            previous=previous,
+            payment_amount_option=request.payment_amount_option,
+            standard_payment_amount=request.standard_payment_amount,
+            payments=payments[half:],
+            as_of=request.as_of,
+        )
+    )
+
+
+def _compared(request: RecognitionCalculatorRequest) -> RecognitionCalculationResult:
+    comparison = compare_recognition_scenarios(
+        RecognitionComparisonRequest(
+            payment_day=request.payment_day,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            as_of=request.as_of,
+            scenarios=[
+                RecognitionScenario(
+                    name="only",
+                    payment_amount_option=request.payment_amount_option,
+                    standard_payment_amount=request.standard_payment_amount,
+                    payments=request.payments,
+                )
+            ],
+        )
+    )
+    return comparison.scenarios[0].result
+
+
+ENGINES: Dict[str, Engine] = {
+    "vectorized": calculate_recognition_details_vectorized,
+    "summary": calculate_recognition_summary,
+    "incremental": _incremental,
+    "stream": _streamed,
+    "comparison": _compared,
+}
+
+# The summary engine only calculates the totals, and the incremental engine's
+# timing includes calculating the result it edits
+SUMMARY_ONLY = {"summary"}
+
+
+def _outcome(engine: Engine, request: RecognitionCalculatorRequest, details: bool):
+    try:
+        result = engine(request)
+    except Exception as e:
+        return ("error", type(e).__name__, str(getattr(e, "detail", e)))
+    if not details:
+        result = result.model_copy(update={"details": []})
+    return ("result", result.model_dump())
+
+
+def _corpus(seed: int) -> List[RecognitionCalculatorRequest]:
+    rng = random.Random(seed)
+    return [generate_request(rng) for _ in range(REQUESTS_PER_SEED)]
+
+
+@pytest.fixture(scope="module")
+def engine_timings(pytestconfig):
+    """
+    Seconds spent per engine over the corpus, reported relative to the
+    reference once the module's tests have run
+    """
+    timings: Dict[str, float] = {"reference": 0.0}
+    yield timings
+    reference = timings.pop("reference")
+    reporter = pytestconfig.pluginmanager.getplugin("terminalreporter")
+    capture = pytestconfig.pluginmanager.getplugin("capturemanager")
+    if reporter is None or capture is None or reference == 0:
+        return
+    with capture.global_and_fixture_disabled():
+        reporter.write_line("")
+        reporter.write_line("recognition engines relative to the reference:")
+        for name, seconds in timings.items():
+            reporter.write_line(f"  {name:<12} {reference / seconds:6.2f}x")
+
+
+@pytest.mark.parametrize("seed", CORPUS_SEEDS)
+def test_engines_match_reference(seed, engine_timings):
+    # Given: A random corpus of requests
+    corpus = _corpus(seed)
+
+    # When: The reference calculates every request
+    started = time.perf_counter()
+    expected = [_outcome(calculate_recognition_details, r, True) for r in corpus]
+    engine_timings["reference"] += time.perf_counter() - started
+
+    # Then: Every engine should produce the same results and the same errors
+    for name, engine in ENGINES.items():
+        details = name not in SUMMARY_ONLY
+        started = time.perf_counter()
+        outcomes = [_outcome(engine, r, details) for r in corpus]
+        engine_timings[name] = (
+            engine_timings.get(name, 0.0) + time.perf_counter() - started
+        )
+        for request, want, got in zip(corpus, expected, outcomes):
+            if not details and want[0] == "result":
+                want = ("result", {**want[1], "details": []})
+            assert got == want, (name, request)
+
+
+def test_corpus_covers_prepaid_limit_error():
+    # Given: The corpus used by the differential test
+    limit_detail = "회차별 선납일수는 최대 2년(721일)을 초과할 수 없습니다."
+    assert get_rule_table().max_prepaid_days_at(date(2024, 1, 1)) == 721
+
+    # When: The reference calculates it
+    outcomes = [
+        _outcome(calculate_recognition_details, request, False)
+        for seed in CORPUS_SEEDS
+        for request in _corpus(seed)
+    ]
+
+    # Then: It should exercise both results and the 721-day error path
+    assert any(outcome[0] == "result" for outcome in outcomes)
+    assert any(outcome[-1] == limit_detail for outcome in outcomes)
@@ -0,0 +1,238 @@
+import json
+import os
+from datetime import date
+
+import pytest
+
+from app.schemas import (
+    CustomPaymentInput,
+    PaymentAmountOption,
+    RecognitionCalculatorRequest,
+    RecognitionRule,
+    RecognitionRuleSet,
+)
+from app.services.recognition_errors import RecognitionRequestError
+from app.services.recognition_rules import (
+    DEFAULT_RULE_SET,
+    RecognitionRuleTable,
+    get_rule_table,
+    reload_rule_table,
+    set_rule_table,
+)
+from app.services.recognition_summary import calculate_recognition_summary
+from app.services.recognized_date_calc import (
+    calculate_recognition_details,
+    iter_recognition_rounds,
+)
+from app.services.recognized_date_calc_vectorized import (
+    calculate_recognition_details_vectorized,
+)
+
+THREE_RULES = RecognitionRuleSet(
+    version="test-3",
+    rules=[
+        RecognitionRule(
+            effective_from=date(2000, 1, 1),
+            max_recognized_amount=100000,
+            max_prepaid_days=721,
+            prepayment_window_months=24,
+        ),
+        RecognitionRule(
+            effective_from=date(2024, 11, 1),
+            max_recognized_amount=250000,
+            max_prepaid_days=721,
+            prepayment_window_months=24,
+        ),
+        RecognitionRule(
+            effective_from=date(2025, 6, 1),
+            max_recognized_amount=300000,
+            max_prepaid_days=365,
+            prepayment_window_months=12,
+        ),
+    ],
+)
+
+
+def test_rule_lookup_uses_last_effective_rule():
+    # Given: The built-in rule table
+    table = RecognitionRuleTable(DEFAULT_RULE_SET)
+
+    # Then: Dates before the change use the first rule, and the change date the second
+    assert table.max_recognized_amount_at(date(1990, 1, 1)) == 100000
+    assert table.max_recognized_amount_at(date(2024, 10, 31)) == 100000
+    assert table.max_recognized_amount_at(date(2024, 11, 1)) == 250000
+    assert table.max_recognized_amount_at(date(2030, 1, 1)) == 250000
+    ordinals = [date(2024, 10, 31).toordinal(), date(2024, 11, 1).toordinal()]
+    assert table.indexes_at(ordinals).tolist() == [0, 1]
+
+
+def test_engines_agree_under_custom_rule_set():
+    # Given: A third rule that raises the cap and lowers the prepaid limit
+    request = RecognitionCalculatorRequest(
+        payment_day=10,
+        start_date=date(2024, 6, 1),
+        end_date=date(2025, 12, 31),
+        payment_amount_option=PaymentAmountOption.maximum,
+        payments=[
+            CustomPaymentInput(installment_no=3, paid_date=date(2024, 9, 20)),
+            CustomPaymentInput(
+                installment_no=14, paid_date=date(2025, 7, 1), paid_amount=400000
+            ),
+        ],
+        as_of=date(2025, 10, 15),
+    )
+
+    try:
+        set_rule_table(THREE_RULES)
+
+        # When: Every engine calculates the request
+        reference = calculate_recognition_details(request)
+        vectorized = calculate_recognition_details_vectorized(request)
+        summary = calculate_recognition_summary(request)
+    finally:
+        reload_rule_table()
+
+    # Then: They should agree and apply the third rule's cap
+    assert vectorized == reference
+    assert summary.recognized_rounds == reference.recognized_rounds
+    assert summary.total_recognized_amount == reference.total_recognized_amount
+    round_14 = reference.details[13]
+    assert round_14.recognized_amount_for_round == 300000
+
+
+def test_prepaid_limit_follows_rule():
+    # Given: A round prepaid by more than the third rule allows
+    request = RecognitionCalculatorRequest(
+        payment_day=10,
+        start_date=date(2025, 6, 1),
+        end_date=date(2027, 6, 30),
+        payment_amount_option=PaymentAmountOption.maximum,
+        payments=[
+            CustomPaymentInput(installment_no=20, paid_date=date(2025, 7, 1)),
+        ],
+        as_of=date(2025, 10, 15),
+    )
+
+    try:
+        set_rule_table(THREE_RULES)
+
+        # When / Then: Every engine should reject it with the rule's limit
+        for calculate in (
+            calculate_recognition_details,
+            calculate_recognition_details_vectorized,
+            calculate_recognition_summary,
+        ):
+            with pytest.raises(RecognitionRequestError) as exc_info:
+                calculate(request)
+            assert (
+                exc_info.value.detail
+                == "회차별 선납일수는 최대 365일을 초과할 수 없습니다."
+            )
+    finally:
+        reload_rule_table()
+
+
+def test_stream_reports_first_round_over_prepaid_limit():
+    # Given: Two rounds over different limits, listed out of installment order
+    request = RecognitionCalculatorRequest(
+        payment_day=10,
+        start_date=date(2025, 6, 1),
+        end_date=date(2027, 6, 30),
+        payment_amount_option=PaymentAmountOption.maximum,
+        payments=[
+            CustomPaymentInput(installment_no=20, paid_date=date(2025, 7, 1)),
+            CustomPaymentInput(installment_no=2, paid_date=date(2023, 6, 1)),
+        ],
+        as_of=date(2025, 10, 15),
+    )
+
+    try:
+        set_rule_table(THREE_RULES)
+
+        # When: The full calculation and the stream reject it
+        with pytest.raises(RecognitionRequestError) as full_error:
+            calculate_recognition_details(request)
+        with pytest.raises(RecognitionRequestError) as stream_error:
+            iter_recognition_rounds(request)
+    finally:
+        reload_rule_table()
+
+    # Then: Both should report the earlier round's limit
+    assert (
+        full_error.value.detail
+        == "회차별 선납일수는 최대 2년(721일)을 초과할 수 없습니다."
+    )
+    assert stream_error.value.detail == full_error.value.detail
+
+
+def test_reload_rule_table_from_file(tmp_path):
+    # Given: A rule set stored as JSON
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(THREE_RULES.model_dump(mode="json")))
+
+    try:
+        # When: The table is reloaded from the file
+        table = reload_rule_table(str(path))
+
+        # Then: It becomes the current table
+        assert get_rule_table() is table
+        assert table.version == "test-3"
+        assert table.max_prepaid_days_at(date(2025, 6, 1)) == 365
+    finally:
+        reload_rule_table()
+
+    assert get_rule_table().version == "default"
+
+
+def _write_rule_set(path, rule_set: RecognitionRuleSet, mtime_ns: int) -> None:
+    path.write_text(json.dumps(rule_set.model_dump(mode="json")))
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_rule_table_follows_changed_file(tmp_path):
+    # Given: The table loaded from a file
+    path = tmp_path / "rules.json"
+    _write_rule_set(path, THREE_RULES, 1_000_000_000)
+
+    try:
+        reload_rule_table(str(path))
+
+        # When: The file is replaced with a new version, as reloaded elsewhere
+        new_rules = DEFAULT_RULE_SET.model_copy(update={"version": "test-default"})
+        _write_rule_set(path, new_rules, 2_000_000_000)
+
+        # Then: The next lookup should use the new version
+        table = get_rule_table()
+        assert table.version == "test-default"
+        assert table.max_prepaid_days_at(date(2025, 6, 1)) == 721
+    finally:
+        reload_rule_table()
+
+
+def test_changed_rules_need_a_new_version(tmp_path):
+    # Given: The table loaded from a file
+    path = tmp_path / "rules.json"
+    _write_rule_set(path, THREE_RULES, 1_000_000_000)
+
+    try:
+        reload_rule_table(str(path))
+
+        # When: The rules change but the version does not
+        changed = THREE_RULES.model_copy(
+            update={
+                "rules": [
+                    rule.model_copy(update={"max_prepaid_days": 400})
+                    for rule in THREE_RULES.rules
+                ]
+            }
+        )
+        _write_rule_set(path, changed, 2_000_000_000)
+
+        # Then: The file should be rejected and the loaded rules kept
+        with pytest.raises(ValueError):
+            reload_rule_table(str(path))
+        table = get_rule_table()
+        assert table.version == "test-3"
+        assert table.max_prepaid_days_at(date(2025, 6, 1)) == 365
+    finally:
+        reload_rule_table()
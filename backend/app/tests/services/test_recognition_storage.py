@@ -0,0 +1,71 @@
+import json
+import random
+import zlib
+
+import pytest
+
+from app.services import recognition_storage
+from app.services.recognition_storage import (
+    PACKED_FORMAT_ZLIB_MSGPACK,
+    PACKED_FORMAT_ZSTD_MSGPACK,
+    pack_calculation_result,
+    unpack_calculation_result,
+)
+from app.services.recognized_date_calc import calculate_recognition_details
+from app.tests.services.test_recognition_engines import generate_request
+
+
+def _results(count: int):
+    rng = random.Random(7)
+    results = []
+    while len(results) < count:
+        try:
+            results.append(calculate_recognition_details(generate_request(rng)))
+        except ValueError:
+            continue
+    return results
+
+
+def test_packed_result_round_trips_to_json_document():
+    # Given: Calculated results, including empty and long schedules
+    results = _results(60)
+
+    for result in results:
+        # When: A result is packed and unpacked
+        packed = pack_calculation_result(result)
+
+        # Then: The stored JSON document should come back exactly, much smaller
+        document = result.model_dump(mode="json")
+        assert unpack_calculation_result(packed) == document
+        if len(result.details) >= 12:
+            assert len(packed) * 5 < len(json.dumps(document))
+
+
+def test_unpack_reads_every_format(monkeypatch):
+    # Given: A result packed without zstd
+    result = _results(1)[0]
+    monkeypatch.setattr(recognition_storage, "zstandard", None)
+    packed = pack_calculation_result(result)
+    assert packed[0] == PACKED_FORMAT_ZLIB_MSGPACK
+    monkeypatch.undo()
+
+    # When/Then: It should still be readable, whichever codec writes now
+    assert unpack_calculation_result(packed) == result.model_dump(mode="json")
+
+    # And: Unknown format bytes should be rejected
+    with pytest.raises(ValueError):
+        unpack_calculation_result(bytes((99,)) + zlib.compress(b"\x80"))
+
+
+def test_zstd_format():
+    pytest.importorskip("zstandard")
+
+    # Given: zstandard is installed
+    result = _results(1)[0]
+
+    # When: A result is packed
+    packed = pack_calculation_result(result)
+
+    # Then: It should use the zstd format
+    assert packed[0] == PACKED_FORMAT_ZSTD_MSGPACK
+    assert unpack_calculation_result(packed) == result.model_dump(mode="json")
@@ -0,0 +1,177 @@
+from datetime import date
+
+import pytest
+
+from app.schemas import (
+    CustomPaymentInput,
+    PaymentAmountOption,
+    RecognitionCalculatorRequest,
+    RecognitionSweepRequest,
+)
+from app.services.recognition_errors import RecognitionRequestError
+from app.services.recognition_summary import (
+    calculate_recognition_summary,
+    calculate_recognition_sweep,
+)
+from app.services.recognized_date_calc import calculate_recognition_details
+
+
+@pytest.mark.parametrize(
+    "request_in",
+    [
+        # Crosses the recognition amount change date, evaluated mid-schedule
+        RecognitionCalculatorRequest(
+            payment_day=10,
+            start_date=date(2023, 6, 1),
+            end_date=date(2026, 3, 5),
+            payment_amount_option=PaymentAmountOption.maximum,
+            as_of=date(2025, 2, 10),
+        ),
+        RecognitionCalculatorRequest(
+            payment_day=28,
+            start_date=date(1995, 3, 1),
+            end_date=date(2030, 3, 31),
+            payment_amount_option=PaymentAmountOption.standard,
+            standard_payment_amount=120000,
+            as_of=date(2025, 1, 1),
+        ),
+        RecognitionCalculatorRequest(
+            payment_day=5,
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 12, 31),
+            payment_amount_option=PaymentAmountOption.standard,
+            as_of=date(2025, 1, 1),
+        ),
+        # Sparse custom payments split the schedule into uniform segments
+        RecognitionCalculatorRequest(
+            payment_day=20,
+            start_date=date(1990, 1, 1),
+            end_date=date(2030, 6, 30),
+            payment_amount_option=PaymentAmountOption.maximum,
+            payments=[
+                CustomPaymentInput(installment_no=2, paid_date=date(1990, 6, 1)),
+                CustomPaymentInput(installment_no=100, paid_date=date(1997, 1, 1)),
+                CustomPaymentInput(
+                    installment_no=250, paid_date=date(2010, 6, 1), paid_amount=0
+                ),
+                CustomPaymentInput(
+                    installment_no=400, paid_date=date(2022, 1, 1), paid_amount=300000
+                ),
+            ],
+            as_of=date(2025, 5, 1),
+        ),
+        # A long delay early on: recognized dates are not monotonic at first
+        RecognitionCalculatorRequest(
+            payment_day=1,
+            start_date=date(2000, 1, 1),
+            end_date=date(2003, 12, 31),
+            payment_amount_option=PaymentAmountOption.standard,
+            standard_payment_amount=100000,
+            payments=[CustomPaymentInput(installment_no=2, paid_date=date(2010, 1, 1))],
+            as_of=date(2004, 6, 1),
+        ),
+        RecognitionCalculatorRequest(
+            payment_day=15,
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 12, 31),
+            payment_amount_option=PaymentAmountOption.custom,
+            payments=[
+                CustomPaymentInput(
+                    installment_no=3, paid_date=date(2024, 3, 1), paid_amount=100000
+                ),
+                CustomPaymentInput(
+                    installment_no=7, paid_date=date(2024, 8, 1), paid_amount=500000
+                ),
+            ],
+            as_of=date(2025, 1, 1),
+        ),
+        # Day 31 is clamped to the end of short months
+        RecognitionCalculatorRequest(
+            payment_day=31,
+            start_date=date(2024, 1, 1),
+            end_date=date(2025, 2, 28),
+            payment_amount_option=PaymentAmountOption.maximum,
+            as_of=date(2024, 5, 1),
+        ),
+    ],
+)
+def test_summary_matches_full_calculation_totals(request_in):
+    # Given: A request and its full calculation
+    expected = calculate_recognition_details(request_in)
+
+    # When: Only the summary is calculated
+    result = calculate_recognition_summary(request_in)
+
+    # Then: The totals should match and no details should be materialized
+    assert result.details == []
+    assert result.recognized_rounds == expected.recognized_rounds
+    assert result.unrecognized_rounds == expected.unrecognized_rounds
+    assert result.total_recognized_amount == expected.total_recognized_amount
+
+
+def test_summary_prepayment_over_limit_raises_error():
+    # Given: A custom payment made more than 721 days early
+    request = RecognitionCalculatorRequest(
+        payment_day=20,
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 3, 31),
+        payment_amount_option=PaymentAmountOption.maximum,
+        payments=[CustomPaymentInput(installment_no=2, paid_date=date(2021, 2, 20))],
+    )
+
+    # When/Then: The same error as the full calculation should be raised
+    with pytest.raises(RecognitionRequestError) as excinfo:
+        calculate_recognition_summary(request)
+    assert excinfo.value.status_code == 400
+
+
+def test_sweep_matches_individual_calculations():
+    # Given: Ranges of payment days and start dates with a custom payment
+    request = RecognitionSweepRequest(
+        payment_day_from=1,
+        payment_day_to=31,
+        start_date_from=date(2022, 11, 30),
+        start_date_to=date(2023, 4, 30),
+        end_date=date(2025, 6, 30),
+        payment_amount_option=PaymentAmountOption.maximum,
+        payments=[
+            CustomPaymentInput(installment_no=3, paid_date=date(2023, 5, 1)),
+            CustomPaymentInput(installment_no=4, paid_date=date(2021, 3, 1)),
+        ],
+        as_of=date(2025, 1, 1),
+    )
+
+    # When: The sweep is calculated
+    result = calculate_recognition_sweep(request)
+
+    # Then: Every cell should match the individual calculation of its variant
+    assert result.payment_days == list(range(1, 32))
+    assert result.start_dates[:3] == [
+        date(2022, 11, 30),
+        date(2022, 12, 30),
+        date(2023, 1, 30),
+    ]
+    assert result.start_dates[3] == date(2023, 2, 28)
+    for row, start_date in enumerate(result.start_dates):
+        for column, payment_day in enumerate(result.payment_days):
+            variant = RecognitionCalculatorRequest(
+                payment_day=payment_day,
+                start_date=start_date,
+                end_date=request.end_date,
+                payment_amount_option=request.payment_amount_option,
+                payments=request.payments,
+                as_of=request.as_of,
+            )
+            try:
+                expected = calculate_recognition_details(variant)
+            except RecognitionRequestError:
+                assert result.recognized_rounds[row][column] is None
+                continue
+            assert result.recognized_rounds[row][column] == expected.recognized_rounds
+            assert (
+                result.unrecognized_rounds[row][column] == expected.unrecognized_rounds
+            )
+            assert (
+                result.total_recognized_amount[row][column]
+                == expected.total_recognized_amount
+            )
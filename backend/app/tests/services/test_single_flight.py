@@ -0,0 +1,60 @@
+import threading
+import time
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+def test_single_flight_shares_one_computation():
+    # Given: A computation that blocks until every caller has arrived
+    single_flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def compute() -> bytes:
+        calls.append(1)
+        release.wait(timeout=5)
+        return b"result"
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(single_flight.do("key", compute))
+        )
+        for _ in range(5)
+    ]
+
+    # When: Five callers ask for the same key concurrently
+    for thread in threads:
+        thread.start()
+    # Wait until every caller has joined the in-flight call
+    deadline = time.monotonic() + 5
+    while single_flight.callers("key") < 5 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert single_flight.callers("key") == 5
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    # Then: One computation served every caller with the same bytes
+    assert calls == [1]
+    assert results == [b"result"] * 5
+    stats = single_flight.stats()
+    assert stats.computations == 1
+    assert stats.callers == 5
+    assert stats.computations_by_callers == {5: 1}
+
+
+def test_single_flight_does_not_keep_errors():
+    # Given: A computation that fails once
+    single_flight = SingleFlight()
+
+    def fail() -> bytes:
+        raise ValueError("boom")
+
+    # When/Then: The error is raised and the next call computes again
+    with pytest.raises(ValueError):
+        single_flight.do("key", fail)
+    assert single_flight.do("key", lambda: b"ok") == b"ok"
+    assert single_flight.stats().in_flight == 0
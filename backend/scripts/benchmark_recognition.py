@@ -0,0 +1,312 @@
+"""
+Microbenchmarks of the recognition calculator.
+
+Times calculate_recognition_details, recalc_payments and
+generate_normal_payments over growing schedules, with dense (every round) and
+sparse (every 12th round) custom payments, and reports per-round cost and
+allocations. Results can be saved as a JSON baseline and compared later:
+
+    python -m scripts.benchmark_recognition --output baseline.json
+    python -m scripts.benchmark_recognition --compare baseline.json
+
+Run from the backend directory. Schedules start in 2000, inside the
+1950..2150 due date table used in production. Schedules too long for the
+table (12,000 rounds) start in 1001 instead so they end before the as-of
+date; most of their due dates are calculated directly, and their names end
+in "-fallback".
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from app.schemas import (
+    CustomPaymentInput,
+    PaymentAmountOption,
+    PaymentInput,
+    RecognitionCalculatorRequest,
+)
+from app.services.due_date_calendar import MAX_YEAR, due_date
+from app.services.recognized_date_calc import (
+    calculate_recognition_details,
+    generate_normal_payments,
+    recalc_payments,
+)
+
+TABLE_START_DATE = date(2000, 1, 1)
+FALLBACK_START_DATE = date(1001, 1, 1)
+SIZES = (12, 120, 1200, 12000)
+PAYMENT_DAY = 25
+AS_OF = date(2100, 1, 1)
+SPARSE_INTERVAL = 12
+
+
+def _start_date(rounds: int) -> date:
+    """
+    Start of a schedule of the given length, inside the due date table when
+    the whole schedule fits
+    """
+    if TABLE_START_DATE.year + (rounds - 1) // 12 <= MAX_YEAR:
+        return TABLE_START_DATE
+    return FALLBACK_START_DATE
+
+
+def _end_date(rounds: int) -> date:
+    start_date = _start_date(rounds)
+    month = start_date.month - 1 + rounds - 1
+    return due_date(start_date.year + month // 12, month % 12 + 1, PAYMENT_DAY)
+
+
+def _due_dates(rounds: int) -> List[date]:
+    start_date = _start_date(rounds)
+    return [
+        due_date(start_date.year + month // 12, month % 12 + 1, PAYMENT_DAY)
+        for month in range(start_date.month - 1, start_date.month - 1 + rounds)
+    ]
+
+
+def _paid_date(rng: random.Random, due: date) -> date:
+    # Mostly on time, some late, some prepaid well within the 721 day limit
+    return due + timedelta(days=rng.choice((0, 0, 0, 3, 30, -15, -400)))
+
+
+def _recognition_request(
+    rounds: int, interval: Optional[int]
+) -> RecognitionCalculatorRequest:
+    rng = random.Random(rounds)
+    payments = []
+    if interval is not None:
+        for installment_no, due in enumerate(_due_dates(rounds), start=1):
+            if installment_no % interval == 0:
+                payments.append(
+                    CustomPaymentInput(
+                        installment_no=installment_no,
+                        paid_date=_paid_date(rng, due),
+                        paid_amount=rng.choice((None, 0, 50000, 300000)),
+                    )
+                )
+    return RecognitionCalculatorRequest(
+        payment_day=PAYMENT_DAY,
+        start_date=_start_date(rounds),
+        end_date=_end_date(rounds),
+        payment_amount_option=PaymentAmountOption.maximum,
+        payments=payments,
+        as_of=AS_OF,
+    )
+
+
+def _recalc_inputs(rounds: int) -> List[PaymentInput]:
+    rng = random.Random(rounds)
+    return [
+        PaymentInput(
+            installment_no=installment_no, due_date=due, paid_date=_paid_date(rng, due)
+        )
+        for installment_no, due in enumerate(_due_dates(rounds), start=1)
+    ]
+
+
+def _cases(sizes: List[int]) -> List[Dict[str, Any]]:
+    cases = []
+    for rounds in sizes:
+        calendar = "table" if _start_date(rounds) == TABLE_START_DATE else "fallback"
+        suffix = "" if calendar == "table" else "-fallback"
+        densities = (("none", None), ("sparse", SPARSE_INTERVAL), ("dense", 1))
+        for payments, interval in densities:
+            request = _recognition_request(rounds, interval)
+            cases.append(
+                {
+                    "name": (
+                        f"calculate_recognition_details[{payments}-{rounds}{suffix}]"
+                    ),
+                    "function": "calculate_recognition_details",
+                    "payments": payments,
+                    "rounds": rounds,
+                    "calendar": calendar,
+                    "run": lambda request=request: calculate_recognition_details(
+                        request
+                    ),
+                }
+            )
+        # Every round of a recalculation carries its own paid date
+        inputs = _recalc_inputs(rounds)
+        cases.append(
+            {
+                "name": f"recalc_payments[dense-{rounds}{suffix}]",
+                "function": "recalc_payments",
+                "payments": "dense",
+                "rounds": rounds,
+                "calendar": calendar,
+                "run": lambda inputs=inputs: recalc_payments(inputs, as_of=AS_OF),
+            }
+        )
+        start_date = _start_date(rounds)
+        end_date = _end_date(rounds)
+        cases.append(
+            {
+                "name": f"generate_normal_payments[none-{rounds}{suffix}]",
+                "function": "generate_normal_payments",
+                "payments": "none",
+                "rounds": rounds,
+                "calendar": calendar,
+                "run": lambda start_date=start_date, end_date=end_date: (
+                    generate_normal_payments(start_date, PAYMENT_DAY, end_date)
+                ),
+            }
+        )
+    return cases
+
+
+def _allocated_blocks() -> int:
+    snapshot = tracemalloc.take_snapshot()
+    return sum(stat.count for stat in snapshot.statistics("filename"))
+
+
+def _measure(
+    run: Callable[[], Any], repeat: int, min_seconds: float
+) -> Dict[str, float]:
+    run()  # warm up
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            run()
+        if time.perf_counter() - started >= min_seconds or loops >= 1 << 20:
+            break
+        loops *= 2
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(loops):
+            run()
+        timings.append((time.perf_counter() - started) / loops)
+
+    # Allocations of one call, measured separately so tracing does not skew timings
+    tracemalloc.start()
+    try:
+        before_blocks = _allocated_blocks()
+        tracemalloc.reset_peak()
+        result = run()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        retained_blocks = _allocated_blocks()
+        del result
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "best_seconds": min(timings),
+        "median_seconds": statistics.median(timings),
+        "peak_bytes": peak_bytes,
+        "retained_blocks": max(retained_blocks - before_blocks, 0),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+def run_benchmarks(sizes: List[int], repeat: int, min_seconds: float) -> Dict[str, Any]:
+    results = []
+    for case in _cases(sizes):
+        measured = _measure(case["run"], repeat, min_seconds)
+        rounds = case["rounds"]
+        result = {
+            "name": case["name"],
+            "function": case["function"],
+            "payments": case["payments"],
+            "rounds": rounds,
+            "calendar": case["calendar"],
+            **measured,
+            "per_round_us": measured["best_seconds"] / rounds * 1e6,
+            "peak_bytes_per_round": measured["peak_bytes"] / rounds,
+        }
+        results.append(result)
+        print(
+            f"{result['name']:<54} {result['best_seconds'] * 1e3:10.3f} ms"
+            f" {result['per_round_us']:8.2f} us/round"
+            f" {result['peak_bytes_per_round']:9.0f} B/round"
+        )
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> bool:
+    """
+    Print per-round time ratios against the baseline.
+    Returns False when any benchmark is slower than threshold times its baseline.
+    """
+    baseline_results = {result["name"]: result for result in baseline["results"]}
+    ok = True
+    print(f"\ncompared with {baseline.get('commit') or 'baseline'}:")
+    for result in current["results"]:
+        base = baseline_results.get(result["name"])
+        if base is None:
+            continue
+        ratio = result["best_seconds"] / base["best_seconds"]
+        regressed = ratio > threshold
+        ok = ok and not regressed
+        print(
+            f"{result['name']:<54} {ratio:6.2f}x time"
+            f" {result['peak_bytes'] / max(base['peak_bytes'], 1):6.2f}x peak memory"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+    return ok
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=0.05,
+        help="minimum duration of one timed repetition",
+    )
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="slowdown ratio reported as a regression",
+    )
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.sizes, args.repeat, args.min_seconds)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if not compare(current, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""
+Pack the JSON details of saved calculation results.
+
+    python -m scripts.pack_calculation_results --batch-size 500
+
+Run from the backend directory, after the e8b2d4f6a1c7 migration. Rows are
+packed in batches, one transaction each, until none are left (or --limit rows
+were packed). It can run while the API is serving and in several processes.
+"""
+
+import argparse
+import sys
+import time
+from typing import List, Optional
+
+from sqlmodel import Session
+
+from app import crud
+from app.core.db import engine
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--limit", type=int, help="stop after this many rows")
+    parser.add_argument(
+        "--pause",
+        type=float,
+        default=0.0,
+        help="seconds to wait between batches, to spread the WAL volume",
+    )
+    args = parser.parse_args(argv)
+
+    total = 0
+    while args.limit is None or total < args.limit:
+        batch_size = args.batch_size
+        if args.limit is not None:
+            batch_size = min(batch_size, args.limit - total)
+        with Session(engine) as session:
+            packed = crud.pack_stored_calculation_results(
+                session=session, batch_size=batch_size
+            )
+        if packed == 0:
+            break
+        total += packed
+        print(f"{total} calculation results packed", file=sys.stderr)
+        if args.pause:
+            time.sleep(args.pause)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())